@@ -0,0 +1,87 @@
+"""
+Measure recall and latency of the IVF candidate index against exact search.
+
+Generates --pool clustered unit vectors (real CV embeddings are far from
+uniform, and IVF relies on that), builds the index and, for increasing nprobe,
+reports the mean recall@k of --queries queries against the exact top-k and
+the mean query latency. Exact search is a full scan of the same stored matrix.
+
+Usage:
+    python benchmarks/bench_ann.py --pool 200000 --top-k 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import EMBEDDING_QUANTIZATION
+from src.database.types import normalize_rows
+from src.embeddings.quantization import QuantizedMatrix
+from src.matching.ann_index import IVFIndex
+
+DIM = 384
+
+
+def clustered_vectors(count: int, clusters: int, spread: float, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((clusters, DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)]
+    vectors += rng.standard_normal((count, DIM)).astype(np.float32) * spread
+    return normalize_rows(vectors)
+
+
+def exact_top_k(matrix: QuantizedMatrix, query: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix.scores(query)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def run(pool_size: int, queries: int, k: int, clusters: int, spread: float, mode: str):
+    rng = np.random.default_rng(0)
+    vectors = clustered_vectors(pool_size, clusters, spread, rng)
+    query_vectors = clustered_vectors(queries, clusters, spread, rng)
+
+    # Add everything untrained and cluster once, as indexing an existing archive would
+    index = IVFIndex(path=None, min_train_size=pool_size + 1, mode=mode)
+    start = time.perf_counter()
+    index.add(np.arange(pool_size), vectors)
+    index.rebuild()
+    build = time.perf_counter() - start
+    stats = index.stats()
+
+    exact_matrix = QuantizedMatrix.from_vectors(vectors, mode)
+    start = time.perf_counter()
+    truth = [exact_top_k(exact_matrix, query, k) for query in query_vectors]
+    exact_ms = (time.perf_counter() - start) / queries * 1000
+
+    print(
+        f"{pool_size} vectors ({mode}), {stats['lists']} lists (largest {stats['largest_list']}), "
+        f"built in {build:.1f}s; {queries} queries, recall@{k}"
+    )
+    print(f"{'nprobe':>8}{'recall':>9}{'ms/query':>10}{'speed-up':>10}")
+    print(f"{'exact':>8}{1.0:>9.3f}{exact_ms:>10.2f}{1.0:>9.1f}x")
+    for nprobe in (1, 2, 4, 8, 16, 32, 64):
+        if nprobe > stats["lists"]:
+            break
+        recalls = []
+        start = time.perf_counter()
+        results = [index.search(query, k, nprobe)[0] for query in query_vectors]
+        ms = (time.perf_counter() - start) / queries * 1000
+        for found, expected in zip(results, truth):
+            recalls.append(len(np.intersect1d(found, expected)) / k)
+        print(f"{nprobe:>8}{np.mean(recalls):>9.3f}{ms:>10.2f}{exact_ms / ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--spread", type=float, default=0.08)
+    parser.add_argument("--mode", default=EMBEDDING_QUANTIZATION)
+    args = parser.parse_args()
+    run(args.pool, args.queries, args.top_k, args.clusters, args.spread, args.mode)
@@ -0,0 +1,92 @@
+"""
+Compare JSON and binary float32 storage of embeddings.
+
+Writes the same random embeddings into a JSON column and an EmbeddingVector
+column of a temporary SQLite database and reports the stored row size and the
+time needed to load all rows back into a numpy matrix.
+
+Usage:
+    python benchmarks/bench_embedding_storage.py --rows 20000 --dim 384
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, Column, Integer, JSON, select, text
+from sqlalchemy.orm import declarative_base, Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.types import EmbeddingVector
+
+Base = declarative_base()
+
+
+class JsonRow(Base):
+    __tablename__ = "json_embeddings"
+
+    id = Column(Integer, primary_key=True)
+    embedding = Column(JSON, nullable=False)
+
+
+class BinaryRow(Base):
+    __tablename__ = "binary_embeddings"
+
+    id = Column(Integer, primary_key=True)
+    embedding = Column(EmbeddingVector, nullable=False)
+
+
+def run(rows: int, dim: int, repeats: int):
+    vectors = np.random.default_rng(0).standard_normal((rows, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(engine)
+
+        results = {}
+        for name, model, to_value in [
+            ("json", JsonRow, lambda vector: vector.tolist()),
+            ("float32 blob", BinaryRow, lambda vector: vector)
+        ]:
+            start = time.perf_counter()
+            with Session(engine) as session:
+                session.add_all(model(embedding=to_value(vector)) for vector in vectors)
+                session.commit()
+            write_seconds = time.perf_counter() - start
+
+            with engine.connect() as conn:
+                row_bytes = conn.execute(
+                    text(f"SELECT AVG(LENGTH(embedding)) FROM {model.__tablename__}")
+                ).scalar()
+
+            load_times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                with Session(engine) as session:
+                    loaded = session.execute(select(model.embedding)).scalars().all()
+                    matrix = np.asarray(loaded, dtype=np.float32)
+                load_times.append(time.perf_counter() - start)
+            assert matrix.shape == (rows, dim)
+
+            results[name] = (row_bytes, write_seconds, min(load_times))
+
+    print(f"{rows} rows x {dim} dims")
+    print(f"{'encoding':<14}{'bytes/row':>12}{'write s':>10}{'load s':>10}")
+    for name, (row_bytes, write_seconds, load_seconds) in results.items():
+        print(f"{name:<14}{row_bytes:>12.0f}{write_seconds:>10.3f}{load_seconds:>10.3f}")
+    json_bytes, _, json_load = results["json"]
+    blob_bytes, _, blob_load = results["float32 blob"]
+    print(f"size ratio: {json_bytes / blob_bytes:.1f}x smaller, load speed-up: {json_load / blob_load:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.dim, args.repeats)
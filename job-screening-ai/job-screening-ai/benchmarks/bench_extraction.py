@@ -0,0 +1,148 @@
+"""
+Measure how much of CV and job description extraction the rule-based extractor handles.
+
+Runs the rule-based extractor over the bundled CVs and job descriptions and
+reports, per document kind, the fraction of documents with every field at or
+above EXTRACTION_CONFIDENCE_THRESHOLD (LLM calls avoided), how often each field
+falls below it, and the extraction time.
+
+With --llm, every document is also extracted in full by the LLM (the Ollama
+server at OLLAMA_HOST, bypassing the response cache), and the rule-based values
+of the confident fields are compared with the LLM output field by field:
+strings by normalized token overlap, skill lists by set overlap, experience and
+education entries by overlap of their titles and degrees (1.0 is full
+agreement).
+
+Usage:
+    python benchmarks/bench_extraction.py --cvs 200
+    python benchmarks/bench_extraction.py --cvs 20 --llm
+"""
+import argparse
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Tuple
+
+from dataset import load_cv_texts, load_job_descriptions
+from src.agents.cv_analyzer import CVAnalyzerAgent
+from src.agents.jd_analyzer import JDAnalyzerAgent
+from src.config import EXTRACTION_CONFIDENCE_THRESHOLD
+from src.extraction.rule_extractor import CV_FIELDS, JOB_FIELDS, rule_extractor
+from src.extraction.skill_dictionary import skill_dictionary
+from src.llm.client import ollama_client
+
+# Key of the entries of list-of-object fields
+ENTRY_KEYS = {"experience": "title", "education": "degree"}
+
+
+def normalize(value: Any) -> str:
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", str(value).lower()).split())
+
+
+def overlap(left: set, right: set) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def agreement(field: str, rules: Any, llm: Any) -> float:
+    """Score how closely a rule-based value matches the LLM value, from 0 to 1."""
+    if isinstance(rules, list) or isinstance(llm, list):
+        rules = rules if isinstance(rules, list) else []
+        llm = llm if isinstance(llm, list) else []
+        key = ENTRY_KEYS.get(field)
+        if key:
+            rules = [entry.get(key, "") for entry in rules if isinstance(entry, dict)]
+            llm = [entry.get(key, "") for entry in llm if isinstance(entry, dict)]
+        return overlap(
+            {normalize(skill_dictionary.canonical(str(item)) or item) for item in rules},
+            {normalize(skill_dictionary.canonical(str(item)) or item) for item in llm}
+        )
+    if field == "phone":
+        return float(re.sub(r"\D", "", str(rules)) == re.sub(r"\D", "", str(llm or "")))
+    rules, llm = normalize(rules), normalize(llm or "")
+    if rules == llm or (rules and llm and (rules in llm or llm in rules)):
+        return 1.0
+    return overlap(set(rules.split()), set(llm.split()))
+
+
+async def compare_with_llm(kind: str, documents: List[Tuple[str, str]], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    agent = CVAnalyzerAgent() if kind == "cv" else JDAnalyzerAgent()
+    extract = rule_extractor.extract_cv if kind == "cv" else rule_extractor.extract_job
+
+    async def run(text: str):
+        started = time.perf_counter()
+        result = await agent._extract_with_llm(text, list(fields))
+        return result, time.perf_counter() - started
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[run(text) for _, text in documents])
+    wall = time.perf_counter() - start
+
+    scores: Dict[str, List[float]] = {field: [] for field in fields}
+    failures = 0
+    for (_, text), (llm_data, _) in zip(documents, results):
+        if llm_data is None:
+            failures += 1
+            continue
+        data, confidence = extract(text)
+        for field in fields:
+            if confidence[field] >= EXTRACTION_CONFIDENCE_THRESHOLD:
+                scores[field].append(agreement(field, data[field], llm_data.get(field)))
+    return {
+        "llm_ms": sum(elapsed for _, elapsed in results) / len(results) * 1000,
+        "wall": wall,
+        "failures": failures,
+        "agreement": {field: (sum(values) / len(values), len(values)) for field, values in scores.items() if values}
+    }
+
+
+def run_rules(kind: str, documents: List[Tuple[str, str]], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    extract = rule_extractor.extract_cv if kind == "cv" else rule_extractor.extract_job
+    below = {field: 0 for field in fields}
+    rules_only = 0
+    start = time.perf_counter()
+    for _, text in documents:
+        _, confidence = extract(text)
+        uncertain = [field for field in fields if confidence[field] < EXTRACTION_CONFIDENCE_THRESHOLD]
+        rules_only += not uncertain
+        for field in uncertain:
+            below[field] += 1
+    return {
+        "documents": len(documents),
+        "avoided": rules_only / len(documents),
+        "below": below,
+        "ms": (time.perf_counter() - start) / len(documents) * 1000
+    }
+
+
+async def main(cvs: int, llm: bool):
+    corpora = [
+        ("cv", load_cv_texts(cvs), CV_FIELDS),
+        ("job", load_job_descriptions(), JOB_FIELDS)
+    ]
+    print(f"Confidence threshold {EXTRACTION_CONFIDENCE_THRESHOLD}")
+    for kind, documents, fields in corpora:
+        result = run_rules(kind, documents, fields)
+        print(f"\n{kind}: {result['documents']} documents, {result['ms']:.2f} ms each with rules, "
+              f"LLM calls avoided {result['avoided']:.0%}")
+        print("  fields sent to the LLM: " + ", ".join(
+            f"{field} {count}" for field, count in result["below"].items()
+        ))
+        if not llm:
+            continue
+        comparison = await compare_with_llm(kind, documents, fields)
+        print(f"  LLM: {comparison['llm_ms']:.0f} ms per document, {comparison['wall']:.1f} s total, "
+              f"{comparison['failures']} without a JSON object")
+        print(f"  {'field':<18}{'agreement':>10}{'compared':>10}")
+        for field, (score, count) in comparison["agreement"].items():
+            print(f"  {field:<18}{score:>10.2f}{count:>10}")
+    await ollama_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=0, help="Number of CVs to load (0 for all)")
+    parser.add_argument("--llm", action="store_true", help="Compare with full LLM extraction")
+    args = parser.parse_args()
+    asyncio.run(main(args.cvs, args.llm))
@@ -0,0 +1,122 @@
+"""
+Compare ways of calling the LLM from async code against the Ollama stub.
+
+Starts benchmarks/ollama_stub.py on a background thread and sends --requests
+concurrent generations in three ways:
+  blocking  a synchronous request made directly in the coroutine (blocks the event loop)
+  threads   a synchronous request per call on a thread pool of INFERENCE_IO_WORKERS
+  async     the shared OllamaClient with --concurrency slots and pooled connections
+For each it reports wall time, throughput, latency percentiles, connections
+opened and the longest stall of a 10 ms ticker running on the event loop.
+
+Usage:
+    python benchmarks/bench_llm_client.py --requests 64 --latency-ms 200 --parallel 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ollama_stub import OllamaStub
+from src.config import INFERENCE_IO_WORKERS
+from src.llm.client import OllamaClient
+
+PROMPT = "Analyze the following job description and extract key information in JSON format."
+
+
+def start_stub(stub: OllamaStub) -> int:
+    """Run the stub on its own event loop thread, so blocking calls cannot stall it."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    port = []
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        port.append(loop.run_until_complete(stub.start()))
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def post_sync(url: str) -> dict:
+    response = httpx.post(f"{url}/api/generate", json={"model": "stub", "prompt": PROMPT, "stream": False}, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+
+async def measure_lag(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        expected = time.perf_counter() + 0.01
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - expected)
+
+
+async def run_mode(mode: str, url: str, requests: int, concurrency: int, stub: OllamaStub) -> dict:
+    client = OllamaClient(host=url, model="stub", max_concurrency=concurrency)
+    pool = ThreadPoolExecutor(max_workers=INFERENCE_IO_WORKERS)
+    loop = asyncio.get_running_loop()
+
+    async def call() -> float:
+        start = time.perf_counter()
+        if mode == "blocking":
+            post_sync(url)
+        elif mode == "threads":
+            await loop.run_in_executor(pool, post_sync, url)
+        else:
+            await client.generate(PROMPT)
+        return time.perf_counter() - start
+
+    # One untimed call per mode opens the client and the thread pool
+    await call()
+    connections = stub.connections
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*[call() for _ in range(requests)])
+    wall = time.perf_counter() - start
+    stop.set()
+    await ticker
+    await client.close()
+    pool.shutdown()
+    return {
+        "wall": wall,
+        "throughput": requests / wall,
+        "p50": float(np.percentile(latencies, 50)) * 1000,
+        "p95": float(np.percentile(latencies, 95)) * 1000,
+        "connections": stub.connections - connections,
+        "max_lag": max(lags, default=0.0) * 1000
+    }
+
+
+async def run(requests: int, latency_ms: float, parallel: int, concurrency: int):
+    stub = OllamaStub(latency_ms=latency_ms, parallel=parallel)
+    url = f"http://127.0.0.1:{start_stub(stub)}"
+    print(f"{requests} requests, stub latency {latency_ms:.0f} ms, {parallel} parallel generations, "
+          f"{INFERENCE_IO_WORKERS} I/O threads, {concurrency} client slots")
+    print(f"{'mode':<10}{'wall s':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'conns':>7}{'loop stall ms':>15}")
+    for mode in ("blocking", "threads", "async"):
+        result = await run_mode(mode, url, requests, concurrency, stub)
+        print(f"{mode:<10}{result['wall']:>8.2f}{result['throughput']:>8.1f}{result['p50']:>9.0f}"
+              f"{result['p95']:>9.0f}{result['connections']:>7}{result['max_lag']:>15.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency_ms, args.parallel, args.concurrency))
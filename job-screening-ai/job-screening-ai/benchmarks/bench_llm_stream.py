@@ -0,0 +1,103 @@
+"""
+Compare buffered and streamed JSON generation against the Ollama stub.
+
+The stub generates a JD extraction object at --token-ms per token in three
+shapes seen from Mistral: the object followed by --prose-words of explanation,
+the same inside a ```json fence, and an object cut off by num_predict. Each is
+requested --requests times in three ways:
+  buffered  OllamaClient.generate, then json.loads (the previous agent code)
+  repaired  OllamaClient.generate, then repair_json on the full text
+  streamed  OllamaClient.generate_json, stopping once the object is complete
+For each it reports the parse success rate, mean time to a parsed result and
+tokens generated per request (counted by the stub, so tokens never generated
+after a cut-off are not included), plus discarded tokens for the streamed mode.
+
+Usage:
+    python benchmarks/bench_llm_stream.py --requests 8 --token-ms 25 --prose-words 120
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ollama_stub import DEFAULT_RESPONSE, OllamaStub
+from src.llm.client import OllamaClient
+from src.llm.json_stream import repair_json
+
+PROMPT = "Analyze the following job description and extract key information in JSON format."
+EXPECTED = json.loads(DEFAULT_RESPONSE)
+PROSE = ("This object lists the title, the required and preferred skills, the experience and "
+         "education asked for and the main responsibilities of the role as stated in the posting. ")
+
+
+def scenarios(prose_words: int) -> dict:
+    words = PROSE.split()
+    prose = " ".join(words[i % len(words)] for i in range(prose_words))
+    pretty = json.dumps(EXPECTED, indent=2)
+    return {
+        "prose": f"{pretty}\n\n{prose}",
+        "fenced": f"Here is the extracted information:\n```json\n{pretty}\n```\n\n{prose}",
+        "truncated": pretty[:pretty.index('"responsibilities"') + 30]
+    }
+
+
+async def run_mode(mode: str, client: OllamaClient, stub: OllamaStub, requests: int) -> dict:
+    parsed, discarded, elapsed = 0, 0, 0.0
+    sent = stub.tokens_sent
+    for _ in range(requests):
+        start = time.perf_counter()
+        if mode == "streamed":
+            response = await client.generate_json(PROMPT)
+            result = response["result"]
+            discarded += response["discarded_tokens"]
+        else:
+            text = (await client.generate(PROMPT))["response"]
+            if mode == "repaired":
+                result = repair_json(text)
+            else:
+                try:
+                    result = json.loads(text)
+                except json.JSONDecodeError:
+                    result = None
+        elapsed += time.perf_counter() - start
+        # Truncated output keeps only the fields completed before the cut
+        parsed += isinstance(result, dict) and result.get("title") == EXPECTED["title"]
+    # Let the stub notice disconnects before reading its token count
+    await asyncio.sleep(0.05)
+    return {
+        "parsed": parsed / requests,
+        "ms": elapsed / requests * 1000,
+        "tokens": (stub.tokens_sent - sent) / requests,
+        "discarded": discarded / requests if mode == "streamed" else None
+    }
+
+
+async def run(requests: int, latency_ms: float, token_ms: float, prose_words: int):
+    print(f"{requests} requests per mode, stub latency {latency_ms:.0f} ms + {token_ms:.0f} ms/token, "
+          f"{prose_words} words of trailing prose")
+    print(f"{'output':<11}{'mode':<10}{'parsed':>8}{'ms/result':>11}{'tokens/req':>12}{'discarded':>11}")
+    for name, response in scenarios(prose_words).items():
+        stub = OllamaStub(latency_ms=latency_ms, token_ms=token_ms, parallel=1, response=response)
+        port = await stub.start()
+        client = OllamaClient(host=f"127.0.0.1:{port}", model="stub", max_concurrency=1)
+        for mode in ("buffered", "repaired", "streamed"):
+            result = await run_mode(mode, client, stub, requests)
+            discarded = "" if result["discarded"] is None else f"{result['discarded']:.0f}"
+            print(f"{name:<11}{mode:<10}{result['parsed']:>8.0%}{result['ms']:>11.0f}"
+                  f"{result['tokens']:>12.0f}{discarded:>11}")
+        await client.close()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--token-ms", type=float, default=25)
+    parser.add_argument("--prose-words", type=int, default=120)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency_ms, args.token_ms, args.prose_words))
@@ -0,0 +1,81 @@
+"""
+Compare two-stage matching with exhaustive full scoring.
+
+Builds the same synthetic pool as bench_rank.py and ranks it for one job in two
+ways: exhaustively, running MatcherAgent.calculate_match_score on every
+candidate, and with MatchPipeline, which retrieves the best --retrieve-n
+candidates on embedding and skill scores and fully scores only those. Reports
+the latency of each stage, the end-to-end speed-up and the share of the
+exhaustive top-k that the pipeline returns.
+
+Usage:
+    python benchmarks/bench_pipeline.py --pool 50000 --top-k 10 --retrieve-n 50 200 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_rank import DIM, build_rows
+from src.matching.candidate_pool import CandidatePool
+from src.matching.pipeline import MatchPipeline
+
+
+def run(pool_size: int, top_k: int, retrieve_ns, vocabulary: int):
+    rng = np.random.default_rng(0)
+    rows = build_rows(pool_size, vocabulary, rng)
+    pool = CandidatePool()
+    pool.add_rows(rows)
+    candidates = {
+        candidate_id: {
+            'id': candidate_id,
+            'embedding': embedding,
+            'skill_ids': skill_ids,
+            'skills': [],
+            'experience': [{'description': ''}] * len(experience),
+            'experience_embeddings': experience
+        }
+        for candidate_id, embedding, skill_ids, experience in rows
+    }
+    job = {
+        'embedding': rng.standard_normal(DIM).astype(np.float32),
+        'experience_embedding': rng.standard_normal(DIM).astype(np.float32),
+        'skill_ids': np.arange(10, dtype=np.uint32)
+    }
+    pipeline = MatchPipeline()
+
+    start = time.perf_counter()
+    exhaustive = pipeline.rerank(job, list(candidates.values()), top_k)
+    exhaustive_ms = (time.perf_counter() - start) * 1000
+    expected = {item['candidate_id'] for item in exhaustive}
+
+    print(f"{pool_size} candidates, top-{top_k}")
+    print(f"exhaustive full scoring: {exhaustive_ms:.1f} ms\n")
+    print(f"{'retrieve_n':>10}{'retrieve ms':>13}{'rerank ms':>11}{'total ms':>10}{'speed-up':>10}{'recall':>8}")
+    for retrieve_n in retrieve_ns:
+        start = time.perf_counter()
+        ids, _ = pipeline.retrieve(job, pool, retrieve_n)
+        retrieved = time.perf_counter()
+        ranking = pipeline.rerank(job, [candidates[int(candidate_id)] for candidate_id in ids], top_k)
+        done = time.perf_counter()
+
+        total_ms = (done - start) * 1000
+        recall = len(expected & {item['candidate_id'] for item in ranking}) / max(1, len(expected))
+        print(
+            f"{retrieve_n:>10}{(retrieved - start) * 1000:>13.1f}{(done - retrieved) * 1000:>11.1f}"
+            f"{total_ms:>10.1f}{exhaustive_ms / total_ms:>9.1f}x{recall:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, default=50000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--retrieve-n", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--vocabulary", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.pool, args.top_k, args.retrieve_n, args.vocabulary)
@@ -0,0 +1,60 @@
+"""
+Measure embedding throughput of the process-pool backend from 1 to N workers.
+
+Extracts the text of the bundled CV PDFs once, then encodes all of them
+through the embedding service backed by a ProcessPoolBackend with an
+increasing number of worker processes. Worker start-up (model loading) is
+excluded from the timings. Workers run the backend set by EMBEDDING_BACKEND.
+
+Usage:
+    python benchmarks/bench_process_pool.py --max-workers 4 --repeat 2
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from dataset import load_cv_texts
+from src.config import EMBED_BATCH_SIZE
+from src.embeddings.embedding_service import EmbeddingService
+from src.embeddings.process_pool import ProcessPoolBackend
+
+
+async def measure(texts, workers: int, batch_size: int) -> float:
+    backend = ProcessPoolBackend(workers=workers, max_batch_size=batch_size)
+    service = EmbeddingService(backend=backend, max_batch_size=batch_size, max_wait_ms=1)
+    try:
+        # Start the workers and load the model before timing
+        await service.encode_many(texts[:workers])
+        start = time.perf_counter()
+        await service.encode_many(texts)
+        return time.perf_counter() - start
+    finally:
+        await service.close()
+
+
+def run(max_workers: int, repeat: int, batch_size: int):
+    texts = [text for _, text in load_cv_texts()] * repeat
+    # Make every repeat distinct so no layer can reuse earlier work
+    texts = [f"{text}\n{i}" for i, text in enumerate(texts)]
+
+    print(f"{len(texts)} CV texts, batch size {batch_size}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'texts/s':>10}{'speed-up':>10}{'efficiency':>12}")
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        seconds = asyncio.run(measure(texts, workers, batch_size))
+        throughput = len(texts) / seconds
+        baseline = baseline or throughput
+        print(
+            f"{workers:>8}{seconds:>10.2f}{throughput:>10.1f}"
+            f"{throughput / baseline:>9.2f}x{throughput / baseline / workers:>12.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    args = parser.parse_args()
+    run(args.max_workers, args.repeat, args.batch_size)
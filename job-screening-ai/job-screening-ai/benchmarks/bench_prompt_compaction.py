@@ -0,0 +1,125 @@
+"""
+Measure prompt compaction of the bundled CVs and job descriptions.
+
+For every document the text inserted into the extraction prompt is compacted
+for all fields, and reported as tokens before and after, the number of
+documents cut to PROMPT_TOKEN_BUDGET and the compaction time. CVs are also
+measured as a multi-page PDF export would give them (--pages pages, each with
+a running header, a page number footer, a confidentiality line and padded
+whitespace), since the bundled PDFs are single pages without furniture.
+
+The effect on latency is then measured against the Ollama stub, which spends
+--prompt-token-ms per prompt word before the first token: every document is
+sent once with its full text and once compacted, and the mean time to first
+token of both is reported next to the saving estimated by the compactor.
+
+Usage:
+    python benchmarks/bench_prompt_compaction.py --prompt-token-ms 2
+    PROMPT_TOKENIZER=/path/to/mistral-tokenizer python benchmarks/bench_prompt_compaction.py --cvs 50
+"""
+import argparse
+import asyncio
+import io
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List, Tuple
+
+from dataset import load_cv_texts, load_job_descriptions
+from ollama_stub import OllamaStub
+from src.extraction.rule_extractor import CV_FIELDS, JOB_FIELDS
+from src.llm.client import OllamaClient
+from src.llm.prompt_compaction import PromptCompactor
+
+TEMPLATE = "Analyze the following {kind} and extract key information in JSON format:\n\n{text}\n\nReturn a JSON object."
+
+
+def paginate(text: str, pages: int) -> str:
+    """Lay a CV out over several pages with the furniture of a PDF export."""
+    lines = text.splitlines()
+    name = next((line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("name:")), "Candidate")
+    size = max(1, -(-len(lines) // pages))
+    chunks = [lines[start:start + size] for start in range(0, len(lines), size)]
+    return "\n".join(
+        f"{name}   |   Curriculum Vitae\n\n\n" + "\n".join(f"  {line}    " for line in chunk)
+        + f"\n\n   Page {number} of {len(chunks)}\nConfidential\n\f"
+        for number, chunk in enumerate(chunks, 1)
+    )
+
+
+def measure(compactor: PromptCompactor, kind: str, documents: List[str], fields: Tuple[str, ...]) -> Dict[str, float]:
+    before = after = truncated = 0
+    start = time.perf_counter()
+    for text in documents:
+        result = compactor.compact(text, kind, fields)
+        before += result.tokens_before
+        after += result.tokens_after
+        truncated += result.truncated
+    return {
+        "before": before / len(documents),
+        "after": after / len(documents),
+        "truncated": truncated,
+        "ms": (time.perf_counter() - start) / len(documents) * 1000
+    }
+
+
+async def measure_latency(
+    compactor: PromptCompactor,
+    corpora: List[Tuple[str, str, List[str], Tuple[str, ...]]],
+    prompt_token_ms: float
+):
+    stub = OllamaStub(latency_ms=20, token_ms=1, parallel=1, prompt_token_ms=prompt_token_ms)
+    port = await stub.start()
+    client = OllamaClient(host=f"127.0.0.1:{port}", model="stub", max_concurrency=1)
+    print(f"\nTime to first token against the stub ({prompt_token_ms:g} ms per prompt word):")
+    print(f"{'documents':<14}{'full ms':>9}{'compacted ms':>14}{'saved ms':>10}{'estimated':>11}")
+    for name, kind, documents, fields in corpora:
+        full, compacted, estimated = [], [], 0.0
+        for text in documents:
+            result = compactor.compact(text, kind, fields)
+            response = await client.generate_json(TEMPLATE.format(kind=kind, text=text))
+            full.append(response["first_token_ms"])
+            response = await client.generate_json(TEMPLATE.format(kind=kind, text=result.text))
+            compacted.append(response["first_token_ms"])
+            saved_before = compactor.stats()["estimated_saved_ms"]
+            # The per-document log lines are summarized in the table
+            with redirect_stdout(io.StringIO()):
+                compactor.record(name, result, response["first_token_ms"])
+            estimated += compactor.stats()["estimated_saved_ms"] - saved_before
+        full_ms, compacted_ms = sum(full) / len(full), sum(compacted) / len(compacted)
+        print(f"{name:<14}{full_ms:>9.0f}{compacted_ms:>14.0f}{full_ms - compacted_ms:>10.0f}"
+              f"{estimated / len(documents):>11.0f}")
+    await client.close()
+    await stub.stop()
+
+
+async def main(cvs: int, pages: int, prompt_token_ms: float, latency_documents: int):
+    compactor = PromptCompactor()
+    cv_texts = [text for _, text in load_cv_texts(cvs)]
+    job_texts = [text for _, text in load_job_descriptions()]
+    corpora = [
+        ("CVs", "cv", cv_texts, CV_FIELDS),
+        (f"CVs {pages} pages", "cv", [paginate(text, pages) for text in cv_texts], CV_FIELDS),
+        ("JDs", "job", job_texts, JOB_FIELDS),
+        ("JDs title", "job", job_texts, ("title",))
+    ]
+    compactor.count_tokens("warm up")
+    print(f"Tokenizer: {compactor.stats()['tokenizer']}, budget {compactor.token_budget} tokens")
+    print(f"{'documents':<14}{'count':>6}{'tokens before':>15}{'after':>8}{'reduction':>11}{'cut':>5}{'ms/doc':>8}")
+    for name, kind, documents, fields in corpora:
+        result = measure(compactor, kind, documents, fields)
+        print(f"{name:<14}{len(documents):>6}{result['before']:>15.0f}{result['after']:>8.0f}"
+              f"{1 - result['after'] / result['before']:>11.0%}{result['truncated']:>5}{result['ms']:>8.2f}")
+
+    await measure_latency(compactor, [
+        (name, kind, documents[:latency_documents], fields) for name, kind, documents, fields in corpora
+    ], prompt_token_ms)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=0, help="Number of CVs to load (0 for all)")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--prompt-token-ms", type=float, default=2)
+    parser.add_argument("--latency-documents", type=int, default=10, help="Documents per corpus sent to the stub")
+    args = parser.parse_args()
+    asyncio.run(main(args.cvs, args.pages, args.prompt_token_ms, args.latency_documents))
@@ -0,0 +1,95 @@
+"""
+Measure what float16 and int8 embedding quantization cost and save.
+
+Embeds the bundled CVs and job descriptions, ranks the CVs for every job with
+full-precision and quantized candidate matrices, and reports memory, scan time
+and top-k agreement with the float32 ranking. Scan time is measured on a pool
+grown to --pool rows by perturbing the real CV vectors, since the bundled set
+is too small to time.
+
+Usage:
+    python benchmarks/bench_quantization.py --top-k 10 --pool 200000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from dataset import load_cv_texts, load_job_descriptions
+from src.agents.matcher import MatcherAgent
+from src.embeddings.backends import create_backend
+from src.embeddings.quantization import QuantizedMatrix, QUANTIZATION_MODES
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def run(k: int, pool_size: int, repeats: int):
+    cvs = load_cv_texts()
+    jobs = load_job_descriptions()
+    backend = create_backend(workers=0)
+    cv_matrix = normalize(backend.encode([text for _, text in cvs]))
+    job_matrix = normalize(backend.encode([text for _, text in jobs]))
+
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(cv_matrix), pool_size)
+    noise = rng.standard_normal((pool_size, cv_matrix.shape[1])).astype(np.float32) * 0.02
+    pool = normalize(cv_matrix[picks] + noise)
+
+    matcher = MatcherAgent()
+    exact = QuantizedMatrix.from_vectors(cv_matrix, "float32")
+    exact_pool = QuantizedMatrix.from_vectors(pool, "float32")
+
+    print(f"{len(cvs)} CVs, {len(jobs)} jobs, top-{k}; scan pool {pool_size} rows")
+    print(f"{'mode':<9}{'MiB':>9}{'saved':>8}{'scan ms':>10}{'speed-up':>10}{'top-k agree':>13}{'pool agree':>12}")
+    baseline_ms = None
+    for mode in QUANTIZATION_MODES:
+        quantized = QuantizedMatrix.from_vectors(cv_matrix, mode)
+        agreement = np.mean([
+            len(np.intersect1d(
+                top_k(matcher.score_candidates(job, quantized), k),
+                top_k(matcher.score_candidates(job, exact), k)
+            )) / min(k, len(cvs))
+            for job in job_matrix
+        ])
+
+        quantized_pool = QuantizedMatrix.from_vectors(pool, mode)
+        pool_agreement = np.mean([
+            len(np.intersect1d(
+                top_k(quantized_pool.scores(job), k),
+                top_k(exact_pool.scores(job), k)
+            )) / k
+            for job in job_matrix
+        ])
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for job in job_matrix:
+                matcher.score_candidates(job, quantized_pool)
+            timings.append((time.perf_counter() - start) / len(job_matrix))
+        scan_ms = min(timings) * 1000
+        baseline_ms = baseline_ms or scan_ms
+
+        print(
+            f"{mode:<9}{quantized_pool.nbytes / 2**20:>9.1f}"
+            f"{1 - quantized_pool.nbytes / exact_pool.nbytes:>8.0%}"
+            f"{scan_ms:>10.2f}{baseline_ms / scan_ms:>9.2f}x"
+            f"{agreement:>13.1%}{pool_agreement:>12.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--pool", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.top_k, args.pool, args.repeats)
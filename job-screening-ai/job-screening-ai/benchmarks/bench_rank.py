@@ -0,0 +1,72 @@
+"""
+Measure the latency of ranking every candidate in the pool for one job.
+
+Builds a synthetic candidate pool of --pool candidates (random unit embeddings,
+a few skill ids from a vocabulary and a few experience entries each) and times
+MatcherAgent.rank_candidates, which serves the /jobs/{job_id}/rank endpoint.
+
+Usage:
+    python benchmarks/bench_rank.py --pool 100000 --top-k 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.matcher import MatcherAgent
+from src.embeddings.quantization import QUANTIZATION_MODES
+from src.matching.candidate_pool import CandidatePool
+
+DIM = 384
+
+
+def build_rows(size: int, vocabulary: int, rng: np.random.Generator):
+    embeddings = rng.standard_normal((size, DIM)).astype(np.float32)
+    rows = []
+    for candidate_id in range(size):
+        skill_ids = np.unique(rng.integers(0, vocabulary, rng.integers(3, 15))).astype(np.uint32)
+        experience = rng.standard_normal((rng.integers(0, 5), DIM)).astype(np.float32)
+        rows.append((candidate_id, embeddings[candidate_id], skill_ids, experience))
+    return rows
+
+
+def run(pool_size: int, top_k: int, vocabulary: int, repeats: int):
+    rng = np.random.default_rng(0)
+    rows = build_rows(pool_size, vocabulary, rng)
+    job = {
+        'embedding': rng.standard_normal(DIM).astype(np.float32),
+        'experience_embedding': rng.standard_normal(DIM).astype(np.float32),
+        'skill_ids': np.arange(10, dtype=np.uint32)
+    }
+    matcher = MatcherAgent()
+
+    print(f"{pool_size} candidates, {vocabulary} skills, top-{top_k}, best of {repeats}")
+    print(f"{'mode':<9}{'load s':>9}{'MiB':>9}{'rank ms':>10}")
+    for mode in QUANTIZATION_MODES:
+        pool = CandidatePool(mode)
+        start = time.perf_counter()
+        pool.add_rows(rows)
+        load = time.perf_counter() - start
+
+        snapshot = pool.snapshot()
+        mib = (snapshot.embeddings.nbytes + snapshot.experience.nbytes + snapshot.skill_ids.nbytes * 2) / 2**20
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            matcher.rank_candidates(job, pool, top_k)
+            timings.append(time.perf_counter() - start)
+        print(f"{mode:<9}{load:>9.2f}{mib:>9.1f}{min(timings) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, default=100000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.pool, args.top_k, args.vocabulary, args.repeats)
@@ -0,0 +1,86 @@
+"""
+Measure previewing and applying new score weights on stored matches.
+
+Creates a temporary SQLite database with --matches synthetic matches spread
+over --jobs jobs (random component scores), then times a weight preview over
+all matches, a preview of one job's ranking and the single UPDATE that applies
+the weights.
+
+Usage:
+    python benchmarks/bench_rerank.py --matches 1000000 --jobs 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.matcher import MatcherAgent
+from src.database.models import Base
+from src.matching.rerank import preview_weights, apply_weights
+
+
+def build_database(path: str, matches: int, jobs: int):
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    rng = np.random.default_rng(0)
+    components = rng.uniform(0, 100, (matches, 3))
+    weights = np.array([MatcherAgent.WEIGHTS[name] for name in ("embedding", "skills", "experience")])
+    scores = components @ weights
+    key = MatcherAgent().weights_key
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        "INSERT INTO matches (job_id, candidate_id, match_score, match_details, status,"
+        " embedding_score, skill_score, experience_score, weights_key) VALUES (?, ?, ?, ?, 'pending', ?, ?, ?, ?)",
+        (
+            (row % jobs + 1, row // jobs + 1, scores[row], json.dumps({"overall_score": scores[row]}),
+             *components[row], key)
+            for row in range(matches)
+        )
+    )
+    connection.commit()
+    connection.close()
+
+
+async def measure(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    weights = {"embedding": 0.2, "skills": 0.5, "experience": 0.3}
+    async with AsyncSession(engine) as session:
+        start = time.perf_counter()
+        summary = await preview_weights(session, weights)
+        print(f"preview, all matches:  {time.perf_counter() - start:6.2f} s "
+              f"({summary['rank_changes']} rank changes, {summary['top_match_changes']} new top matches)")
+
+        start = time.perf_counter()
+        await preview_weights(session, weights, job_id=1)
+        print(f"preview, one job:      {time.perf_counter() - start:6.2f} s")
+
+        start = time.perf_counter()
+        summary = await apply_weights(session, weights)
+        print(f"apply:                 {time.perf_counter() - start:6.2f} s ({summary['updated']} matches)")
+    await engine.dispose()
+
+
+def run(matches: int, jobs: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rerank.db")
+        start = time.perf_counter()
+        build_database(path, matches, jobs)
+        print(f"{matches} matches over {jobs} jobs (built in {time.perf_counter() - start:.1f} s)")
+        asyncio.run(measure(path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=1000000)
+    parser.add_argument("--jobs", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.matches, args.jobs)
@@ -0,0 +1,74 @@
+"""
+Measure the inverted skill index and ranking with a skill prefilter.
+
+Builds the same synthetic pool as bench_rank.py, reports the size of the
+delta-encoded posting lists against plain int64 arrays, times OR, AND and
+at-least-k queries for a job with --job-skills skills, and compares ranking
+the whole pool with ranking only the candidates the index lets through.
+
+Usage:
+    python benchmarks/bench_skill_index.py --pool 100000 --job-skills 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_rank import DIM, build_rows
+from src.agents.matcher import MatcherAgent
+from src.matching.candidate_pool import CandidatePool
+
+
+def best_of(repeats: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def run(pool_size: int, vocabulary: int, job_skills: int, repeats: int):
+    rng = np.random.default_rng(0)
+    rows = build_rows(pool_size, vocabulary, rng)
+    pool = CandidatePool()
+    pool.add_rows(rows)
+    index = pool.skill_index
+
+    stats = index.stats()
+    print(f"{pool_size} candidates, {vocabulary} skills, {stats['postings']} postings")
+    print(f"posting lists: {stats['bytes'] / 2**20:.2f} MiB ({stats['raw_bytes'] / 2**20:.2f} MiB as int64)")
+
+    skill_ids = np.arange(job_skills, dtype=np.uint32)
+    job = {
+        'embedding': rng.standard_normal(DIM).astype(np.float32),
+        'experience_embedding': rng.standard_normal(DIM).astype(np.float32),
+        'skill_ids': skill_ids
+    }
+
+    print(f"\n{'query':<14}{'matches':>9}{'ms':>8}")
+    queries = [("any", 1)] + [(f"at least {k}", k) for k in (2, 3)] + [("all", job_skills)]
+    for name, k in queries:
+        matches = len(index.at_least(skill_ids, k)[0])
+        print(f"{name:<14}{matches:>9}{best_of(repeats, index.at_least, skill_ids, k):>8.2f}")
+
+    matcher = MatcherAgent()
+    print(f"\n{'min_skills':<12}{'scored':>9}{'rank ms':>10}")
+    for min_skills in (0, 1, 2, 3):
+        scored = len(pool.rows_with_skills(pool.snapshot(), skill_ids, min_skills)[0]) if min_skills else pool_size
+        timing = best_of(repeats, matcher.rank_candidates, job, pool, 10, min_skills)
+        print(f"{min_skills:<12}{scored:>9}{timing:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=2000)
+    parser.add_argument("--job-skills", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.pool, args.vocabulary, args.job_skills, args.repeats)
@@ -0,0 +1,102 @@
+"""
+Measure semantic skill matching with the precomputed skill synonym table.
+
+Builds the same synthetic pool as bench_rank.py and a vocabulary of random
+skill embeddings in which every --synonym-every-th skill has a close variant
+(as "postgres" and "postgresql" have). Reports the time to build the synonym
+table for the whole vocabulary and to add a batch of new skills to it, then
+compares ranking the pool and scoring single pairs with exact skill ids and
+with synonyms.
+
+Usage:
+    python benchmarks/bench_skill_synonyms.py --pool 100000 --vocabulary 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_rank import DIM, build_rows
+from src.agents.matcher import MatcherAgent
+from src.matching.candidate_pool import CandidatePool
+from src.matching.skill_synonyms import skill_synonyms
+
+
+def best_of(repeats: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def skill_vectors(count: int, synonym_every: int, rng: np.random.Generator) -> np.ndarray:
+    """Random skill embeddings where skill i + 1 is a close variant of skill i for every synonym_every-th i."""
+    vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+    variants = np.arange(0, count - 1, synonym_every)
+    vectors[variants + 1] = vectors[variants] + 0.2 * rng.standard_normal((len(variants), DIM))
+    return vectors
+
+
+def pairs(matcher: MatcherAgent, job: dict, candidates: list):
+    for candidate in candidates:
+        matcher._match_skills(job, candidate)
+
+
+def run(pool_size: int, vocabulary: int, new_skills: int, synonym_every: int, job_skills: int, repeats: int):
+    rng = np.random.default_rng(0)
+    rows = build_rows(pool_size, vocabulary, rng)
+    pool = CandidatePool()
+    pool.add_rows(rows)
+
+    job = {
+        'embedding': rng.standard_normal(DIM).astype(np.float32),
+        'experience_embedding': rng.standard_normal(DIM).astype(np.float32),
+        'skill_ids': np.arange(0, job_skills * synonym_every, synonym_every, dtype=np.uint32)
+    }
+    candidates = [{'skill_ids': row[2]} for row in rows[:10000]]
+    matcher = MatcherAgent()
+
+    exact_rank = best_of(repeats, matcher.rank_candidates, job, pool, 10)
+    exact_pairs = best_of(repeats, pairs, matcher, job, candidates)
+    exact_match = matcher.rank_candidates(job, pool, len(pool))
+
+    vectors = skill_vectors(vocabulary + new_skills, synonym_every, rng)
+    start = time.perf_counter()
+    skill_synonyms.add(np.arange(vocabulary), vectors[:vocabulary])
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    skill_synonyms.add(np.arange(vocabulary, vocabulary + new_skills), vectors[vocabulary:])
+    grow = time.perf_counter() - start
+
+    stats = skill_synonyms.stats()
+    print(f"{pool_size} candidates, {stats['skills']} skills, {stats['synonym_pairs']} synonym pairs "
+          f"(threshold {stats['threshold']}), matrix {stats['matrix_bytes'] / 2**20:.1f} MiB")
+    print(f"build table for {vocabulary} skills: {build * 1000:.0f} ms, add {new_skills} skills: {grow * 1000:.1f} ms")
+
+    synonym_rank = best_of(repeats, matcher.rank_candidates, job, pool, 10)
+    synonym_pairs = best_of(repeats, pairs, matcher, job, candidates)
+    synonym_match = matcher.rank_candidates(job, pool, len(pool))
+    exact_share = np.mean([match['skill_match'] > 0 for match in exact_match])
+    synonym_share = np.mean([match['skill_match'] > 0 for match in synonym_match])
+
+    print(f"\n{'':<10}{'rank ms':>10}{'10k pairs ms':>14}{'with a skill':>14}")
+    print(f"{'exact':<10}{exact_rank:>10.1f}{exact_pairs:>14.1f}{exact_share:>14.1%}")
+    print(f"{'synonyms':<10}{synonym_rank:>10.1f}{synonym_pairs:>14.1f}{synonym_share:>14.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--new-skills", type=int, default=100)
+    parser.add_argument("--synonym-every", type=int, default=5)
+    parser.add_argument("--job-skills", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.pool, args.vocabulary, args.new_skills, args.synonym_every, args.job_skills, args.repeats)
@@ -0,0 +1,62 @@
+"""Loaders for the bundled job-screening dataset used by the benchmarks."""
+import csv
+import glob
+import os
+import sys
+from typing import List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+DATASET_DIR = os.getenv("DATASET_DIR", os.path.normpath(os.path.join(
+    PROJECT_ROOT, "..", "..", "Dataset",
+    "[Usecase 5] AI-Powered Job Application Screening System"
+)))
+CV_DIR = os.path.join(DATASET_DIR, "CVs1")
+JOB_DESCRIPTIONS_CSV = os.path.join(DATASET_DIR, "job_description.csv")
+
+
+def cv_paths(limit: int = 0) -> List[str]:
+    """
+    Get the paths of the bundled CV PDFs.
+
+    Args:
+        limit (int): Maximum number of paths to return (0 for all)
+
+    Returns:
+        List[str]: Sorted PDF paths
+    """
+    paths = sorted(glob.glob(os.path.join(glob.escape(CV_DIR), "*.pdf")))
+    return paths[:limit] if limit else paths
+
+
+def load_cv_texts(limit: int = 0) -> List[Tuple[str, str]]:
+    """
+    Extract the text of the bundled CVs.
+
+    Args:
+        limit (int): Maximum number of CVs to load (0 for all)
+
+    Returns:
+        List[Tuple[str, str]]: (CV id, text) pairs
+    """
+    from src.agents.cv_analyzer import CVAnalyzerAgent
+
+    extract = CVAnalyzerAgent()._extract_text_from_pdf
+    return [
+        (os.path.splitext(os.path.basename(path))[0], extract(path))
+        for path in cv_paths(limit)
+    ]
+
+
+def load_job_descriptions() -> List[Tuple[str, str]]:
+    """
+    Load the bundled job descriptions.
+
+    Returns:
+        List[Tuple[str, str]]: (job title, description) pairs
+    """
+    with open(JOB_DESCRIPTIONS_CSV, encoding="cp1252", newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        return [(row[0].strip(), row[1].strip()) for row in reader if len(row) > 1 and row[1].strip()]
@@ -0,0 +1,208 @@
+"""
+Minimal stand-in for the Ollama HTTP API, for offline benchmarks.
+
+Serves POST /api/generate over HTTP/1.1 with keep-alive. Every generation
+takes --latency-ms, plus --prompt-token-ms per prompt token (whitespace-separated
+word) before the first token, plus --token-ms per generated token, and returns
+--response (a small JSON object by default). At most --parallel generations run at once
+and the rest queue, like OLLAMA_NUM_PARALLEL on a real server. The number of
+accepted connections is counted, so connection reuse can be checked.
+
+Requests with "stream" true (the Ollama default) get one NDJSON message per
+token as it is generated. A client that disconnects mid-stream stops the
+generation, as with Ollama; tokens_sent counts the tokens actually produced.
+
+Usage:
+    python benchmarks/ollama_stub.py --port 11435 --latency-ms 200 --parallel 4
+    OLLAMA_HOST=http://127.0.0.1:11435 uvicorn src.main:app
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_RESPONSE = json.dumps({
+    "title": "Software Engineer",
+    "required_skills": ["python", "sql"],
+    "preferred_skills": ["docker"],
+    "experience": "3+ years of backend development",
+    "education": "Bachelor's degree in Computer Science",
+    "responsibilities": ["Build APIs", "Review code"]
+})
+
+# A token is a word with the whitespace before it, so joined tokens give back the text
+_TOKEN = re.compile(r"\s*\S+|\s+")
+
+
+class OllamaStub:
+    def __init__(
+        self,
+        latency_ms: float = 200,
+        token_ms: float = 0,
+        parallel: int = 4,
+        response: str = DEFAULT_RESPONSE,
+        prompt_token_ms: float = 0
+    ):
+        """
+        Initialize the stub server.
+
+        Args:
+            latency_ms (float): Fixed time per generation
+            token_ms (float): Additional time per generated token (a word with its leading whitespace)
+            parallel (int): Generations served at once
+            response (str): Generated text
+            prompt_token_ms (float): Prompt processing time per prompt token (whitespace-separated word)
+        """
+        self.latency = latency_ms / 1000
+        self.token_time = token_ms / 1000
+        self.prompt_token_time = prompt_token_ms / 1000
+        self.parallel = max(1, parallel)
+        self.response = response
+        self.connections = 0
+        self.requests = 0
+        self.tokens_sent = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Start listening.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port, 0 for any free port
+
+        Returns:
+            int: The bound port
+        """
+        self._slots = asyncio.Semaphore(self.parallel)
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def generate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Produce the response object of one non-streaming /api/generate request."""
+        tokens = len(_TOKEN.findall(self.response))
+        async with self._slots:
+            started = time.perf_counter()
+            await asyncio.sleep(self.latency + self._prompt_time(body) + tokens * self.token_time)
+            duration = time.perf_counter() - started
+        self.tokens_sent += tokens
+        return self._final(body, duration, tokens)
+
+    async def stream(self, body: Dict[str, Any], reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """
+        Stream one /api/generate response as chunked NDJSON, a message per token.
+
+        Returns:
+            bool: False if the client disconnected before the generation finished
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        model = body.get("model", "")
+        async with self._slots:
+            started = time.perf_counter()
+            await asyncio.sleep(self.latency + self._prompt_time(body))
+            tokens = 0
+            for token in _TOKEN.findall(self.response):
+                await asyncio.sleep(self.token_time)
+                if reader.at_eof() or writer.is_closing():
+                    return False
+                self._write_chunk(writer, {"model": model, "response": token, "done": False})
+                await writer.drain()
+                tokens += 1
+                self.tokens_sent += 1
+            duration = time.perf_counter() - started
+        self._write_chunk(writer, self._final(body, duration, tokens))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+    def _prompt_time(self, body: Dict[str, Any]) -> float:
+        return len(str(body.get("prompt", "")).split()) * self.prompt_token_time
+
+    def _final(self, body: Dict[str, Any], duration: float, tokens: int) -> Dict[str, Any]:
+        """Last (or only) response message; a streamed response has already sent its text."""
+        return {
+            "model": body.get("model", ""),
+            "response": "" if body.get("stream", True) else self.response,
+            "done": True,
+            "total_duration": int(duration * 1e9),
+            "prompt_eval_count": len(str(body.get("prompt", "")).split()),
+            "prompt_eval_duration": int(self._prompt_time(body) * 1e9),
+            "eval_count": tokens
+        }
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        data = (json.dumps(message) + "\n").encode()
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                if method == "POST" and path == "/api/generate":
+                    self.requests += 1
+                    request = json.loads(body or b"{}")
+                    if request.get("stream", True):
+                        if not await self.stream(request, reader, writer):
+                            break
+                        continue
+                    status, payload = "200 OK", await self.generate(request)
+                else:
+                    status, payload = "404 Not Found", {"error": "not found"}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--token-ms", type=float, default=0)
+    parser.add_argument("--prompt-token-ms", type=float, default=0)
+    parser.add_argument("--parallel", type=int, default=4)
+    args = parser.parse_args()
+
+    stub = OllamaStub(args.latency_ms, args.token_ms, args.parallel, prompt_token_ms=args.prompt_token_ms)
+    port = await stub.start(args.host, args.port)
+    print(f"Ollama stub listening on http://{args.host}:{port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,19 +1,63 @@
-import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import numpy as np
 import PyPDF2
-import ollama
-from sentence_transformers import SentenceTransformer
+
+from src.config import OLLAMA_MODEL, EXTRACTION_CONFIDENCE_THRESHOLD
+from src.embeddings.embedding_service import embedding_service
+from src.extraction.rule_extractor import CV_FIELDS, rule_extractor
+from src.inference import inference_executor
+from src.llm.client import ollama_client
+from src.llm.prompt_compaction import prompt_compactor
+from src.llm.response_cache import llm_cache
 
 class CVAnalyzerAgent:
+    # Version of the extraction prompt; bump it when the prompt changes so cached results are not reused
+    PROMPT_VERSION = 3
+    
+    # JSON shape of each field in the extraction prompt
+    FIELD_SCHEMAS = {
+        "name": '"Full name"',
+        "email": '"Email address"',
+        "phone": '"Phone number"',
+        "skills": '["skill1", "skill2", ...]',
+        "experience": """[
+                {
+                    "title": "Job title",
+                    "company": "Company name",
+                    "duration": "Duration",
+                    "description": "Job description"
+                },
+                ...
+            ]""",
+        "education": """[
+                {
+                    "degree": "Degree name",
+                    "institution": "Institution name",
+                    "year": "Year completed"
+                },
+                ...
+            ]"""
+    }
+
     def __init__(self):
         """Initialize the CV Analyzer agent."""
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.ollama_model = "mistral"
+        self.embeddings = embedding_service
+        self.llm = ollama_client
+        self.cache = llm_cache
+        self.rules = rule_extractor
+        self.compactor = prompt_compactor
+        self.confidence_threshold = EXTRACTION_CONFIDENCE_THRESHOLD
+        self.ollama_model = OLLAMA_MODEL
 
     async def analyze_cv(self, cv_path: str) -> Dict[str, Any]:
         """
         Analyze a CV and extract key information.
         
+        Fields are read by the rule-based extractor first; the LLM is only
+        asked for the fields it is not confident about, and its result for a
+        CV text analyzed before (up to whitespace) is served from the LLM
+        response cache.
+        
         Args:
             cv_path (str): Path to the CV file (PDF)
             
@@ -26,61 +70,20 @@ class CVAnalyzerAgent:
                 - experience: List of work experience
                 - education: List of education history
                 - embedding: Vector embedding of the CV
+                - experience_embeddings: One vector per experience entry (None if it has no description)
         """
         try:
             # Extract text from PDF
-            cv_text = self._extract_text_from_pdf(cv_path)
+            cv_text = await inference_executor.run_cpu(self._extract_text_from_pdf, cv_path)
             
             # Generate embedding for the CV
-            embedding = self.model.encode(cv_text)
-            
-            # Use Ollama to extract structured information
-            prompt = f"""
-            Analyze the following CV and extract key information in JSON format:
-            
-            {cv_text}
-            
-            Return a JSON object with the following structure:
-            {{
-                "name": "Full name",
-                "email": "Email address",
-                "phone": "Phone number",
-                "skills": ["skill1", "skill2", ...],
-                "experience": [
-                    {{
-                        "title": "Job title",
-                        "company": "Company name",
-                        "duration": "Duration",
-                        "description": "Job description"
-                    }},
-                    ...
-                ],
-                "education": [
-                    {{
-                        "degree": "Degree name",
-                        "institution": "Institution name",
-                        "year": "Year completed"
-                    }},
-                    ...
-                ]
-            }}
-            """
-            
-            response = ollama.generate(
-                model=self.ollama_model,
-                prompt=prompt,
-                stream=False
-            )
+            embedding = await self.embeddings.encode(cv_text)
             
-            # Parse the response
-            try:
-                cv_data = json.loads(response['response'])
-            except json.JSONDecodeError:
-                # Fallback to basic extraction if JSON parsing fails
-                cv_data = self._extract_basic_info(cv_text)
+            cv_data = await self._extract(cv_text)
             
-            # Add the embedding to the CV data
-            cv_data['embedding'] = embedding.tolist()
+            # Add the embeddings to the CV data
+            cv_data['embedding'] = embedding
+            cv_data['experience_embeddings'] = await self._embed_experience(cv_data.get('experience', []))
             
             return cv_data
             
@@ -94,110 +97,115 @@ class CVAnalyzerAgent:
                 "skills": [],
                 "experience": [],
                 "education": [],
-                "embedding": embedding.tolist() if 'embedding' in locals() else []
+                "embedding": embedding if 'embedding' in locals() else [],
+                "experience_embeddings": []
             }
 
-    def _extract_text_from_pdf(self, pdf_path: str) -> str:
+    async def _extract(self, cv_text: str) -> Dict[str, Any]:
         """
-        Extract text from a PDF file.
+        Extract structured CV data with rules, using the LLM only for fields below the confidence threshold.
         
         Args:
-            pdf_path (str): Path to the PDF file
+            cv_text (str): The CV text
             
         Returns:
-            str: Extracted text from the PDF
+            Dict[str, Any]: Extracted CV data
         """
-        text = ""
-        try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"Error extracting text from PDF: {str(e)}")
-        return text
+        cv_data, confidence = self.rules.extract_cv(cv_text)
+        uncertain = [field for field in CV_FIELDS if confidence[field] < self.confidence_threshold]
+        self.rules.record("cv", uncertain)
+        if not uncertain:
+            return cv_data
+        
+        # Results hold only the fields asked for, so they are cached per field set
+        fields_key = ",".join(sorted(uncertain))
+        # The cache reads and writes SQLite, so it is used from the I/O pool
+        llm_data = await inference_executor.run_io(
+            self.cache.get, self.ollama_model, "cv_extraction", self.PROMPT_VERSION, cv_text, fields_key
+        )
+        if llm_data is None:
+            llm_data = await self._extract_with_llm(cv_text, uncertain)
+            if llm_data is None:
+                # Keep the rule-based values if no object could be recovered; not cached, the LLM may do better next time
+                return cv_data
+            await inference_executor.run_io(
+                self.cache.put, self.ollama_model, "cv_extraction", self.PROMPT_VERSION, cv_text,
+                llm_data, fields_key
+            )
+        
+        cv_data.update({field: llm_data[field] for field in uncertain if field in llm_data})
+        return cv_data
 
-    def _extract_basic_info(self, cv_text: str) -> Dict[str, Any]:
+    async def _extract_with_llm(self, cv_text: str, fields: List[str]) -> Optional[Dict[str, Any]]:
         """
-        Fallback method to extract basic information from CV text.
+        Extract fields of a CV with the LLM.
         
         Args:
             cv_text (str): The CV text
+            fields (List[str]): Fields to extract
             
         Returns:
-            Dict[str, Any]: Basic CV data structure
+            Optional[Dict[str, Any]]: Extracted fields, or None if the response holds no JSON object
         """
-        # Split the text into lines
-        lines = cv_text.split('\n')
-        
-        # Initialize the basic structure
-        cv_data = {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "skills": [],
-            "experience": [],
-            "education": []
-        }
+        # Normalized, without page furniture and irrelevant sections, within the token budget
+        compacted = await inference_executor.run_cpu(self.compactor.compact, cv_text, "cv", fields)
+        structure = ",\n".join(f'            "{field}": {self.FIELD_SCHEMAS[field]}' for field in fields)
+        # Use Ollama to extract structured information
+        prompt = f"""
+        Analyze the following CV and extract key information in JSON format:
         
-        # Try to find name (usually in the first few lines)
-        for line in lines[:3]:
-            if line.strip() and len(line.strip()) < 50:  # Names are usually short
-                cv_data["name"] = line.strip()
-                break
+        {compacted.text}
         
-        # Look for email and phone
-        for line in lines:
-            line = line.strip().lower()
-            if '@' in line and '.' in line:
-                cv_data["email"] = line
-            elif any(c.isdigit() for c in line) and len(line) > 8:
-                cv_data["phone"] = line
+        Return a JSON object with the following structure:
+        {{
+{structure}
+        }}
+        """
         
-        # Look for common section headers
-        current_section = None
-        current_experience = {}
-        current_education = {}
+        # Streamed: generation stops once the JSON object is complete, fences and truncation are repaired
+        response = await self.llm.generate_json(prompt, model=self.ollama_model)
+        self.compactor.record("CV", compacted, response['first_token_ms'])
+        return response['result']
+
+    async def _embed_experience(self, experience: List[Dict[str, Any]]) -> List[Optional[np.ndarray]]:
+        """
+        Embed every experience description of a CV in a single batch.
         
-        for line in lines:
-            line = line.strip()
-            
-            # Identify sections
-            if "experience" in line.lower() or "work" in line.lower():
-                current_section = "experience"
-            elif "education" in line.lower():
-                current_section = "education"
-            elif "skills" in line.lower():
-                current_section = "skills"
+        Args:
+            experience (List[Dict[str, Any]]): Experience entries from the CV
             
-            # Process the line based on the current section
-            if current_section == "skills" and line and not line.endswith(":"):
-                cv_data["skills"].append(line)
-            elif current_section == "experience" and line:
-                if "title" in line.lower() or "position" in line.lower():
-                    if current_experience:
-                        cv_data["experience"].append(current_experience)
-                    current_experience = {"title": line}
-                elif "company" in line.lower():
-                    current_experience["company"] = line
-                elif "duration" in line.lower():
-                    current_experience["duration"] = line
-                else:
-                    current_experience["description"] = current_experience.get("description", "") + " " + line
-            elif current_section == "education" and line:
-                if "degree" in line.lower():
-                    if current_education:
-                        cv_data["education"].append(current_education)
-                    current_education = {"degree": line}
-                elif "institution" in line.lower():
-                    current_education["institution"] = line
-                elif "year" in line.lower():
-                    current_education["year"] = line
+        Returns:
+            List[Optional[np.ndarray]]: Embeddings aligned with the experience entries,
+                None for entries without a description
+        """
+        descriptions = [
+            (i, exp['description'])
+            for i, exp in enumerate(experience)
+            if isinstance(exp, dict) and exp.get('description')
+        ]
+        vectors = await self.embeddings.encode_many([text for _, text in descriptions])
         
-        # Add the last experience and education entries
-        if current_experience:
-            cv_data["experience"].append(current_experience)
-        if current_education:
-            cv_data["education"].append(current_education)
+        experience_embeddings: List[Optional[np.ndarray]] = [None] * len(experience)
+        for (i, _), vector in zip(descriptions, vectors):
+            experience_embeddings[i] = vector
+        return experience_embeddings
+
+    def _extract_text_from_pdf(self, pdf_path: str) -> str:
+        """
+        Extract text from a PDF file.
         
-        return cv_data 
\ No newline at end of file
+        Args:
+            pdf_path (str): Path to the PDF file
+            
+        Returns:
+            str: Extracted text from the PDF
+        """
+        text = ""
+        try:
+            with open(pdf_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                for page in pdf_reader.pages:
+                    text += page.extract_text() + "\n"
+        except Exception as e:
+            print(f"Error extracting text from PDF: {str(e)}")
+        return text
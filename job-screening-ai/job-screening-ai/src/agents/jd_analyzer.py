@@ -1,18 +1,47 @@
-import json
-from typing import Dict, Any
-import ollama
-from sentence_transformers import SentenceTransformer
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+from src.config import OLLAMA_MODEL, EXTRACTION_CONFIDENCE_THRESHOLD
+from src.embeddings.embedding_service import embedding_service
+from src.extraction.rule_extractor import JOB_FIELDS, rule_extractor
+from src.inference import inference_executor
+from src.llm.client import ollama_client
+from src.llm.prompt_compaction import prompt_compactor
+from src.llm.response_cache import llm_cache
 
 class JDAnalyzerAgent:
+    # Version of the extraction prompt; bump it when the prompt changes so cached results are not reused
+    PROMPT_VERSION = 3
+    
+    # JSON shape of each field in the extraction prompt
+    FIELD_SCHEMAS = {
+        "title": '"Job title"',
+        "required_skills": '["skill1", "skill2", ...]',
+        "preferred_skills": '["skill1", "skill2", ...]',
+        "experience": '"Required experience description"',
+        "education": '"Required education description"',
+        "responsibilities": '["responsibility1", "responsibility2", ...]'
+    }
+
     def __init__(self):
         """Initialize the JD Analyzer agent."""
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.ollama_model = "mistral"
+        self.embeddings = embedding_service
+        self.llm = ollama_client
+        self.cache = llm_cache
+        self.rules = rule_extractor
+        self.compactor = prompt_compactor
+        self.confidence_threshold = EXTRACTION_CONFIDENCE_THRESHOLD
+        self.ollama_model = OLLAMA_MODEL
 
     async def analyze_job_description(self, job_description: str) -> Dict[str, Any]:
         """
         Analyze a job description and extract key information.
         
+        Fields are read by the rule-based extractor first; the LLM is only
+        asked for the fields it is not confident about, and its result for a
+        description analyzed before (up to whitespace) is served from the LLM
+        response cache.
+        
         Args:
             job_description (str): The job description text
             
@@ -26,43 +55,17 @@ class JDAnalyzerAgent:
                 - education: Required education
                 - responsibilities: List of key responsibilities
                 - embedding: Vector embedding of the job description
+                - experience_embedding: Vector embedding of the experience requirement
         """
         try:
             # Generate embedding for the job description
-            embedding = self.model.encode(job_description)
-            
-            # Use Ollama to extract structured information
-            prompt = f"""
-            Analyze the following job description and extract key information in JSON format:
-            
-            {job_description}
-            
-            Return a JSON object with the following structure:
-            {{
-                "title": "Job title",
-                "required_skills": ["skill1", "skill2", ...],
-                "preferred_skills": ["skill1", "skill2", ...],
-                "experience": "Required experience description",
-                "education": "Required education description",
-                "responsibilities": ["responsibility1", "responsibility2", ...]
-            }}
-            """
-            
-            response = ollama.generate(
-                model=self.ollama_model,
-                prompt=prompt,
-                stream=False
-            )
+            embedding = await self.embeddings.encode(job_description)
             
-            # Parse the response
-            try:
-                job_data = json.loads(response['response'])
-            except json.JSONDecodeError:
-                # Fallback to basic extraction if JSON parsing fails
-                job_data = self._extract_basic_info(job_description)
+            job_data = await self._extract(job_description)
             
-            # Add the embedding and description to the job data
-            job_data['embedding'] = embedding.tolist()
+            # Add the embeddings and description to the job data
+            job_data['embedding'] = embedding
+            job_data['experience_embedding'] = await self._embed_experience(job_data.get('experience'))
             job_data['description'] = job_description
             
             return job_data
@@ -78,64 +81,86 @@ class JDAnalyzerAgent:
                 "experience": "",
                 "education": "",
                 "responsibilities": [],
-                "embedding": embedding.tolist() if 'embedding' in locals() else []
+                "embedding": embedding if 'embedding' in locals() else [],
+                "experience_embedding": None
             }
 
-    def _extract_basic_info(self, job_description: str) -> Dict[str, Any]:
+    async def _extract(self, job_description: str) -> Dict[str, Any]:
         """
-        Fallback method to extract basic information from job description.
+        Extract structured job data with rules, using the LLM only for fields below the confidence threshold.
         
         Args:
             job_description (str): The job description text
             
         Returns:
-            Dict[str, Any]: Basic job data structure
+            Dict[str, Any]: Extracted job data
         """
-        # Split the description into lines
-        lines = job_description.split('\n')
+        job_data, confidence = self.rules.extract_job(job_description)
+        uncertain = [field for field in JOB_FIELDS if confidence[field] < self.confidence_threshold]
+        self.rules.record("job", uncertain)
+        if not uncertain:
+            return job_data
         
-        # Initialize the basic structure
-        job_data = {
-            "title": "",
-            "required_skills": [],
-            "preferred_skills": [],
-            "experience": "",
-            "education": "",
-            "responsibilities": []
-        }
+        # Results hold only the fields asked for, so they are cached per field set
+        fields_key = ",".join(sorted(uncertain))
+        # The cache reads and writes SQLite, so it is used from the I/O pool
+        llm_data = await inference_executor.run_io(
+            self.cache.get, self.ollama_model, "jd_extraction", self.PROMPT_VERSION, job_description, fields_key
+        )
+        if llm_data is None:
+            llm_data = await self._extract_with_llm(job_description, uncertain)
+            if llm_data is None:
+                # Keep the rule-based values if no object could be recovered; not cached, the LLM may do better next time
+                return job_data
+            await inference_executor.run_io(
+                self.cache.put, self.ollama_model, "jd_extraction", self.PROMPT_VERSION, job_description,
+                llm_data, fields_key
+            )
         
-        # Try to find the job title (usually in the first few lines)
-        for line in lines[:3]:
-            if line.strip() and len(line.strip()) < 100:  # Job titles are usually short
-                job_data["title"] = line.strip()
-                break
+        job_data.update({field: llm_data[field] for field in uncertain if field in llm_data})
+        return job_data
+
+    async def _extract_with_llm(self, job_description: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Extract fields of a job description with the LLM.
         
-        # Look for common section headers
-        current_section = None
-        for line in lines:
-            line = line.strip().lower()
-            
-            # Identify sections
-            if "requirements" in line or "qualifications" in line:
-                current_section = "requirements"
-            elif "responsibilities" in line or "duties" in line:
-                current_section = "responsibilities"
-            elif "education" in line:
-                current_section = "education"
-            elif "experience" in line:
-                current_section = "experience"
+        Args:
+            job_description (str): The job description text
+            fields (List[str]): Fields to extract
             
-            # Process the line based on the current section
-            if current_section == "requirements" and line and not line.endswith(":"):
-                if "preferred" in line:
-                    job_data["preferred_skills"].append(line)
-                else:
-                    job_data["required_skills"].append(line)
-            elif current_section == "responsibilities" and line and not line.endswith(":"):
-                job_data["responsibilities"].append(line)
-            elif current_section == "education" and line and not line.endswith(":"):
-                job_data["education"] = line
-            elif current_section == "experience" and line and not line.endswith(":"):
-                job_data["experience"] = line
+        Returns:
+            Optional[Dict[str, Any]]: Extracted fields, or None if the response holds no JSON object
+        """
+        # Normalized, without page furniture and irrelevant sections, within the token budget
+        compacted = await inference_executor.run_cpu(self.compactor.compact, job_description, "job", fields)
+        structure = ",\n".join(f'            "{field}": {self.FIELD_SCHEMAS[field]}' for field in fields)
+        # Use Ollama to extract structured information
+        prompt = f"""
+        Analyze the following job description and extract key information in JSON format:
+        
+        {compacted.text}
         
-        return job_data 
\ No newline at end of file
+        Return a JSON object with the following structure:
+        {{
+{structure}
+        }}
+        """
+        
+        # Streamed: generation stops once the JSON object is complete, fences and truncation are repaired
+        response = await self.llm.generate_json(prompt, model=self.ollama_model)
+        self.compactor.record("job description", compacted, response['first_token_ms'])
+        return response['result']
+
+    async def _embed_experience(self, experience: Any) -> Optional[np.ndarray]:
+        """
+        Embed the experience requirement of a job.
+        
+        Args:
+            experience (Any): Required experience description
+            
+        Returns:
+            Optional[np.ndarray]: Embedding of the requirement, or None if there is none
+        """
+        if not experience or not isinstance(experience, str):
+            return None
+        return await self.embeddings.encode(experience)
@@ -1,16 +1,129 @@
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional, Sequence
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+from src.config import MATCH_WEIGHT_EMBEDDING, MATCH_WEIGHT_SKILLS, MATCH_WEIGHT_EXPERIENCE
+from src.database.skill_vocabulary import skill_vocabulary, normalize_skill
+from src.embeddings.embedding_service import embedding_service
+from src.embeddings.quantization import QuantizedMatrix
+from src.matching.ann_index import IVFIndex
+from src.matching.candidate_pool import CandidatePool, PoolSnapshot
+from src.matching.skill_synonyms import skill_synonyms
+
+# Score components, in the order of the component columns of Match
+COMPONENTS = ('embedding', 'skills', 'experience')
+
+
+def normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
+    """
+    Validate component weights and scale them to sum to 1, so scores stay within 0-100.
+    
+    Args:
+        weights (Dict[str, float]): Non-negative weight of each of COMPONENTS
+        
+    Returns:
+        Dict[str, float]: Weights summing to 1
+    """
+    if set(weights) != set(COMPONENTS):
+        raise ValueError(f"Weights must be given for exactly: {', '.join(COMPONENTS)}")
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Weights must not be negative")
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("At least one weight must be positive")
+    return {name: weights[name] / total for name in COMPONENTS}
+
+
+def scoring_key() -> str:
+    """Identifier of the scoring inputs other than the weights: skill synonym threshold and embedding model."""
+    return f"skill_threshold={skill_synonyms.threshold:g};model={embedding_service.model_name}"
+
+
+def weights_key(weights: Dict[str, float]) -> str:
+    """Identifier of a weight configuration and the current scoring inputs, stored with every match score."""
+    return ",".join(f"{name}={weights[name]:g}" for name in sorted(weights)) + ";" + scoring_key()
+
 
 class MatcherAgent:
+    # Weight of each component in the overall match score, shared by all matchers
+    WEIGHTS = normalize_weights({
+        'embedding': MATCH_WEIGHT_EMBEDDING,
+        'skills': MATCH_WEIGHT_SKILLS,
+        'experience': MATCH_WEIGHT_EXPERIENCE
+    })
+
     def __init__(self):
         """Initialize the Matcher agent."""
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+
+    @classmethod
+    def set_weights(cls, weights: Dict[str, float]) -> Dict[str, float]:
+        """
+        Change the weights used for new scores by every matcher in the process.
+        
+        Args:
+            weights (Dict[str, float]): Non-negative weight of each component
+            
+        Returns:
+            Dict[str, float]: The normalized weights now in use
+        """
+        cls.WEIGHTS = normalize_weights(weights)
+        return cls.WEIGHTS
+
+    @property
+    def weights_key(self) -> str:
+        """Identifier of the weight configuration and scoring inputs, stored with every match score."""
+        return weights_key(self.WEIGHTS)
+
+    def is_current(self, match: Any, job: Any, candidate: Any) -> bool:
+        """
+        Check whether a stored match was scored from the current job, candidate, weights,
+        skill synonym threshold and embedding model.
+        
+        Args:
+            match (Any): Stored match
+            job (Any): Stored job
+            candidate (Any): Stored candidate
+            
+        Returns:
+            bool: True if the stored score can be returned without recomputing it
+        """
+        return (
+            match.job_version == job.version and
+            match.candidate_version == candidate.version and
+            match.weights_key == self.weights_key
+        )
+
+    def build_match(self, job: Any, candidate: Any) -> Dict[str, Any]:
+        """
+        Score a stored job and candidate and build the match row to store.
+        
+        Args:
+            job (Any): Stored job
+            candidate (Any): Stored candidate
+            
+        Returns:
+            Dict[str, Any]: Match columns, including the versions the score was computed from
+        """
+        match_score, match_details = self.calculate_match_score(job.__dict__, candidate.__dict__)
+        return {
+            "job_id": job.id,
+            "candidate_id": candidate.id,
+            "match_score": match_score,
+            "match_details": match_details,
+            "status": "pending",
+            "embedding_score": match_details['embedding_similarity'],
+            "skill_score": match_details['skill_match'],
+            "experience_score": match_details['experience_match'],
+            "job_version": job.version,
+            "candidate_version": candidate.version,
+            "weights_key": self.weights_key
+        }
 
     def calculate_match_score(self, job_data: Dict[str, Any], cv_data: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
         """
         Calculate the match score between a job and a candidate.
         
+        Only precomputed embeddings are used, so no model call is made.
+        
         Args:
             job_data (Dict[str, Any]): Structured job data
             cv_data (Dict[str, Any]): Structured CV data
@@ -25,22 +138,16 @@ class MatcherAgent:
                 cv_data['embedding']
             )
             
-            skill_match = self._calculate_skill_match(
-                job_data['required_skills'] + job_data['preferred_skills'],
-                cv_data['skills']
-            )
+            skill_match, matching_skills = self._match_skills(job_data, cv_data)
             
-            experience_match = self._calculate_experience_match(
-                job_data['experience'],
-                cv_data['experience']
+            experience_similarities = self._calculate_experience_similarities(
+                job_data.get('experience_embedding'),
+                cv_data.get('experience_embeddings')
             )
+            experience_match = self._calculate_experience_match(experience_similarities)
             
             # Calculate weighted average score
-            weights = {
-                'embedding': 0.4,
-                'skills': 0.4,
-                'experience': 0.2
-            }
+            weights = self.WEIGHTS
             
             match_score = (
                 embedding_similarity * weights['embedding'] +
@@ -54,13 +161,10 @@ class MatcherAgent:
                 'embedding_similarity': embedding_similarity * 100,
                 'skill_match': skill_match * 100,
                 'experience_match': experience_match * 100,
-                'matching_skills': self._get_matching_skills(
-                    job_data['required_skills'] + job_data['preferred_skills'],
-                    cv_data['skills']
-                ),
+                'matching_skills': matching_skills,
                 'matching_experience': self._get_matching_experience(
-                    job_data['experience'],
-                    cv_data['experience']
+                    cv_data['experience'],
+                    experience_similarities
                 )
             }
             
@@ -89,144 +193,392 @@ class MatcherAgent:
             float: Similarity score between 0 and 1
         """
         try:
-            job_vec = np.array(job_embedding)
-            cv_vec = np.array(cv_embedding)
+            job_vec = np.asarray(job_embedding, dtype=np.float32)
+            cv_vec = np.asarray(cv_embedding, dtype=np.float32)
             
             # Calculate cosine similarity
             similarity = np.dot(job_vec, cv_vec) / (np.linalg.norm(job_vec) * np.linalg.norm(cv_vec))
             
             # Ensure the score is between 0 and 1
-            return max(0.0, min(1.0, similarity))
+            return float(max(0.0, min(1.0, similarity)))
             
         except Exception as e:
             print(f"Error calculating embedding similarity: {str(e)}")
             return 0.0
 
-    def _calculate_skill_match(self, job_skills: List[str], cv_skills: List[str]) -> float:
+    def score_candidates(self, job_embedding: Sequence[float], candidate_embeddings: QuantizedMatrix) -> np.ndarray:
         """
-        Calculate the percentage of matching skills.
+        Calculate embedding similarity between a job and many stored candidates.
+        
+        Candidate embeddings are L2-normalized when stored, so the similarity is a
+        dot product computed directly on the (possibly quantized) matrix.
         
         Args:
-            job_skills (List[str]): Required and preferred skills from job
-            cv_skills (List[str]): Skills from CV
+            job_embedding (Sequence[float]): Job description embedding
+            candidate_embeddings (QuantizedMatrix): Candidate embeddings, one per row
             
         Returns:
-            float: Match percentage between 0 and 1
+            np.ndarray: Similarity score between 0 and 1 per candidate
         """
-        try:
-            if not job_skills:
-                return 0.0
-                
-            # Convert skills to lowercase for comparison
-            job_skills = [skill.lower() for skill in job_skills]
-            cv_skills = [skill.lower() for skill in cv_skills]
+        job_vec = np.asarray(job_embedding, dtype=np.float32)
+        norm = np.linalg.norm(job_vec)
+        if norm == 0 or len(candidate_embeddings) == 0:
+            return np.zeros(len(candidate_embeddings), dtype=np.float32)
+        return np.clip(candidate_embeddings.scores(job_vec / norm), 0.0, 1.0)
+
+    def rank_candidates(
+        self,
+        job_data: Dict[str, Any],
+        pool: CandidatePool,
+        top_k: int = 10,
+        min_skills: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Score every candidate in the pool against a job and return the best ones.
+        
+        Computes the same components and weights as calculate_match_score, but
+        for all candidates at once: one matrix-vector product for the embedding
+        similarity, one membership pass over all candidate skill ids for the
+        skill match and a segmented maximum over all experience entries.
+        
+        With min_skills set, the pool's inverted skill index first narrows the
+        candidates to those having at least that many of the job skills, and
+        only they are scored; their skill match comes straight from the index.
+        
+        Args:
+            job_data (Dict[str, Any]): Structured job data
+            pool (CandidatePool): Candidates to rank
+            top_k (int): Number of candidates to return
+            min_skills (int): Minimum number of job skills a candidate needs (0 to score everyone)
             
-            # Count matching skills
-            matching_skills = sum(1 for skill in job_skills if skill in cv_skills)
+        Returns:
+            List[Dict[str, Any]]: Best candidates by descending match score, with component scores (0-100)
+        """
+        snapshot = pool.snapshot()
+        rows, skill_match = self._select_rows(job_data, pool, snapshot, min_skills)
+        if min_skills > 0:
+            embeddings = snapshot.embeddings.take(rows)
+            experience, experience_rows = self._experience_of_rows(snapshot, rows)
+        else:
+            embeddings = snapshot.embeddings
+            experience, experience_rows = snapshot.experience, snapshot.experience_rows
+        
+        count = len(rows)
+        top_k = min(max(0, top_k), count)
+        if top_k == 0:
+            return []
+        
+        embedding_similarity = self.score_candidates(job_data['embedding'], embeddings)
+        experience_match = self._score_experience_matches(
+            job_data.get('experience_embedding'),
+            experience,
+            experience_rows,
+            count
+        )
+        
+        weights = self.WEIGHTS
+        scores = (
+            embedding_similarity * weights['embedding'] +
+            skill_match * weights['skills'] +
+            experience_match * weights['experience']
+        ) * 100
+        
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [
+            {
+                'candidate_id': int(snapshot.ids[rows[i]]),
+                'match_score': float(scores[i]),
+                'embedding_similarity': float(embedding_similarity[i] * 100),
+                'skill_match': float(skill_match[i] * 100),
+                'experience_match': float(experience_match[i] * 100)
+            }
+            for i in best
+        ]
+
+    def retrieve_candidates(
+        self,
+        job_data: Dict[str, Any],
+        pool: CandidatePool,
+        top_n: int = 100,
+        min_skills: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the most promising candidates with the cheap score components only.
+        
+        Scores the pool on embedding similarity and skill match (weighted as in
+        calculate_match_score) and skips the experience comparison, which is
+        left to a later full scoring of the selected candidates.
+        
+        Args:
+            job_data (Dict[str, Any]): Structured job data
+            pool (CandidatePool): Candidates to select from
+            top_n (int): Number of candidates to select
+            min_skills (int): Minimum number of job skills a candidate needs (0 to consider everyone)
             
-            return matching_skills / len(job_skills)
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Selected candidate ids and their partial scores (0-100), best first
+        """
+        snapshot = pool.snapshot()
+        rows, skill_match = self._select_rows(job_data, pool, snapshot, min_skills)
+        embeddings = snapshot.embeddings.take(rows) if min_skills > 0 else snapshot.embeddings
+        top_n = min(max(0, top_n), len(rows))
+        if top_n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        
+        embedding_similarity = self.score_candidates(job_data['embedding'], embeddings)
+        scores = (embedding_similarity * self.WEIGHTS['embedding'] + skill_match * self.WEIGHTS['skills']) * 100
+        best = np.argpartition(-scores, top_n - 1)[:top_n]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return snapshot.ids[rows[best]], scores[best]
+
+    def _select_rows(
+        self,
+        job_data: Dict[str, Any],
+        pool: CandidatePool,
+        snapshot: PoolSnapshot,
+        min_skills: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the snapshot rows to score and their skill match.
+        
+        With min_skills set, the pool's inverted skill index narrows the rows to
+        candidates having at least that many job skills and supplies their skill
+        counts; otherwise every row is kept and the skill match is computed over
+        all candidate skill ids. A synonym of a job skill counts as that skill.
+        
+        Args:
+            job_data (Dict[str, Any]): Structured job data
+            pool (CandidatePool): Pool the snapshot was taken from
+            snapshot (PoolSnapshot): Candidates
+            min_skills (int): Minimum number of job skills a candidate needs (0 to keep everyone)
             
-        except Exception as e:
-            print(f"Error calculating skill match: {str(e)}")
-            return 0.0
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Ascending rows and their skill match between 0 and 1
+        """
+        job_skill_ids = self._job_skill_ids(job_data)
+        if min_skills > 0:
+            rows, matched = pool.rows_with_skills(
+                snapshot, job_skill_ids, min_skills, skill_synonyms.expand(job_skill_ids)
+            )
+            return rows, (matched / max(1, len(job_skill_ids))).astype(np.float32)
+        return np.arange(len(snapshot.ids)), self._score_skill_matches(job_skill_ids, snapshot)
 
-    def _calculate_experience_match(self, job_experience: str, cv_experience: List[Dict[str, Any]]) -> float:
+    def nearest_candidates(
+        self,
+        job_data: Dict[str, Any],
+        index: IVFIndex,
+        top_k: int = 10,
+        nprobe: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Calculate the percentage of matching experience.
+        Find the candidates whose embeddings are closest to a job's with the ANN index.
         
         Args:
-            job_experience (str): Required experience from job
-            cv_experience (List[Dict[str, Any]]): Experience from CV
+            job_data (Dict[str, Any]): Structured job data
+            index (IVFIndex): Candidate embedding index
+            top_k (int): Number of candidates to return
+            nprobe (Optional[int]): Number of index lists to scan, the index default when None
             
         Returns:
-            float: Match percentage between 0 and 1
+            List[Dict[str, Any]]: Candidates by descending embedding similarity (0-100)
         """
-        try:
-            if not job_experience or not cv_experience:
-                return 0.0
-                
-            # Generate embeddings for job experience and CV experience
-            job_exp_embedding = self.model.encode(job_experience)
-            cv_exp_embeddings = [
-                self.model.encode(exp['description'])
-                for exp in cv_experience
-                if 'description' in exp
-            ]
+        ids, similarities = index.search(job_data['embedding'], top_k, nprobe)
+        return [
+            {
+                'candidate_id': int(candidate_id),
+                'embedding_similarity': float(np.clip(similarity, 0.0, 1.0) * 100)
+            }
+            for candidate_id, similarity in zip(ids, similarities)
+        ]
+
+    def _score_skill_matches(self, job_skill_ids: np.ndarray, snapshot: PoolSnapshot) -> np.ndarray:
+        """
+        Calculate the skill match of every candidate in a pool snapshot,
+        counting a synonym of a job skill as that skill.
+        
+        Args:
+            job_skill_ids (np.ndarray): Sorted vocabulary ids of the job skills
+            snapshot (PoolSnapshot): Candidates to score
             
-            if not cv_exp_embeddings:
-                return 0.0
-                
-            # Calculate similarity with each experience entry
-            similarities = [
-                np.dot(job_exp_embedding, cv_exp_embedding) / 
-                (np.linalg.norm(job_exp_embedding) * np.linalg.norm(cv_exp_embedding))
-                for cv_exp_embedding in cv_exp_embeddings
-            ]
+        Returns:
+            np.ndarray: Share of the job skills each candidate has, between 0 and 1
+        """
+        count = len(snapshot.ids)
+        if len(job_skill_ids) == 0:
+            return np.zeros(count, dtype=np.float32)
+        
+        matched = skill_synonyms.count_matched(job_skill_ids, snapshot.skill_ids, snapshot.skill_rows, count)
+        return (matched / len(job_skill_ids)).astype(np.float32)
+
+    def _job_skill_ids(self, job_data: Dict[str, Any]) -> np.ndarray:
+        """Get the sorted skill ids of a job, resolving its skill names if it was not stored yet."""
+        if job_data.get('skill_ids') is not None:
+            return np.asarray(job_data['skill_ids'], dtype=np.uint32)
+        return skill_vocabulary.lookup(job_data['required_skills'] + job_data['preferred_skills'])
+
+    def _score_experience_matches(
+        self,
+        job_exp_embedding: Optional[Sequence[float]],
+        experience: QuantizedMatrix,
+        experience_rows: np.ndarray,
+        count: int
+    ) -> np.ndarray:
+        """
+        Calculate the experience match of many candidates from their experience entries.
+        
+        Args:
+            job_exp_embedding (Optional[Sequence[float]]): Embedding of the required experience
+            experience (QuantizedMatrix): Experience entries of all candidates, in candidate order
+            experience_rows (np.ndarray): Candidate position (0 to count - 1) of each entry
+            count (int): Number of candidates
             
-            # Take the highest similarity score
-            return max(0.0, min(1.0, max(similarities)))
+        Returns:
+            np.ndarray: Best experience similarity between 0 and 1 per candidate
+        """
+        matches = np.zeros(count, dtype=np.float32)
+        if job_exp_embedding is None or len(job_exp_embedding) == 0 or len(experience_rows) == 0:
+            return matches
+        
+        similarities = self.score_candidates(job_exp_embedding, experience)
+        # Entries are stored in candidate order, so each candidate's entries are one segment
+        starts = np.flatnonzero(np.r_[True, experience_rows[1:] != experience_rows[:-1]])
+        matches[experience_rows[starts]] = np.maximum.reduceat(similarities, starts)
+        return matches
+
+    def _experience_of_rows(self, snapshot: PoolSnapshot, rows: np.ndarray) -> Tuple[QuantizedMatrix, np.ndarray]:
+        """
+        Select the experience entries of some snapshot rows.
+        
+        Args:
+            snapshot (PoolSnapshot): Candidates
+            rows (np.ndarray): Ascending snapshot rows
             
-        except Exception as e:
-            print(f"Error calculating experience match: {str(e)}")
-            return 0.0
+        Returns:
+            Tuple[QuantizedMatrix, np.ndarray]: Their entries and the position in `rows` of each entry's candidate
+        """
+        starts = np.searchsorted(snapshot.experience_rows, rows, side='left')
+        lengths = np.searchsorted(snapshot.experience_rows, rows, side='right') - starts
+        offsets = np.cumsum(lengths) - lengths
+        entries = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+        owners = np.repeat(np.arange(len(rows), dtype=np.int32), lengths)
+        return snapshot.experience.take(entries), owners
 
-    def _get_matching_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[str]:
+    def _match_skills(self, job_data: Dict[str, Any], cv_data: Dict[str, Any]) -> Tuple[float, List[str]]:
         """
-        Get a list of skills that match between job and CV.
+        Calculate the skill match and the list of matching skills in one pass.
+        
+        Stored jobs and candidates carry their skills as sorted vocabulary ids;
+        a job skill is matched when the CV has it or one of its synonyms (see
+        SkillSynonyms). Data that has not been stored yet is compared by
+        normalized name.
         
         Args:
-            job_skills (List[str]): Required and preferred skills from job
-            cv_skills (List[str]): Skills from CV
+            job_data (Dict[str, Any]): Structured job data
+            cv_data (Dict[str, Any]): Structured CV data
             
         Returns:
-            List[str]: List of matching skills
+            Tuple[float, List[str]]: Share of the job skills found in the CV (0-1) and the matching skills
         """
         try:
-            # Convert skills to lowercase for comparison
-            job_skills = [skill.lower() for skill in job_skills]
-            cv_skills = [skill.lower() for skill in cv_skills]
+            job_skill_ids = job_data.get('skill_ids')
+            cv_skill_ids = cv_data.get('skill_ids')
+            if job_skill_ids is not None and cv_skill_ids is not None:
+                if len(job_skill_ids) == 0:
+                    return 0.0, []
+                found = skill_synonyms.matched(job_skill_ids, cv_skill_ids)
+                matched = np.asarray(job_skill_ids)[found]
+                return len(matched) / len(job_skill_ids), skill_vocabulary.names(matched)
             
-            # Find matching skills
-            matching_skills = [skill for skill in job_skills if skill in cv_skills]
+            job_skills = sorted(
+                {normalize_skill(skill) for skill in job_data['required_skills'] + job_data['preferred_skills']} - {""}
+            )
+            cv_skills = {normalize_skill(skill) for skill in cv_data['skills']}
+            if not job_skills:
+                return 0.0, []
+            matched = [skill for skill in job_skills if skill in cv_skills]
+            return len(matched) / len(job_skills), matched
             
-            return matching_skills
+        except Exception as e:
+            print(f"Error calculating skill match: {str(e)}")
+            return 0.0, []
+
+    def _calculate_experience_similarities(
+        self,
+        job_exp_embedding: Optional[Sequence[float]],
+        cv_exp_embeddings: Optional[Sequence[Optional[Sequence[float]]]]
+    ) -> np.ndarray:
+        """
+        Calculate cosine similarity between the job's experience requirement and
+        each CV experience entry from their precomputed embeddings.
+        
+        Args:
+            job_exp_embedding (Optional[Sequence[float]]): Embedding of the required experience
+            cv_exp_embeddings (Optional[Sequence[Optional[Sequence[float]]]]): Embeddings of the
+                CV experience entries (a matrix, or a list with None for entries without a description)
+            
+        Returns:
+            np.ndarray: Similarity per experience entry, NaN where there is no embedding
+        """
+        entries = 0 if cv_exp_embeddings is None else len(cv_exp_embeddings)
+        similarities = np.full(entries, np.nan, dtype=np.float32)
+        if job_exp_embedding is None or len(job_exp_embedding) == 0 or entries == 0:
+            return similarities
+        
+        job_vec = np.asarray(job_exp_embedding, dtype=np.float32)
+        if isinstance(cv_exp_embeddings, np.ndarray) and cv_exp_embeddings.ndim == 2:
+            # Stored matrix: missing entries are NaN rows and stay NaN
+            present = slice(None)
+            cv_matrix = cv_exp_embeddings
+        else:
+            present = [i for i, vector in enumerate(cv_exp_embeddings) if vector is not None and len(vector)]
+            if not present:
+                return similarities
+            cv_matrix = np.asarray([cv_exp_embeddings[i] for i in present], dtype=np.float32)
+        
+        norms = np.linalg.norm(cv_matrix, axis=1) * np.linalg.norm(job_vec)
+        similarities[present] = (cv_matrix @ job_vec) / np.where(norms == 0, 1.0, norms)
+        return similarities
+
+    def _calculate_experience_match(self, similarities: np.ndarray) -> float:
+        """
+        Calculate the experience match from per-entry similarities.
+        
+        Args:
+            similarities (np.ndarray): Similarity per CV experience entry
+            
+        Returns:
+            float: Match percentage between 0 and 1
+        """
+        try:
+            if not np.any(~np.isnan(similarities)):
+                return 0.0
+                
+            # Take the highest similarity score
+            return float(max(0.0, min(1.0, np.nanmax(similarities))))
             
         except Exception as e:
-            print(f"Error getting matching skills: {str(e)}")
-            return []
+            print(f"Error calculating experience match: {str(e)}")
+            return 0.0
 
-    def _get_matching_experience(self, job_experience: str, cv_experience: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _get_matching_experience(self, cv_experience: List[Dict[str, Any]], similarities: np.ndarray) -> List[Dict[str, Any]]:
         """
         Get a list of experience entries that match the job requirements.
         
         Args:
-            job_experience (str): Required experience from job
             cv_experience (List[Dict[str, Any]]): Experience from CV
+            similarities (np.ndarray): Similarity per CV experience entry
             
         Returns:
             List[Dict[str, Any]]: List of matching experience entries
         """
         try:
-            if not job_experience or not cv_experience:
-                return []
-                
-            # Generate embedding for job experience
-            job_exp_embedding = self.model.encode(job_experience)
-            
-            # Calculate similarity for each experience entry
-            matching_experience = []
-            for exp in cv_experience:
-                if 'description' in exp:
-                    exp_embedding = self.model.encode(exp['description'])
-                    similarity = np.dot(job_exp_embedding, exp_embedding) / (
-                        np.linalg.norm(job_exp_embedding) * np.linalg.norm(exp_embedding)
-                    )
-                    
-                    if similarity > 0.5:  # Threshold for considering it a match
-                        matching_experience.append(exp)
-            
-            return matching_experience
+            # Threshold for considering it a match; NaN never passes
+            return [
+                exp for exp, similarity in zip(cv_experience, similarities)
+                if similarity > 0.5
+            ]
             
         except Exception as e:
             print(f"Error getting matching experience: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
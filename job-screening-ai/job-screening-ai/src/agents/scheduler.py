@@ -1,12 +1,21 @@
 import json
 from typing import Dict, Any
 from datetime import datetime, timedelta
-import ollama
+
+from src.config import OLLAMA_MODEL
+from src.inference import inference_executor
+from src.llm.client import ollama_client
+from src.llm.response_cache import llm_cache
 
 class SchedulerAgent:
+    # Version of the email prompt; bump it when the prompt changes so cached emails are not reused
+    EMAIL_PROMPT_VERSION = 1
+
     def __init__(self):
         """Initialize the Scheduler agent."""
-        self.ollama_model = "mistral"
+        self.llm = ollama_client
+        self.cache = llm_cache
+        self.ollama_model = OLLAMA_MODEL
 
     async def schedule_interview(self, job_data: Dict[str, Any], cv_data: Dict[str, Any], match_details: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -86,20 +95,13 @@ class SchedulerAgent:
             Make sure the date is in the future and the time is during business hours (9 AM - 5 PM).
             """
             
-            response = ollama.generate(
-                model=self.ollama_model,
-                prompt=prompt,
-                stream=False
-            )
-            
-            # Parse the response
-            try:
-                interview_details = json.loads(response['response'])
-                # Validate and adjust dates if necessary
-                interview_details = self._validate_dates(interview_details)
-                return interview_details
-            except json.JSONDecodeError:
+            response = await self.llm.generate_json(prompt, model=self.ollama_model)
+            interview_details = response['result']
+            if interview_details is None:
                 return self._get_default_interview_details()
+            
+            # Validate and adjust dates if necessary
+            return self._validate_dates(interview_details)
                 
         except Exception as e:
             print(f"Error generating interview details: {str(e)}")
@@ -109,6 +111,9 @@ class SchedulerAgent:
         """
         Generate email content for the interview invitation.
         
+        Emails are cached by the details they are written from, so the same
+        invitation is only generated once.
+        
         Args:
             job_data (Dict[str, Any]): Structured job data
             cv_data (Dict[str, Any]): Structured CV data
@@ -118,6 +123,21 @@ class SchedulerAgent:
             Dict[str, str]: Email content with subject and body
         """
         try:
+            email_input = json.dumps({
+                "title": job_data['title'],
+                "name": cv_data['name'],
+                "date": interview_details['date'],
+                "time": interview_details['time'],
+                "duration": interview_details['duration'],
+                "format": interview_details['format']
+            }, sort_keys=True, default=str)
+            # The cache reads and writes SQLite, so it is used from the I/O pool
+            email_content = await inference_executor.run_io(
+                self.cache.get, self.ollama_model, "interview_email", self.EMAIL_PROMPT_VERSION, email_input
+            )
+            if email_content is not None:
+                return email_content
+            
             prompt = f"""
             Generate an email invitation for a job interview with the following details:
             
@@ -137,18 +157,15 @@ class SchedulerAgent:
             Make the email professional yet friendly, and include all necessary details.
             """
             
-            response = ollama.generate(
-                model=self.ollama_model,
-                prompt=prompt,
-                stream=False
-            )
-            
-            # Parse the response
-            try:
-                email_content = json.loads(response['response'])
-                return email_content
-            except json.JSONDecodeError:
+            response = await self.llm.generate_json(prompt, model=self.ollama_model)
+            email_content = response['result']
+            if email_content is None:
                 return self._get_default_email_templates()
+            
+            await inference_executor.run_io(
+                self.cache.put, self.ollama_model, "interview_email", self.EMAIL_PROMPT_VERSION, email_input, email_content
+            )
+            return email_content
                 
         except Exception as e:
             print(f"Error generating email content: {str(e)}")
@@ -0,0 +1,304 @@
+"""
+Re-score every job against every candidate and store the best matches.
+
+Jobs are processed in blocks of BATCH_JOB_BLOCK; for each block all candidates
+are streamed from the database in blocks of BATCH_CANDIDATE_BLOCK and scored
+with matrix products, keeping only the running top-N candidates per job. Peak
+memory therefore depends on the block sizes and N, not on the number of jobs
+or candidates. The final top-N pairs are scored once more with
+MatcherAgent.calculate_match_score, so stored matches are identical to the ones
+/match-candidate produces, and written in bulk.
+
+Usage:
+    python -m src.batch_match --top-n 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.matcher import MatcherAgent
+from src.config import BATCH_TOP_N, BATCH_JOB_BLOCK, BATCH_CANDIDATE_BLOCK
+from src.database.models import Job, Candidate, Match, Interview
+from src.database.types import normalize_rows
+from src.matching.skill_synonyms import skill_synonyms
+
+# SQLite limits the number of bound parameters per statement
+_IN_CLAUSE_CHUNK = 500
+
+
+class JobBlock:
+    def __init__(self, jobs: Sequence[Job], weights: Dict[str, float]):
+        """
+        Initialize the matrices of one block of jobs.
+
+        Args:
+            jobs (Sequence[Job]): Jobs of the block
+            weights (Dict[str, float]): Weight of each score component
+        """
+        self.jobs = list(jobs)
+        self.ids = np.array([job.id for job in self.jobs], dtype=np.int64)
+        self.weights = weights
+        self.embeddings = normalize_rows(np.stack([np.asarray(job.embedding, dtype=np.float32) for job in self.jobs]))
+
+        dim = self.embeddings.shape[1]
+        self.experience = np.zeros((len(self.jobs), dim), dtype=np.float32)
+        for row, job in enumerate(self.jobs):
+            if job.experience_embedding is not None and len(job.experience_embedding):
+                self.experience[row] = job.experience_embedding
+        self.experience = normalize_rows(self.experience)
+
+        # Skill weights over the skill ids used by this block's jobs: each job skill
+        # weighs 1/len(job skills), so the overlap product is the skill match ratio
+        job_skill_ids = [
+            np.asarray(job.skill_ids, dtype=np.uint32) if job.skill_ids is not None else np.empty(0, dtype=np.uint32)
+            for job in self.jobs
+        ]
+        self.skill_columns = np.unique(np.concatenate(job_skill_ids))
+        self.skill_weights = np.zeros((len(self.jobs), max(1, len(self.skill_columns))), dtype=np.float32)
+        for row, ids in enumerate(job_skill_ids):
+            if len(ids):
+                self.skill_weights[row, np.searchsorted(self.skill_columns, ids)] = 1.0 / len(ids)
+
+    def score(self, candidates: List[Tuple[int, Any, Any, Any]]) -> np.ndarray:
+        """
+        Score every job of the block against a block of candidates.
+
+        Args:
+            candidates (List[Tuple[int, Any, Any, Any]]): (id, embedding, skill ids,
+                experience embeddings) rows
+
+        Returns:
+            np.ndarray: Weighted match score (0-1) per job (rows) and candidate (columns)
+        """
+        embeddings = normalize_rows(np.stack([np.asarray(row[1], dtype=np.float32) for row in candidates]))
+        embedding_similarity = np.clip(self.embeddings @ embeddings.T, 0.0, 1.0)
+
+        incidence = np.zeros((len(candidates), self.skill_weights.shape[1]), dtype=np.float32)
+        skill_ids = [np.asarray(row[2] if row[2] is not None else [], dtype=np.uint32) for row in candidates]
+        ids = np.concatenate(skill_ids)
+        owners = np.repeat(np.arange(len(candidates)), [len(row_ids) for row_ids in skill_ids])
+        # A candidate having a synonym of a job skill has that skill
+        ids, owners = skill_synonyms.with_synonyms(ids, owners)
+        positions = np.minimum(np.searchsorted(self.skill_columns, ids), max(0, len(self.skill_columns) - 1))
+        known = self.skill_columns[positions] == ids if len(self.skill_columns) else np.zeros(len(ids), dtype=bool)
+        incidence[owners[known], positions[known]] = 1.0
+
+        experience, owners = [], []
+        for column, (_, _, _, experience_embeddings) in enumerate(candidates):
+            if experience_embeddings is not None and len(experience_embeddings):
+                for vector in experience_embeddings:
+                    if vector is not None and len(vector) and not np.isnan(vector).any():
+                        experience.append(vector)
+                        owners.append(column)
+        skill_match = self.skill_weights @ incidence.T
+
+        experience_match = np.zeros_like(embedding_similarity)
+        if experience:
+            entries = normalize_rows(np.asarray(experience, dtype=np.float32))
+            similarities = np.clip(self.experience @ entries.T, 0.0, 1.0)
+            owners = np.asarray(owners)
+            starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+            experience_match[:, owners[starts]] = np.maximum.reduceat(similarities, starts, axis=1)
+
+        return (
+            embedding_similarity * self.weights['embedding'] +
+            skill_match * self.weights['skills'] +
+            experience_match * self.weights['experience']
+        )
+
+
+def merge_top_n(
+    top_scores: np.ndarray,
+    top_ids: np.ndarray,
+    scores: np.ndarray,
+    ids: np.ndarray,
+    n: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge a block of scores into the running top-N of every job.
+
+    Args:
+        top_scores (np.ndarray): Current best scores per job (jobs x N, -inf when empty)
+        top_ids (np.ndarray): Candidate ids of the current best scores
+        scores (np.ndarray): New scores (jobs x block candidates)
+        ids (np.ndarray): Candidate id per column of `scores`
+        n (int): Number of candidates kept per job
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Updated best scores and candidate ids
+    """
+    combined_scores = np.concatenate([top_scores, scores], axis=1)
+    combined_ids = np.concatenate([top_ids, np.broadcast_to(ids, scores.shape)], axis=1)
+    keep = np.argpartition(-combined_scores, n - 1, axis=1)[:, :n]
+    return (
+        np.take_along_axis(combined_scores, keep, axis=1),
+        np.take_along_axis(combined_ids, keep, axis=1)
+    )
+
+
+async def stream_candidates(session: AsyncSession, block_size: int):
+    """Yield candidates as lists of (id, embedding, skill ids, experience embeddings) rows."""
+    result = await session.stream(
+        select(Candidate.id, Candidate.embedding, Candidate.skill_ids, Candidate.experience_embeddings)
+        .order_by(Candidate.id)
+        .execution_options(yield_per=block_size)
+    )
+    async for rows in result.partitions():
+        rows = [tuple(row) for row in rows if row[1] is not None and len(row[1])]
+        if rows:
+            yield rows
+
+
+async def load_by_ids(session: AsyncSession, model: Any, ids: Iterable[int]) -> Dict[int, Any]:
+    """
+    Load rows by primary key in chunks that stay within SQLite's parameter limit.
+
+    Args:
+        session (AsyncSession): Database session
+        model (Any): Mapped class with an integer `id` column
+        ids (Iterable[int]): Primary keys
+
+    Returns:
+        Dict[int, Any]: Loaded rows by id (missing ids are left out)
+    """
+    ids = sorted(set(ids))
+    rows = {}
+    for chunk_start in range(0, len(ids), _IN_CLAUSE_CHUNK):
+        result = await session.execute(
+            select(model).where(model.id.in_(ids[chunk_start:chunk_start + _IN_CLAUSE_CHUNK]))
+        )
+        rows.update({row.id: row for row in result.scalars()})
+    return rows
+
+
+async def _store_matches(session: AsyncSession, job_ids: List[int], matches: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Replace the pending matches of a block of jobs with new ones.
+
+    Pending matches without an interview are deleted; matches that have to be
+    kept are updated in place if they are among the new best pairs.
+
+    Args:
+        session (AsyncSession): Database session
+        job_ids (List[int]): Jobs of the block
+        matches (List[Dict[str, Any]]): New match rows
+
+    Returns:
+        Dict[str, int]: Number of deleted, inserted and updated matches
+    """
+    deleted = await session.execute(
+        delete(Match)
+        .where(Match.job_id.in_(job_ids))
+        .where(Match.status == "pending")
+        .where(Match.id.not_in(select(Interview.match_id)))
+    )
+    result = await session.execute(
+        select(Match.id, Match.job_id, Match.candidate_id).where(Match.job_id.in_(job_ids))
+    )
+    kept = {(job_id, candidate_id): match_id for match_id, job_id, candidate_id in result}
+
+    inserts, updates = [], []
+    for match in matches:
+        match_id = kept.get((match["job_id"], match["candidate_id"]))
+        if match_id is None:
+            inserts.append(match)
+        else:
+            updates.append({"id": match_id, **{key: value for key, value in match.items() if key != "status"}})
+    if inserts:
+        await session.execute(Match.__table__.insert(), inserts)
+    if updates:
+        await session.execute(update(Match), updates)
+    await session.commit()
+    return {"deleted": deleted.rowcount, "inserted": len(inserts), "updated": len(updates)}
+
+
+async def run_batch_match(
+    session: AsyncSession,
+    top_n: int = BATCH_TOP_N,
+    job_block: int = BATCH_JOB_BLOCK,
+    candidate_block: int = BATCH_CANDIDATE_BLOCK,
+    matcher: Optional[MatcherAgent] = None
+) -> Dict[str, Any]:
+    """
+    Re-score all jobs against all candidates and store the top-N matches per job.
+
+    Args:
+        session (AsyncSession): Database session
+        top_n (int): Number of matches stored per job
+        job_block (int): Jobs scored together
+        candidate_block (int): Candidates read and scored together
+        matcher (Optional[MatcherAgent]): Matcher providing weights and final scores
+
+    Returns:
+        Dict[str, Any]: Counts and timings of the run
+    """
+    matcher = matcher or MatcherAgent()
+    summary = {"jobs": 0, "pairs_scored": 0, "deleted": 0, "inserted": 0, "updated": 0}
+    start = time.perf_counter()
+
+    last_job_id = 0
+    while True:
+        result = await session.execute(
+            select(Job).where(Job.id > last_job_id).order_by(Job.id).limit(job_block)
+        )
+        jobs = result.scalars().all()
+        if not jobs:
+            break
+        last_job_id = jobs[-1].id
+        block = JobBlock(jobs, matcher.WEIGHTS)
+
+        top_scores = np.full((len(jobs), 0), -np.inf, dtype=np.float32)
+        top_ids = np.zeros((len(jobs), 0), dtype=np.int64)
+        async for candidates in stream_candidates(session, candidate_block):
+            ids = np.array([row[0] for row in candidates], dtype=np.int64)
+            scores = block.score(candidates)
+            n = min(top_n, top_scores.shape[1] + len(ids))
+            top_scores, top_ids = merge_top_n(top_scores, top_ids, scores, ids, n)
+            summary["pairs_scored"] += scores.size
+
+        # Score the surviving pairs with the reference implementation and store them
+        candidates = await load_by_ids(session, Candidate, {int(candidate_id) for candidate_id in top_ids.ravel()})
+
+        matches = []
+        for job, row_ids in zip(jobs, top_ids):
+            for candidate_id in row_ids:
+                matches.append(matcher.build_match(job, candidates[int(candidate_id)]))
+        # Release the loaded rows before the next block
+        session.expunge_all()
+
+        counts = await _store_matches(session, [job.id for job in jobs], matches)
+        for key, value in counts.items():
+            summary[key] += value
+        summary["jobs"] += len(jobs)
+
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+async def main():
+    from src.database.db_manager import engine, async_session, init_db
+    from src.embeddings.embedding_service import embedding_service
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-n", type=int, default=BATCH_TOP_N)
+    parser.add_argument("--job-block", type=int, default=BATCH_JOB_BLOCK)
+    parser.add_argument("--candidate-block", type=int, default=BATCH_CANDIDATE_BLOCK)
+    args = parser.parse_args()
+
+    engine.echo = False
+    await init_db()
+    await skill_synonyms.sync(embedding_service.encode_many, embedding_service.model_name)
+    async with async_session() as session:
+        summary = await run_batch_match(session, args.top_n, args.job_block, args.candidate_block)
+    await embedding_service.close()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
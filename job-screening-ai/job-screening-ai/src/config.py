@@ -0,0 +1,78 @@
+import os
+
+# Embedding backend: sentence-transformers or hashing (offline, no model download)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "sentence-transformers")
+
+# Embedding model
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+# Vector length of the hashing backend (matches all-MiniLM-L6-v2)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+# LLM
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+
+# LLM client: generations in flight at once and seconds allowed per generation
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+# Cache of parsed LLM results (TTL in seconds, 0 to keep entries until evicted)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/llm/response_cache.db")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Rule-based extraction: fields below this confidence (0-1) are extracted by the LLM (above 1 to always use the LLM)
+EXTRACTION_CONFIDENCE_THRESHOLD = float(os.getenv("EXTRACTION_CONFIDENCE_THRESHOLD", "0.7"))
+
+# Compaction of documents in extraction prompts: token budget (0 for no limit) and the
+# Hugging Face tokenizer counting them, matching OLLAMA_MODEL ("" to estimate counts)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "")
+
+# Embedding micro-batching
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", "5"))
+
+# Embedding worker processes (0 encodes in the API process)
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "0"))
+
+# Embedding cache
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "10000"))
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "data/embeddings/embedding_cache.db")
+
+# Representation of stored job and candidate embeddings: float32, float16 or int8
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "float32")
+
+# Inference executor pools
+INFERENCE_CPU_WORKERS = int(os.getenv("INFERENCE_CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+INFERENCE_IO_WORKERS = int(os.getenv("INFERENCE_IO_WORKERS", "8"))
+
+# Approximate nearest-neighbour candidate index
+ANN_INDEX_PATH = os.getenv("ANN_INDEX_PATH", "data/index/candidate_ivf.npz")
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+ANN_MIN_TRAIN_SIZE = int(os.getenv("ANN_MIN_TRAIN_SIZE", "20000"))
+
+# Batch re-scoring of all jobs against all candidates
+BATCH_TOP_N = int(os.getenv("BATCH_TOP_N", "50"))
+BATCH_JOB_BLOCK = int(os.getenv("BATCH_JOB_BLOCK", "256"))
+BATCH_CANDIDATE_BLOCK = int(os.getenv("BATCH_CANDIDATE_BLOCK", "4096"))
+
+# Background matching of new jobs and candidates
+MATCH_THRESHOLD = float(os.getenv("MATCH_THRESHOLD", "50"))
+MATCH_COALESCE_MS = float(os.getenv("MATCH_COALESCE_MS", "200"))
+
+# Weights of the match score components
+MATCH_WEIGHT_EMBEDDING = float(os.getenv("MATCH_WEIGHT_EMBEDDING", "0.4"))
+MATCH_WEIGHT_SKILLS = float(os.getenv("MATCH_WEIGHT_SKILLS", "0.4"))
+MATCH_WEIGHT_EXPERIENCE = float(os.getenv("MATCH_WEIGHT_EXPERIENCE", "0.2"))
+
+# Two-stage matching: candidates kept by the cheap first stage for full scoring
+RETRIEVAL_TOP_N = int(os.getenv("RETRIEVAL_TOP_N", "200"))
+
+# Pages of /job-matches and /candidate-matches
+MATCHES_PAGE_SIZE = int(os.getenv("MATCHES_PAGE_SIZE", "50"))
+MATCHES_MAX_PAGE_SIZE = int(os.getenv("MATCHES_MAX_PAGE_SIZE", "500"))
+
+# Semantic skill matching: cosine similarity at which two skill names count as the same skill (above 1 for exact names only)
+SKILL_SIMILARITY_THRESHOLD = float(os.getenv("SKILL_SIMILARITY_THRESHOLD", "0.8"))
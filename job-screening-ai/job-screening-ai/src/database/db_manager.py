@@ -1,10 +1,16 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
-from typing import List, Dict, Any, Optional
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from datetime import datetime
+import base64
+import json
 
+from src.config import MATCHES_PAGE_SIZE, MATCHES_MAX_PAGE_SIZE
 from .models import Base, Job, Candidate, Match, Interview
+from .migrations import run_migrations
+from .skill_vocabulary import skill_vocabulary
 
 # Create async engine
 engine = create_async_engine(
@@ -20,11 +26,37 @@ async_session = sessionmaker(
 )
 
 async def init_db():
-    """Initialize the database."""
+    """Initialize the database and migrate tables created by older versions."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+    async with async_session() as session:
+        await skill_vocabulary.load(session)
 
 class DatabaseManager:
+    # Callbacks run with every newly committed job or candidate (in-memory pools, indexes, matching)
+    job_listeners: List[Callable[[Job], None]] = []
+    candidate_listeners: List[Callable[[Candidate], None]] = []
+
+    @staticmethod
+    def add_job_listener(listener: Callable[[Job], None]):
+        """Register a callback to run after a job is created."""
+        DatabaseManager.job_listeners.append(listener)
+
+    @staticmethod
+    def add_candidate_listener(listener: Callable[[Candidate], None]):
+        """Register a callback to run after a candidate is created."""
+        DatabaseManager.candidate_listeners.append(listener)
+
+    @staticmethod
+    def _notify(listeners: List[Callable[[Any], None]], row: Any):
+        """Run creation callbacks; a failing callback never fails the request."""
+        for listener in listeners:
+            try:
+                listener(row)
+            except Exception as e:
+                print(f"Error notifying {type(row).__name__.lower()} listener: {str(e)}")
+
     @staticmethod
     async def get_session() -> AsyncSession:
         """Get a database session."""
@@ -33,10 +65,15 @@ class DatabaseManager:
 
     @staticmethod
     async def create_job(session: AsyncSession, job_data: Dict[str, Any]) -> Job:
-        """Create a new job entry."""
-        job = Job(**job_data)
+        """Create a new job entry, interning its skills into the vocabulary."""
+        skill_ids = await skill_vocabulary.intern_async(
+            session,
+            job_data.get("required_skills", []) + job_data.get("preferred_skills", [])
+        )
+        job = Job(**{**job_data, "skill_ids": skill_ids})
         session.add(job)
-        await session.commit()
+        await DatabaseManager._commit_interned(session)
+        DatabaseManager._notify(DatabaseManager.job_listeners, job)
         return job
 
     @staticmethod
@@ -49,12 +86,23 @@ class DatabaseManager:
 
     @staticmethod
     async def create_candidate(session: AsyncSession, candidate_data: Dict[str, Any]) -> Candidate:
-        """Create a new candidate entry."""
-        candidate = Candidate(**candidate_data)
+        """Create a new candidate entry, interning its skills into the vocabulary."""
+        skill_ids = await skill_vocabulary.intern_async(session, candidate_data.get("skills", []))
+        candidate = Candidate(**{**candidate_data, "skill_ids": skill_ids})
         session.add(candidate)
-        await session.commit()
+        await DatabaseManager._commit_interned(session)
+        DatabaseManager._notify(DatabaseManager.candidate_listeners, candidate)
         return candidate
 
+    @staticmethod
+    async def _commit_interned(session: AsyncSession):
+        """Commit a transaction that may have added skills, resetting the vocabulary mirror if it fails."""
+        try:
+            await session.commit()
+        except Exception:
+            skill_vocabulary.invalidate()
+            raise
+
     @staticmethod
     async def get_candidate(session: AsyncSession, candidate_id: int) -> Optional[Candidate]:
         """Get a candidate by ID."""
@@ -71,6 +119,48 @@ class DatabaseManager:
         await session.commit()
         return match
 
+    @staticmethod
+    async def upsert_match(session: AsyncSession, match_data: Dict[str, Any]) -> Match:
+        """Create the match of a job and candidate, or update its score if it exists."""
+        await DatabaseManager.upsert_matches(session, [match_data])
+        return await DatabaseManager.get_match_for_pair(session, match_data["job_id"], match_data["candidate_id"])
+
+    @staticmethod
+    async def upsert_matches(session: AsyncSession, matches: List[Dict[str, Any]]) -> int:
+        """
+        Create or update many matches in one statement.
+
+        Existing matches of the same job and candidate keep their id and status;
+        their score, details and score inputs are replaced.
+        """
+        if not matches:
+            return 0
+        statement = sqlite_insert(Match)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Match.job_id, Match.candidate_id],
+            set_={
+                column: statement.excluded[column]
+                for column in (
+                    "match_score", "match_details", "embedding_score", "skill_score", "experience_score",
+                    "job_version", "candidate_version", "weights_key"
+                )
+            }
+        )
+        await session.execute(statement, matches)
+        await session.commit()
+        return len(matches)
+
+    @staticmethod
+    async def get_match_for_pair(session: AsyncSession, job_id: int, candidate_id: int) -> Optional[Match]:
+        """Get the match of a job and candidate."""
+        result = await session.execute(
+            select(Match)
+            .where(Match.job_id == job_id)
+            .where(Match.candidate_id == candidate_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
     @staticmethod
     async def get_match(session: AsyncSession, match_id: int) -> Optional[Match]:
         """Get a match by ID."""
@@ -114,20 +204,87 @@ class DatabaseManager:
         return interview
 
     @staticmethod
-    async def get_job_matches(session: AsyncSession, job_id: int) -> List[Match]:
-        """Get all matches for a job."""
-        result = await session.execute(
-            select(Match).where(Match.job_id == job_id)
-        )
-        return result.scalars().all()
+    async def get_job_matches(
+        session: AsyncSession,
+        job_id: int,
+        limit: int = MATCHES_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_details: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a job's matches by descending score, and the cursor of the next page."""
+        return await DatabaseManager._get_matches_page(session, Match.job_id, job_id, limit, cursor, include_details)
 
     @staticmethod
-    async def get_candidate_matches(session: AsyncSession, candidate_id: int) -> List[Match]:
-        """Get all matches for a candidate."""
-        result = await session.execute(
-            select(Match).where(Match.candidate_id == candidate_id)
+    async def get_candidate_matches(
+        session: AsyncSession,
+        candidate_id: int,
+        limit: int = MATCHES_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_details: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a candidate's matches by descending score, and the cursor of the next page."""
+        return await DatabaseManager._get_matches_page(
+            session, Match.candidate_id, candidate_id, limit, cursor, include_details
         )
-        return result.scalars().all()
+
+    @staticmethod
+    async def _get_matches_page(
+        session: AsyncSession,
+        owner_column: Any,
+        owner_id: int,
+        limit: int,
+        cursor: Optional[str],
+        include_details: bool
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Read one page of matches ordered by (match_score, id) descending.
+
+        The cursor holds the (match_score, id) of the last row of the previous
+        page, and the page starts right after it, so every page is a seek into
+        the (owner, match_score, id) index followed by `limit` index steps.
+
+        Args:
+            session (AsyncSession): Database session
+            owner_column (Any): Match.job_id or Match.candidate_id
+            owner_id (int): Job or candidate id
+            limit (int): Maximum number of matches
+            cursor (Optional[str]): Cursor returned with the previous page, None for the first page
+            include_details (bool): Whether to include match_details
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: Matches and the cursor of the next page (None on the last page)
+        """
+        limit = max(1, min(limit, MATCHES_MAX_PAGE_SIZE))
+        columns = [
+            column for column in Match.__table__.columns
+            if include_details or column.name != "match_details"
+        ]
+        query = select(*columns).where(owner_column == owner_id)
+        if cursor is not None:
+            score, match_id = DatabaseManager._decode_cursor(cursor)
+            query = query.where(tuple_(Match.match_score, Match.id) < tuple_(score, match_id))
+        query = query.order_by(Match.match_score.desc(), Match.id.desc()).limit(limit + 1)
+
+        rows = [dict(row._mapping) for row in await session.execute(query)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = DatabaseManager._encode_cursor(rows[-1]["match_score"], rows[-1]["id"])
+        return rows, next_cursor
+
+    @staticmethod
+    def _encode_cursor(score: float, match_id: int) -> str:
+        """Encode the position after a match as an opaque page cursor."""
+        return base64.urlsafe_b64encode(json.dumps([score, match_id]).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[float, int]:
+        """Decode a page cursor, raising ValueError if it is malformed."""
+        try:
+            score, match_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return float(score), int(match_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
 
     @staticmethod
     async def get_match_interview(session: AsyncSession, match_id: int) -> Optional[Interview]:
@@ -0,0 +1,232 @@
+import asyncio
+import json
+from typing import Dict
+
+from sqlalchemy import inspect, text, select, update, delete, bindparam, func
+from sqlalchemy.engine import Connection
+
+from .models import Base, Job, Candidate, Match, Interview
+from .skill_vocabulary import skill_vocabulary
+
+# Embedding columns that used to be stored as JSON lists
+BINARY_EMBEDDING_COLUMNS = [
+    (Job.__table__, "embedding"),
+    (Job.__table__, "experience_embedding"),
+    (Candidate.__table__, "embedding"),
+    (Candidate.__table__, "experience_embeddings")
+]
+
+
+def add_missing_columns(conn: Connection) -> int:
+    """
+    Add columns and indexes declared on the models but missing from existing tables.
+
+    `create_all` only creates missing tables, so databases created by an older
+    version of the models are brought up to date here.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        int: Number of columns added
+    """
+    inspector = inspect(conn)
+    added = 0
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+            added += 1
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    return added
+
+
+def convert_json_embeddings(conn: Connection) -> Dict[str, int]:
+    """
+    Rewrite embeddings stored as JSON text into the binary float32 encoding.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        Dict[str, int]: Number of converted rows per table column
+    """
+    converted = {}
+    for table, column_name in BINARY_EMBEDDING_COLUMNS:
+        column_type = table.c[column_name].type
+        rows = conn.execute(text(
+            f'SELECT id, "{column_name}" FROM {table.name} WHERE typeof("{column_name}") = \'text\''
+        )).fetchall()
+        updates = []
+        for row_id, value in rows:
+            try:
+                vectors = json.loads(value)
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable {table.name}.{column_name} for row {row_id}")
+                continue
+            updates.append({
+                "id": row_id,
+                "value": column_type.process_bind_param(vectors, conn.dialect)
+            })
+        if updates:
+            conn.execute(
+                text(f'UPDATE {table.name} SET "{column_name}" = :value WHERE id = :id'),
+                updates
+            )
+        converted[f"{table.name}.{column_name}"] = len(updates)
+    return converted
+
+
+def backfill_skill_ids(conn: Connection) -> Dict[str, int]:
+    """
+    Intern the skills of jobs and candidates stored before the skill vocabulary existed.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        Dict[str, int]: Number of backfilled rows per table
+    """
+    backfilled = {}
+    for table, skill_columns in ((Job.__table__, ("required_skills", "preferred_skills")),
+                                 (Candidate.__table__, ("skills",))):
+        rows = conn.execute(
+            select(table.c.id, *[table.c[name] for name in skill_columns]).where(table.c.skill_ids.is_(None))
+        ).fetchall()
+        updates = [
+            {
+                "row_id": row[0],
+                "new_skill_ids": skill_vocabulary.intern(conn, [skill for skills in row[1:] for skill in skills or []])
+            }
+            for row in rows
+        ]
+        if updates:
+            conn.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values(skill_ids=bindparam("new_skill_ids")),
+                updates
+            )
+        backfilled[f"{table.name}.skill_ids"] = len(updates)
+    return backfilled
+
+
+def deduplicate_matches(conn: Connection) -> int:
+    """
+    Remove duplicate matches of the same job and candidate before the unique index is created.
+
+    Of each group the match with an interview (else the newest) is kept, and
+    interviews of the removed matches are moved to it.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        int: Number of removed matches
+    """
+    if not inspect(conn).has_table(Match.__tablename__):
+        return 0
+    matches = Match.__table__
+    interviews = Interview.__table__
+    duplicated = (
+        select(matches.c.job_id, matches.c.candidate_id)
+        .group_by(matches.c.job_id, matches.c.candidate_id)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    has_interview = select(interviews.c.id).where(interviews.c.match_id == matches.c.id).exists()
+    rows = conn.execute(
+        select(matches.c.id, matches.c.job_id, matches.c.candidate_id, has_interview)
+        .join(duplicated, (matches.c.job_id == duplicated.c.job_id) & (matches.c.candidate_id == duplicated.c.candidate_id))
+    ).fetchall()
+
+    groups: Dict[tuple, list] = {}
+    for match_id, job_id, candidate_id, interviewed in rows:
+        groups.setdefault((job_id, candidate_id), []).append((bool(interviewed), match_id))
+    moves = []
+    for group in groups.values():
+        _, kept = max(group)
+        moves.extend({"old_id": match_id, "kept_id": kept} for _, match_id in group if match_id != kept)
+    if moves:
+        conn.execute(
+            update(interviews).where(interviews.c.match_id == bindparam("old_id")).values(match_id=bindparam("kept_id")),
+            moves
+        )
+        conn.execute(delete(matches).where(matches.c.id == bindparam("old_id")), [{"old_id": move["old_id"]} for move in moves])
+    return len(moves)
+
+
+def backfill_versions(conn: Connection) -> Dict[str, int]:
+    """
+    Set the version of jobs and candidates stored before rows were versioned.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        Dict[str, int]: Number of backfilled rows per table
+    """
+    backfilled = {}
+    for table in (Job.__table__, Candidate.__table__):
+        result = conn.execute(update(table).where(table.c.version.is_(None)).values(version=1))
+        backfilled[f"{table.name}.version"] = result.rowcount
+    return backfilled
+
+
+def backfill_component_scores(conn: Connection) -> int:
+    """
+    Copy the component scores of matches stored before they had their own columns out of match_details.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        int: Number of backfilled matches
+    """
+    matches = Match.__table__
+    result = conn.execute(
+        update(matches)
+        .where(matches.c.embedding_score.is_(None))
+        .values(
+            embedding_score=func.json_extract(matches.c.match_details, "$.embedding_similarity"),
+            skill_score=func.json_extract(matches.c.match_details, "$.skill_match"),
+            experience_score=func.json_extract(matches.c.match_details, "$.experience_match")
+        )
+    )
+    return result.rowcount
+
+
+def run_migrations(conn: Connection) -> Dict[str, int]:
+    """
+    Bring an existing database up to date with the models.
+
+    Args:
+        conn (Connection): Open database connection
+
+    Returns:
+        Dict[str, int]: Summary of the applied changes
+    """
+    summary = {"duplicate_matches_removed": deduplicate_matches(conn)}
+    summary["columns_added"] = add_missing_columns(conn)
+    summary.update(convert_json_embeddings(conn))
+    summary.update(backfill_skill_ids(conn))
+    summary.update(backfill_versions(conn))
+    summary["matches.component_scores"] = backfill_component_scores(conn)
+    return summary
+
+
+async def main():
+    from .db_manager import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        summary = await conn.run_sync(run_migrations)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
+from .types import EmbeddingVector, EmbeddingMatrix, SkillIdArray
+
 Base = declarative_base()
 
+class Skill(Base):
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)  # normalized skill name
+    embedding = Column(EmbeddingVector)  # embedding of the name, for synonym matching
+    embedding_model = Column(String)  # model that produced the embedding
+
 class Job(Base):
     __tablename__ = "jobs"
     
@@ -16,11 +26,16 @@ class Job(Base):
     experience = Column(String, nullable=False)
     education = Column(String, nullable=False)
     responsibilities = Column(JSON, nullable=False)
-    embedding = Column(JSON, nullable=False)
+    skill_ids = Column(SkillIdArray)  # required and preferred skills as sorted vocabulary ids
+    embedding = Column(EmbeddingVector, nullable=False)
+    experience_embedding = Column(EmbeddingVector)
+    version = Column(Integer, nullable=False, default=1)  # incremented on every update
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     matches = relationship("Match", back_populates="job")
+    
+    __mapper_args__ = {"version_id_col": version}
 
 class Candidate(Base):
     __tablename__ = "candidates"
@@ -32,11 +47,16 @@ class Candidate(Base):
     skills = Column(JSON, nullable=False)
     experience = Column(JSON, nullable=False)
     education = Column(JSON, nullable=False)
-    embedding = Column(JSON, nullable=False)
+    skill_ids = Column(SkillIdArray)  # sorted vocabulary ids
+    embedding = Column(EmbeddingVector, nullable=False)
+    experience_embeddings = Column(EmbeddingMatrix)
+    version = Column(Integer, nullable=False, default=1)  # incremented on every update
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     matches = relationship("Match", back_populates="candidate")
+    
+    __mapper_args__ = {"version_id_col": version}
 
 class Match(Base):
     __tablename__ = "matches"
@@ -47,12 +67,28 @@ class Match(Base):
     match_score = Column(Float, nullable=False)
     match_details = Column(JSON, nullable=False)
     status = Column(String, nullable=False)  # pending, accepted, rejected
+    # Component scores (0-100), so the match score can be recomputed for other weights
+    embedding_score = Column(Float)
+    skill_score = Column(Float)
+    experience_score = Column(Float)
+    # Inputs the score was computed from; the score is reused while all three are unchanged
+    job_version = Column(Integer)
+    candidate_version = Column(Integer)
+    weights_key = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     job = relationship("Job", back_populates="matches")
     candidate = relationship("Candidate", back_populates="matches")
     interview = relationship("Interview", back_populates="match", uselist=False)
+    
+    __table_args__ = (
+        # One match per job and candidate
+        Index("ix_matches_job_candidate", "job_id", "candidate_id", unique=True),
+        # Score-ordered pages of a job's or candidate's matches
+        Index("ix_matches_job_score", "job_id", "match_score", "id"),
+        Index("ix_matches_candidate_score", "candidate_id", "match_score", "id"),
+    )
 
 class Interview(Base):
     __tablename__ = "interviews"
@@ -0,0 +1,129 @@
+import threading
+from typing import Dict, Iterable, List, Sequence, Union
+
+import numpy as np
+from sqlalchemy import select, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import Skill
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Normalize a skill name so spelling variants share one vocabulary entry.
+
+    Args:
+        skill (str): Raw skill name
+
+    Returns:
+        str: Lowercased name with whitespace runs collapsed and ends stripped
+    """
+    return " ".join(str(skill).lower().split())
+
+
+class SkillVocabulary:
+    def __init__(self):
+        """
+        Initialize the process-wide skill vocabulary.
+
+        Normalized skill names are interned into the `skills` table once and
+        referred to by integer id everywhere else; jobs and candidates store
+        their skills as sorted id arrays. The table is mirrored in memory, so
+        only names never seen before cost a query.
+        """
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, executor: Union[Connection, Session], skills: Iterable[str]) -> np.ndarray:
+        """
+        Get the ids of skills, adding unknown names to the vocabulary.
+
+        Args:
+            executor (Union[Connection, Session]): Synchronous connection or session of the current transaction
+            skills (Iterable[str]): Raw skill names
+
+        Returns:
+            np.ndarray: Sorted, distinct uint32 skill ids
+        """
+        names = {normalize_skill(skill) for skill in skills or []}
+        names.discard("")
+        missing = [name for name in names if name not in self._ids]
+        if missing:
+            executor.execute(insert(Skill).prefix_with("OR IGNORE"), [{"name": name} for name in missing])
+            rows = executor.execute(select(Skill.id, Skill.name).where(Skill.name.in_(missing)))
+            with self._lock:
+                for skill_id, name in rows:
+                    self._ids[name] = skill_id
+                    self._names[skill_id] = name
+        return np.array(sorted(self._ids[name] for name in names), dtype=np.uint32)
+
+    async def intern_async(self, session: AsyncSession, skills: Iterable[str]) -> np.ndarray:
+        """
+        Get the ids of skills within an async session, adding unknown names.
+
+        Args:
+            session (AsyncSession): Database session of the current transaction
+            skills (Iterable[str]): Raw skill names
+
+        Returns:
+            np.ndarray: Sorted, distinct uint32 skill ids
+        """
+        skills = list(skills or [])
+        if all(normalize_skill(skill) in self._ids for skill in skills):
+            return self.lookup(skills)
+        return await session.run_sync(lambda sync_session: self.intern(sync_session, skills))
+
+    def lookup(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Get the ids of known skills without touching the database.
+
+        Args:
+            skills (Iterable[str]): Raw skill names
+
+        Returns:
+            np.ndarray: Sorted, distinct uint32 ids of the names in the vocabulary
+        """
+        ids = {self._ids.get(normalize_skill(skill)) for skill in skills or []}
+        ids.discard(None)
+        return np.array(sorted(ids), dtype=np.uint32)
+
+    def names(self, skill_ids: Sequence[int]) -> List[str]:
+        """
+        Get the normalized names of skill ids.
+
+        Args:
+            skill_ids (Sequence[int]): Skill ids
+
+        Returns:
+            List[str]: Names in the order of the ids
+        """
+        return [self._names.get(int(skill_id), str(skill_id)) for skill_id in skill_ids]
+
+    def invalidate(self):
+        """Forget the in-memory mirror, e.g. after a rolled-back transaction added names."""
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+
+    async def load(self, session: AsyncSession):
+        """
+        Mirror the whole skills table in memory.
+
+        Args:
+            session (AsyncSession): Database session
+        """
+        result = await session.execute(select(Skill.id, Skill.name))
+        with self._lock:
+            for skill_id, name in result:
+                self._ids[name] = skill_id
+                self._names[skill_id] = name
+
+
+# Process-wide vocabulary shared by ingestion and matching
+skill_vocabulary = SkillVocabulary()
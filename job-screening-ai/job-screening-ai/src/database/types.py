@@ -0,0 +1,129 @@
+import json
+import struct
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from src.config import EMBEDDING_QUANTIZATION
+from src.embeddings.quantization import encode_vector, decode_vector
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize the rows of a matrix, leaving zero rows untouched.
+
+    Args:
+        matrix (np.ndarray): Float32 matrix (or single vector)
+
+    Returns:
+        np.ndarray: Matrix with unit-length rows
+    """
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class EmbeddingVector(TypeDecorator):
+    """
+    A single embedding stored as raw little-endian float32 bytes.
+
+    Vectors are L2-normalized on write, so cosine similarity is a plain dot
+    product, and are read back with `np.frombuffer` without copying. When
+    EMBEDDING_QUANTIZATION is float16 or int8, new vectors are written in that
+    compact encoding instead; all encodings can be read back.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        vector = np.asarray(value, dtype="<f4").ravel()
+        return encode_vector(normalize_rows(vector), EMBEDDING_QUANTIZATION)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Row written as a JSON list before the binary migration
+            return np.asarray(json.loads(value), dtype=np.float32)
+        return decode_vector(value)
+
+
+class EmbeddingMatrix(TypeDecorator):
+    """
+    A list of embeddings stored as a float32 matrix behind a 4-byte dimension header.
+
+    Missing entries (None) are stored as NaN rows so the matrix stays aligned
+    with the list it was built from.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    _header = struct.Struct("<I")
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        matrix = _as_matrix(value)
+        dim = matrix.shape[1] if matrix.ndim == 2 else 0
+        body = normalize_rows(matrix).astype("<f4", copy=False).tobytes() if dim else b""
+        return self._header.pack(dim) + body
+
+    def process_result_value(self, value: Any, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Row written as a JSON list before the binary migration
+            return _as_matrix(json.loads(value))
+        (dim,) = self._header.unpack_from(value)
+        if dim == 0:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.frombuffer(value, dtype="<f4", offset=self._header.size).reshape(-1, dim)
+
+
+class SkillIdArray(TypeDecorator):
+    """
+    A sorted set of skill vocabulary ids stored as little-endian uint32 bytes.
+
+    Read back with `np.frombuffer` without copying, so overlaps are a single
+    `np.intersect1d` over two sorted arrays.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return np.unique(np.asarray(value, dtype="<u4")).tobytes()
+
+    def process_result_value(self, value: Any, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype="<u4")
+
+
+def _as_matrix(value: Any) -> np.ndarray:
+    """
+    Convert a list of vectors (with None for missing entries) to a float32 matrix.
+
+    Args:
+        value (Any): Matrix or list of vectors/None
+
+    Returns:
+        np.ndarray: Matrix with NaN rows for missing entries
+    """
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32, copy=False)
+
+    rows = list(value)
+    dim = next((len(row) for row in rows if row is not None and len(row)), 0)
+    matrix = np.full((len(rows), dim), np.nan, dtype=np.float32)
+    for i, row in enumerate(rows):
+        if row is not None and len(row):
+            matrix[i] = row
+    return matrix
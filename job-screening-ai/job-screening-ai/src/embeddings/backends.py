@@ -0,0 +1,149 @@
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from src.config import EMBEDDING_BACKEND, EMBEDDING_MODEL, EMBEDDING_DIM, EMBEDDING_WORKERS
+from src.embeddings.model_registry import model_registry
+
+
+class EmbeddingBackend(ABC):
+    """
+    Interface every embedding backend implements.
+
+    Attributes:
+        name (str): Backend identifier used in configuration
+        model_name (str): Identifier of the vectors produced, used to key caches
+        concurrency (int): Number of batches the backend can encode at once
+        out_of_process (bool): True if encoding waits on other processes rather than using this one's CPU
+    """
+
+    name = ""
+    concurrency = 1
+    out_of_process = False
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Length of the produced vectors."""
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a batch of texts.
+
+        Args:
+            texts (List[str]): Texts to encode
+
+        Returns:
+            np.ndarray: float32 matrix with one embedding per row
+        """
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        """Backend-specific counters, if any."""
+        return None
+
+    def close(self):
+        """Release resources held by the backend."""
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        """
+        Initialize a backend that encodes with the shared SentenceTransformer model.
+
+        Args:
+            model_name (str): Name of the SentenceTransformer model
+        """
+        super().__init__(model_name)
+
+    @property
+    def dimension(self) -> int:
+        return model_registry.get(self.model_name).get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        model = model_registry.get(self.model_name)
+        return np.asarray(model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+
+
+class HashingBackend(EmbeddingBackend):
+    name = "hashing"
+
+    _token_pattern = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+    def __init__(self, dimension: int = EMBEDDING_DIM):
+        """
+        Initialize a dependency-free hashing-vectorizer backend.
+
+        Word unigrams and bigrams are hashed into `dimension` signed buckets,
+        weighted with sublinear term frequency and L2-normalized. The output is
+        deterministic across processes and needs no model download, which makes
+        it suitable for tests and benchmarks of everything except the model.
+
+        Args:
+            dimension (int): Length of the produced vectors
+        """
+        super().__init__(f"hashing-{dimension}")
+        self._dimension = dimension
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self._dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = self._token_pattern.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if not features:
+                continue
+            buckets: Dict[int, float] = {}
+            for feature in features:
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+                )
+                index = digest % self._dimension
+                sign = 1.0 if (digest >> 63) & 1 else -1.0
+                buckets[index] = buckets.get(index, 0.0) + sign
+            indices = np.fromiter(buckets.keys(), dtype=np.int64, count=len(buckets))
+            counts = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+            matrix[row, indices] = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+
+BACKENDS = {
+    SentenceTransformerBackend.name: lambda model_name: SentenceTransformerBackend(model_name),
+    HashingBackend.name: lambda model_name: HashingBackend()
+}
+
+
+def create_backend(
+    name: str = EMBEDDING_BACKEND,
+    model_name: str = EMBEDDING_MODEL,
+    workers: int = EMBEDDING_WORKERS
+) -> EmbeddingBackend:
+    """
+    Create the configured embedding backend.
+
+    Args:
+        name (str): Backend name, one of BACKENDS
+        model_name (str): Model used by model-based backends
+        workers (int): Number of worker processes to run the backend in (0 for in-process)
+
+    Returns:
+        EmbeddingBackend: The backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {name} (expected one of {', '.join(BACKENDS)})")
+    if workers > 0:
+        from src.embeddings.process_pool import ProcessPoolBackend
+        return ProcessPoolBackend(name, model_name, workers)
+    return BACKENDS[name](model_name)
@@ -0,0 +1,240 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from src.config import EMBEDDING_MODEL, EMBED_CACHE_SIZE, EMBED_CACHE_PATH
+
+# Keys per disk tier query, below SQLite's limit on bound parameters
+_DISK_LOOKUP_BLOCK = 500
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so formatting-only changes share a cache entry.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Text with whitespace runs collapsed and ends stripped
+    """
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        max_memory_items: int = EMBED_CACHE_SIZE
+    ):
+        """
+        Initialize the two-tier embedding cache.
+
+        Entries are keyed by a hash of (model name, normalized text), so vectors
+        of different models never collide and are kept side by side. The memory
+        tier is an LRU bounded by `max_memory_items`; the disk tier is a SQLite
+        file that survives restarts, opened on first use.
+
+        Args:
+            model_name (str): Name of the embedding model whose vectors are cached
+            path (Optional[str]): SQLite file for the disk tier, or None/"" to disable it
+            max_memory_items (int): Maximum number of vectors kept in memory
+        """
+        self.model_name = model_name
+        self.max_memory_items = max(0, max_memory_items)
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.path = path or ""
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_opened = False
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str) -> str:
+        """
+        Get the cache key for a text.
+
+        Args:
+            text (str): Text to be encoded
+
+        Returns:
+            str: Hex digest of the model name and normalized text
+        """
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding of a text.
+
+        Args:
+            text (str): Text to look up
+
+        Returns:
+            Optional[np.ndarray]: Cached embedding, or None on a miss
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up the embeddings of several texts, reading the disk tier in one query per block.
+
+        Blocking on SQLite: call it from a worker thread, not the event loop.
+
+        Args:
+            texts (List[str]): Texts to look up
+
+        Returns:
+            List[Optional[np.ndarray]]: Cached embedding of each text, None on a miss
+        """
+        keys = [self.key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self._lock:
+            missing: Dict[str, List[int]] = {}
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    results[i] = vector
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            db = self._disk() if missing else None
+            if db is not None:
+                pending = list(missing)
+                for start in range(0, len(pending), _DISK_LOOKUP_BLOCK):
+                    block = pending[start:start + _DISK_LOOKUP_BLOCK]
+                    rows = db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(block))})",
+                        block
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember(key, vector)
+                        for i in missing.pop(key):
+                            results[i] = vector
+                            self.disk_hits += 1
+
+            self.misses += sum(len(positions) for positions in missing.values())
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[np.ndarray]):
+        """
+        Store embeddings for several texts in both tiers.
+
+        Blocking on SQLite: call it from a worker thread, not the event loop.
+
+        Args:
+            texts (List[str]): Encoded texts
+            vectors (List[np.ndarray]): Their embeddings, in the same order
+        """
+        entries = [
+            (self.key(text), np.asarray(vector, dtype=np.float32))
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            for key, vector in entries:
+                self._remember(key, vector)
+            db = self._disk()
+            if db is not None:
+                try:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, vector.tobytes()) for key, vector in entries]
+                    )
+                    db.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing embedding cache: {str(e)}")
+
+    def clear(self):
+        """Remove every entry from both tiers, for all models."""
+        with self._lock:
+            self._memory.clear()
+            db = self._disk()
+            if db is not None:
+                db.execute("DELETE FROM embeddings")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, Any]: Hit, miss and eviction counts and tier sizes
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        disk_items = None
+        with self._lock:
+            db = self._disk()
+            if db is not None:
+                disk_items = db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            "model": self.model_name,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_items": len(self._memory),
+            "max_memory_items": self.max_memory_items,
+            "disk_items": disk_items
+        }
+
+    def close(self):
+        """Close the disk tier; it is not reopened afterwards."""
+        with self._lock:
+            self._disk_opened = True
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert a vector into the memory tier, evicting the least recently used."""
+        if self.max_memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite disk tier on first use; must be called with the lock held."""
+        if not self._disk_opened:
+            self._disk_opened = True
+            if self.path:
+                self._open_disk_tier(self.path)
+        return self._db
+
+    def _open_disk_tier(self, path: str):
+        """
+        Open the SQLite disk tier.
+
+        Args:
+            path (str): SQLite file path
+        """
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Error opening embedding cache at {path}: {str(e)}")
+            self._db = None
@@ -0,0 +1,246 @@
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import EMBED_BATCH_SIZE, EMBED_MAX_WAIT_MS
+from src.embeddings.backends import EmbeddingBackend, create_backend
+from src.embeddings.embedding_cache import EmbeddingCache
+from src.inference import inference_executor
+
+
+class EmbeddingService:
+    def __init__(
+        self,
+        backend: Optional[EmbeddingBackend] = None,
+        max_batch_size: int = EMBED_BATCH_SIZE,
+        max_wait_ms: float = EMBED_MAX_WAIT_MS,
+        cache: Optional[EmbeddingCache] = None
+    ):
+        """
+        Initialize the embedding service.
+
+        Encode requests from concurrent callers are queued and flushed to the
+        model as a single batch once `max_batch_size` texts are waiting or the
+        oldest request has waited `max_wait_ms`.
+
+        Args:
+            backend (Optional[EmbeddingBackend]): Backend that encodes the batches;
+                the configured backend when None
+            max_batch_size (int): Maximum number of texts per model call
+            max_wait_ms (float): Maximum time a request waits for a batch to fill
+            cache (Optional[EmbeddingCache]): Cache consulted before queuing a text
+        """
+        self.backend = backend if backend is not None else create_backend()
+        self.model_name = self.backend.model_name
+        self.cache = cache
+        # One batch at a time in process; one per worker with a process pool
+        self.max_concurrent_batches = self.backend.concurrency
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: List[Tuple[str, asyncio.Future, float]] = []
+        self._has_items: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flushes = set()
+
+        self._batches = 0
+        self._items = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+        self._total_encode = 0.0
+
+    async def encode(self, text: str) -> np.ndarray:
+        """
+        Encode a single text.
+
+        Args:
+            text (str): Text to encode
+
+        Returns:
+            np.ndarray: Embedding vector
+        """
+        if self.cache is not None:
+            cached = (await self._cached([text]))[0]
+            if cached is not None:
+                return cached
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(text, future)
+        return await future
+
+    async def encode_many(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Encode several texts, sharing batches with other callers.
+
+        Args:
+            texts (List[str]): Texts to encode
+
+        Returns:
+            List[np.ndarray]: One embedding vector per text, in input order
+        """
+        if not texts:
+            return []
+        results = await self._cached(texts)
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing:
+            self._ensure_worker()
+            loop = asyncio.get_running_loop()
+            futures = []
+            for i in missing:
+                future = loop.create_future()
+                self._enqueue(texts[i], future)
+                futures.append(future)
+            for i, vector in zip(missing, await asyncio.gather(*futures)):
+                results[i] = vector
+        return results
+
+    async def _cached(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look texts up in the cache from the I/O pool, since its disk tier is SQLite."""
+        if self.cache is None:
+            return [None] * len(texts)
+        return await inference_executor.run_io(self.cache.get_many, texts)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get batching metrics.
+
+        Returns:
+            Dict[str, Any]: Batch counts, occupancy and queue wait statistics
+        """
+        batches = self._batches or 1
+        items = self._items or 1
+        return {
+            "backend": self.backend.name,
+            "model": self.model_name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "queued": len(self._queue),
+            "avg_batch_size": self._items / batches,
+            "avg_batch_occupancy": self._items / (batches * self.max_batch_size),
+            "avg_queue_wait_ms": self._total_wait / items * 1000,
+            "max_queue_wait_ms": self._max_wait_seen * 1000,
+            "avg_encode_ms": self._total_encode / batches * 1000,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "workers": self.backend.stats()
+        }
+
+    async def close(self):
+        """Stop the batching worker, failing any requests still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for flush in list(self._flushes):
+            flush.cancel()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await inference_executor.run_io(self.backend.close)
+        for _, future, _ in self._queue:
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding service closed"))
+        self._queue.clear()
+
+    def _ensure_worker(self):
+        """Start the batching worker on the running event loop if needed."""
+        if self._worker is None or self._worker.done():
+            self._has_items = asyncio.Event()
+            self._batch_full = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            if self._queue:
+                self._has_items.set()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def _enqueue(self, text: str, future: asyncio.Future):
+        """Add a request to the queue and wake the worker."""
+        self._queue.append((text, future, time.perf_counter()))
+        self._has_items.set()
+        if len(self._queue) >= self.max_batch_size:
+            self._batch_full.set()
+
+    async def _run(self):
+        """Collect queued requests into batches and hand them to the encoder."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            try:
+                await self._has_items.wait()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+
+            # Wait for the batch to fill up, but never past the oldest request's deadline
+            deadline = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            if not self._queue:
+                self._has_items.clear()
+            if len(self._queue) < self.max_batch_size:
+                self._batch_full.clear()
+
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                self._slots.release()
+                continue
+
+            flush = loop.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        """Encode one batch and resolve its callers' futures."""
+        try:
+            flushed_at = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                wait = flushed_at - enqueued_at
+                self._total_wait += wait
+                self._max_wait_seen = max(self._max_wait_seen, wait)
+
+            texts = [text for text, _, _ in batch]
+            # Waiting on worker processes is I/O for this process; in-process encoding is CPU work
+            run = inference_executor.run_io if self.backend.out_of_process else inference_executor.run_cpu
+            try:
+                vectors = await run(self.backend.encode, texts)
+            except Exception as e:
+                print(f"Error encoding batch: {str(e)}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            self._batches += 1
+            self._items += len(batch)
+            self._total_encode += time.perf_counter() - flushed_at
+
+            for (_, future, _), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+            # Callers already have their vectors; the cache write only delays the next batch
+            if self.cache is not None:
+                await inference_executor.run_io(self.cache.put_many, texts, list(vectors))
+        finally:
+            self._slots.release()
+
+
+# Process-wide embedding service shared by all agents
+_backend = create_backend()
+embedding_service = EmbeddingService(backend=_backend, cache=EmbeddingCache(model_name=_backend.model_name))
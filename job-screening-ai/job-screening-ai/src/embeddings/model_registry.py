@@ -0,0 +1,126 @@
+import sys
+import threading
+import time
+from typing import Dict, Any
+
+from src.config import EMBEDDING_MODEL
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _current_rss_bytes() -> int:
+    """
+    Get the resident set size of the current process.
+
+    Returns:
+        int: RSS in bytes, or 0 if it cannot be determined
+    """
+    if resource is None:
+        return 0
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        # No procfs (macOS): fall back to the peak RSS, which is reported in bytes there
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ModelRegistry:
+    def __init__(self):
+        """Initialize an empty model registry."""
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = EMBEDDING_MODEL):
+        """
+        Get a SentenceTransformer model, loading it on first use.
+
+        Every caller asking for the same model name receives the same instance,
+        so the weights are held in memory once per process.
+
+        Args:
+            model_name (str): Name of the SentenceTransformer model
+
+        Returns:
+            SentenceTransformer: The shared model instance
+        """
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            model = self._models.get(model_name)
+            if model is None:
+                model = self._load(model_name)
+                self._models[model_name] = model
+        return model
+
+    def _load(self, model_name: str):
+        """
+        Load a model and record its load time and memory footprint.
+
+        Args:
+            model_name (str): Name of the SentenceTransformer model
+
+        Returns:
+            SentenceTransformer: The loaded model
+        """
+        from sentence_transformers import SentenceTransformer
+
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+        model = SentenceTransformer(model_name)
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss_bytes()
+
+        parameter_bytes = sum(
+            parameter.numel() * parameter.element_size()
+            for parameter in model.parameters()
+        )
+
+        self._stats[model_name] = {
+            "load_seconds": round(load_seconds, 3),
+            "parameter_bytes": parameter_bytes,
+            "rss_delta_bytes": max(0, rss_after - rss_before),
+            "loaded_at": time.time()
+        }
+        print(
+            f"Loaded embedding model {model_name} in {load_seconds:.2f}s "
+            f"({parameter_bytes / 1024 / 1024:.1f} MiB of parameters)"
+        )
+        return model
+
+    def is_loaded(self, model_name: str = EMBEDDING_MODEL) -> bool:
+        """
+        Check whether a model has already been loaded.
+
+        Args:
+            model_name (str): Name of the SentenceTransformer model
+
+        Returns:
+            bool: True if the model is in memory
+        """
+        return model_name in self._models
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get load statistics for every loaded model.
+
+        Returns:
+            Dict[str, Any]: Per-model load time and memory usage, plus process RSS
+        """
+        return {
+            "models": {name: dict(stats) for name, stats in self._stats.items()},
+            "process_rss_bytes": _current_rss_bytes()
+        }
+
+
+# Process-wide registry shared by all agents
+model_registry = ModelRegistry()
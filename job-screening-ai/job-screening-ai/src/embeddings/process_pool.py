@@ -0,0 +1,317 @@
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from src.config import EMBEDDING_BACKEND, EMBEDDING_MODEL, EMBEDDING_WORKERS, EMBED_BATCH_SIZE
+from src.embeddings.backends import EmbeddingBackend, create_backend
+
+# How often a waiting caller checks that its worker is still alive
+_POLL_SECONDS = 0.5
+
+
+def _worker_main(backend_name: str, model_name: str, conn):
+    """
+    Entry point of an embedding worker process.
+
+    The worker creates its backend once, reports the embedding dimension,
+    attaches to the shared-memory buffer created by the parent and then encodes
+    batches until it receives None. Vectors are written into the shared buffer;
+    only the row count travels back through the pipe.
+
+    Args:
+        backend_name (str): Name of the embedding backend
+        model_name (str): Name of the embedding model
+        conn: Worker end of the pipe to the parent
+    """
+    if backend_name == "sentence-transformers":
+        try:
+            import torch
+            torch.set_num_threads(1)
+        except ImportError:
+            pass
+
+    backend = create_backend(backend_name, model_name, workers=0)
+    conn.send(("ready", backend.dimension))
+
+    # The parent creates and unlinks the segment; spawned children share its resource tracker
+    shm_name, capacity, dim = conn.recv()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    output = np.ndarray((capacity, dim), dtype=np.float32, buffer=shm.buf)
+
+    try:
+        while True:
+            texts = conn.recv()
+            if texts is None:
+                break
+            try:
+                output[:len(texts)] = backend.encode(texts)
+                conn.send(("ok", len(texts)))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        del output
+        shm.close()
+
+
+class _Worker:
+    def __init__(self, encoder: "ProcessPoolBackend", index: int):
+        """
+        Initialize a handle on one worker process.
+
+        Args:
+            encoder (ProcessPoolBackend): Owning pool
+            index (int): Worker number, used in process names
+        """
+        self.encoder = encoder
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.output: Optional[np.ndarray] = None
+
+    def start(self):
+        """Start the process and wait until its backend is ready."""
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.encoder.backend_name, self.encoder.backend_model, child_conn),
+            name=f"embedding-worker-{self.index}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        status, dim = self._receive(timeout=self.encoder.start_timeout)
+        if status != "ready":
+            raise RuntimeError(f"Embedding worker {self.index} failed to start: {dim}")
+        self.encoder._dimension = dim
+
+        capacity = self.encoder.max_batch_size
+        if self.shm is None or self.output.shape != (capacity, dim):
+            self._release_buffer()
+            self.shm = shared_memory.SharedMemory(create=True, size=capacity * dim * 4)
+            self.output = np.ndarray((capacity, dim), dtype=np.float32, buffer=self.shm.buf)
+        self.conn.send((self.shm.name, capacity, dim))
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode at most `max_batch_size` texts on this worker.
+
+        Args:
+            texts (List[str]): Texts to encode
+
+        Returns:
+            np.ndarray: Matrix with one embedding per row
+        """
+        self.conn.send(texts)
+        status, payload = self._receive()
+        if status == "error":
+            raise RuntimeError(payload)
+        return self.output[:payload].copy()
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self):
+        """Ask the process to exit, killing it if it does not."""
+        if self.process is not None:
+            try:
+                if self.process.is_alive():
+                    self.conn.send(None)
+                self.process.join(timeout=5)
+            except (OSError, EOFError, BrokenPipeError):
+                pass
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.process = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def close(self):
+        """Stop the process and free the shared buffer."""
+        self.stop()
+        self._release_buffer()
+
+    def _release_buffer(self):
+        if self.shm is not None:
+            self.output = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def _receive(self, timeout: Optional[float] = None):
+        """
+        Wait for a message from the worker, failing fast if the process dies.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait, None for no limit
+
+        Returns:
+            Tuple: The message
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.conn.poll(_POLL_SECONDS):
+            if not self.process.is_alive():
+                raise ChildProcessError(
+                    f"Embedding worker {self.index} exited with code {self.process.exitcode}"
+                )
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Embedding worker {self.index} did not respond")
+        try:
+            return self.conn.recv()
+        except EOFError:
+            raise ChildProcessError(f"Embedding worker {self.index} closed its pipe")
+
+
+class ProcessPoolBackend(EmbeddingBackend):
+    out_of_process = True
+
+    def __init__(
+        self,
+        backend_name: str = EMBEDDING_BACKEND,
+        model_name: str = EMBEDDING_MODEL,
+        workers: int = EMBEDDING_WORKERS,
+        max_batch_size: int = EMBED_BATCH_SIZE,
+        start_timeout: float = 300.0
+    ):
+        """
+        Initialize a pool of embedding worker processes running another backend.
+
+        Each worker creates the backend once (loading its model) and returns
+        vectors through its own shared-memory buffer, so embeddings are never
+        pickled. Workers are started on first use and restarted if they crash.
+
+        Args:
+            backend_name (str): Name of the backend run by every worker
+            model_name (str): Name of the embedding model
+            workers (int): Number of worker processes
+            max_batch_size (int): Maximum number of texts sent to a worker at once
+            start_timeout (float): Seconds to wait for a worker to load its model
+        """
+        # Key caches by what the workers produce, not by the pool
+        super().__init__(create_backend(backend_name, model_name, workers=0).model_name)
+        self.name = backend_name
+        self.backend_name = backend_name
+        self.backend_model = model_name
+        self.concurrency = max(1, workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.start_timeout = start_timeout
+        self._dimension: Optional[int] = None
+
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.restarts = 0
+        self.batches = 0
+
+    @property
+    def dimension(self) -> int:
+        self._ensure_started()
+        return self._dimension
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts on an idle worker, blocking until the vectors are back.
+
+        Safe to call from several threads; each call holds one worker.
+
+        Args:
+            texts (List[str]): Texts to encode
+
+        Returns:
+            np.ndarray: Matrix with one embedding per row
+        """
+        self._ensure_started()
+        worker = self._idle.get()
+        try:
+            chunks = [
+                self._encode_on(worker, texts[start:start + self.max_batch_size])
+                for start in range(0, len(texts), self.max_batch_size)
+            ]
+        finally:
+            self._idle.put(worker)
+        return np.concatenate(chunks) if chunks else np.empty((0, self._dimension or 0), dtype=np.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get worker pool counters.
+
+        Returns:
+            Dict[str, Any]: Worker count, liveness, batches and restarts
+        """
+        return {
+            "backend": self.backend_name,
+            "workers": self.concurrency,
+            "alive": sum(worker.is_alive() for worker in self._workers),
+            "idle": self._idle.qsize(),
+            "batches": self.batches,
+            "restarts": self.restarts
+        }
+
+    def close(self):
+        """Stop every worker process and free the shared buffers."""
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers = []
+            self._idle = queue.Queue()
+
+    def _ensure_started(self):
+        """Start the worker processes on first use."""
+        if self._workers:
+            return
+        with self._lock:
+            if self._workers:
+                return
+            workers = [_Worker(self, index) for index in range(self.concurrency)]
+            threads = [threading.Thread(target=worker.start) for worker in workers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for worker in workers:
+                if not worker.is_alive():
+                    for other in workers:
+                        other.close()
+                    raise RuntimeError("Failed to start embedding workers")
+                self._idle.put(worker)
+            self._workers = workers
+
+    def _encode_on(self, worker: _Worker, texts: List[str]) -> np.ndarray:
+        """
+        Encode one chunk, restarting the worker and retrying once if it crashed.
+
+        Args:
+            worker (_Worker): Worker held by the caller
+            texts (List[str]): At most `max_batch_size` texts
+
+        Returns:
+            np.ndarray: Matrix with one embedding per row
+        """
+        for attempt in range(2):
+            try:
+                if not worker.is_alive():
+                    self._restart(worker)
+                vectors = worker.encode(texts)
+                self.batches += 1
+                return vectors
+            except (ChildProcessError, BrokenPipeError, EOFError) as e:
+                print(f"Embedding worker {worker.index} crashed: {str(e)}")
+                if attempt == 1:
+                    raise
+                self._restart(worker)
+
+    def _restart(self, worker: _Worker):
+        """Replace a dead worker process, keeping its shared buffer."""
+        worker.stop()
+        worker.start()
+        self.restarts += 1
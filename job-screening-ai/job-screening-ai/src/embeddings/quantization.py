@@ -0,0 +1,175 @@
+import struct
+from typing import Optional
+
+import numpy as np
+
+QUANTIZATION_MODES = ("float32", "float16", "int8")
+
+# Blob prefixes for quantized vectors. Read as a float32 they are NaN, which a
+# normalized float32 embedding never contains, so raw float32 blobs stay unambiguous.
+_FLOAT16_MAGIC = b"Q\x10\xc0\x7f"
+_INT8_MAGIC = b"Q\x08\xc0\x7f"
+_SCALE = struct.Struct("<f")
+
+# Rows converted to float32 at a time while scoring, to keep temporaries cache-sized
+_SCAN_BLOCK_ROWS = 512
+
+
+def quantize_int8(matrix: np.ndarray):
+    """
+    Quantize vectors to int8 with one scale per vector.
+
+    Args:
+        matrix (np.ndarray): Float matrix, one vector per row
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: int8 codes and float32 per-row scales
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class QuantizedMatrix:
+    def __init__(self, codes: np.ndarray, mode: str, scales: Optional[np.ndarray] = None):
+        """
+        Initialize a matrix of stored embeddings in a compact representation.
+
+        Args:
+            codes (np.ndarray): Matrix in float32, float16 or int8, one vector per row
+            mode (str): One of QUANTIZATION_MODES
+            scales (Optional[np.ndarray]): Per-row scales, required for int8
+        """
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+        if mode == "int8" and scales is None:
+            raise ValueError("int8 quantization requires per-vector scales")
+        self.codes = codes
+        self.mode = mode
+        self.scales = scales
+
+    @classmethod
+    def from_vectors(cls, matrix: np.ndarray, mode: str = "float32") -> "QuantizedMatrix":
+        """
+        Quantize a float matrix.
+
+        Args:
+            matrix (np.ndarray): Float matrix, one vector per row
+            mode (str): One of QUANTIZATION_MODES
+
+        Returns:
+            QuantizedMatrix: The quantized matrix
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        if mode == "float32":
+            return cls(matrix, mode)
+        if mode == "float16":
+            return cls(matrix.astype(np.float16), mode)
+        if mode == "int8":
+            codes, scales = quantize_int8(matrix)
+            return cls(codes, mode, scales)
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the codes and scales."""
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        Dot product of every stored vector with a query, without dequantizing the matrix.
+
+        Args:
+            query (np.ndarray): Float query vector
+
+        Returns:
+            np.ndarray: float32 score per row
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.mode == "float32":
+            return self.codes @ query
+
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), _SCAN_BLOCK_ROWS):
+            block = self.codes[start:start + _SCAN_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        if self.mode == "int8":
+            scores *= self.scales
+        return scores
+
+    def take(self, rows: np.ndarray) -> "QuantizedMatrix":
+        """
+        Select rows without dequantizing them.
+
+        Args:
+            rows (np.ndarray): Row indices
+
+        Returns:
+            QuantizedMatrix: Matrix of the selected rows
+        """
+        scales = self.scales[rows] if self.scales is not None else None
+        return QuantizedMatrix(self.codes[rows], self.mode, scales)
+
+    def dequantize(self) -> np.ndarray:
+        """
+        Reconstruct the float32 matrix.
+
+        Returns:
+            np.ndarray: Approximate float32 vectors
+        """
+        matrix = self.codes.astype(np.float32)
+        if self.mode == "int8":
+            matrix *= self.scales[:, None]
+        return matrix
+
+
+def encode_vector(vector: np.ndarray, mode: str) -> bytes:
+    """
+    Encode a normalized float32 vector as a blob in the given mode.
+
+    float32 vectors are stored as raw bytes; quantized vectors carry a magic
+    prefix (and, for int8, their scale).
+
+    Args:
+        vector (np.ndarray): Normalized float32 vector
+        mode (str): One of QUANTIZATION_MODES
+
+    Returns:
+        bytes: Encoded vector
+    """
+    vector = np.asarray(vector, dtype="<f4")
+    if mode == "float32":
+        return vector.tobytes()
+    if mode == "float16":
+        return _FLOAT16_MAGIC + vector.astype("<f2").tobytes()
+    if mode == "int8":
+        codes, scales = quantize_int8(vector)
+        return _INT8_MAGIC + _SCALE.pack(scales[0]) + codes.tobytes()
+    raise ValueError(f"Unknown quantization mode: {mode}")
+
+
+def decode_vector(blob: bytes) -> np.ndarray:
+    """
+    Decode a blob written by encode_vector.
+
+    float32 and float16 blobs are returned as zero-copy views; int8 blobs are
+    dequantized to float32.
+
+    Args:
+        blob (bytes): Encoded vector
+
+    Returns:
+        np.ndarray: The vector
+    """
+    prefix = bytes(blob[:4])
+    if prefix == _FLOAT16_MAGIC:
+        return np.frombuffer(blob, dtype="<f2", offset=4)
+    if prefix == _INT8_MAGIC:
+        (scale,) = _SCALE.unpack_from(blob, 4)
+        return np.frombuffer(blob, dtype=np.int8, offset=8).astype(np.float32) * scale
+    return np.frombuffer(blob, dtype="<f4")
@@ -0,0 +1,434 @@
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.extraction.skill_dictionary import skill_dictionary
+
+CV_FIELDS = ("name", "email", "phone", "skills", "experience", "education")
+JOB_FIELDS = ("title", "required_skills", "preferred_skills", "experience", "education", "responsibilities")
+
+# Section headings (lowercased, without a trailing colon) and the section they start
+CV_SECTIONS = {
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment": "experience", "employment history": "experience", "work history": "experience",
+    "career history": "experience",
+    "education": "education", "academic background": "education", "education and training": "education",
+    "skills": "skills", "technical skills": "skills", "key skills": "skills", "core skills": "skills",
+    "skills and expertise": "skills", "competencies": "skills", "core competencies": "skills",
+    "tech stack": "stack", "technical stack": "stack", "technologies": "stack", "tools": "stack",
+    "tools and technologies": "stack",
+    "summary": "other", "profile": "other", "objective": "other", "certifications": "other",
+    "achievements": "other", "projects": "other", "languages": "other", "interests": "other",
+    "awards": "other", "publications": "other", "references": "other",
+    "contact": "contact", "contact information": "contact", "personal details": "contact"
+}
+JOB_SECTIONS = {
+    "description": "description", "job description": "description", "about the role": "description",
+    "overview": "description", "role overview": "description", "summary": "description",
+    "about us": "description",
+    "responsibilities": "responsibilities", "key responsibilities": "responsibilities",
+    "duties": "responsibilities", "what you will do": "responsibilities", "what you'll do": "responsibilities",
+    "roles and responsibilities": "responsibilities",
+    "qualifications": "requirements", "requirements": "requirements", "required qualifications": "requirements",
+    "required skills": "requirements", "skills": "requirements", "what we're looking for": "requirements",
+    "what we are looking for": "requirements", "who you are": "requirements", "must have": "requirements",
+    "preferred qualifications": "preferred", "preferred skills": "preferred", "nice to have": "preferred",
+    "desired skills": "preferred", "good to have": "preferred", "bonus points": "preferred",
+    "benefits": "other", "what we offer": "other", "perks": "other", "compensation": "other",
+    "how to apply": "other", "location": "other"
+}
+
+_BULLET = re.compile(r"^(?:[-•*●▪◦–—>]+|\d{1,2}[.)])\s*")
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_LABELLED = re.compile(
+    r"^(?:phone|mobile|tel(?:ephone)?|cell|contact number)\s*(?:no\.?|number)?\s*[:.-]?\s*(\+?[\d(][\d\s().-]{5,}\d)",
+    re.IGNORECASE
+)
+_PHONE = re.compile(
+    r"(?<![\w-])(\+\d{1,3}[\s.-]?(?:\(?\d{1,4}\)?[\s.-]?){1,4}\d{2,4}"
+    r"|\(\d{3}\)\s?\d{3}[\s.-]\d{4}|\d{3}[\s.-]\d{3}[\s.-]\d{4})(?![\w-])"
+)
+_NAME_LABELLED = re.compile(r"^(?:full\s+)?name\s*[:.-]\s*(.+)$", re.IGNORECASE)
+_NAME_WORD = re.compile(r"^[A-Z][A-Za-z'.-]*$")
+_TITLE_LABELLED = re.compile(r"^(?:job\s+title|title|position|role)\s*[:.-]\s*(.+)$", re.IGNORECASE)
+_TITLE_IN_PROSE = re.compile(
+    r"\b(?i:seeking|looking\s+for|hiring|searching\s+for)\s+(?:an?\s+)?"
+    r"(?:(?:highly|skilled|talented|experienced|motivated|passionate|dedicated|creative|dynamic|"
+    r"detail-oriented|results-driven|innovative|enthusiastic|strategic|proactive|versatile|and)\s+)*"
+    r"(?P<title>(?:(?:[A-Z][\w/&+#.-]*|of|and|&|senior|junior|mid-level|lead|principal|staff|software|"
+    r"data|web|mobile|cloud|backend|back-end|frontend|front-end|full-stack|systems|network|security|"
+    r"product|project|business|machine|learning)\s+){0,5}"
+    # A guess in prose only counts if it names a role
+    r"(?i:engineer|developer|programmer|architect|manager|analyst|scientist|researcher|designer|"
+    r"administrator|consultant|specialist|lead|director|officer|coordinator|technician|tester|"
+    r"intern|writer|accountant|assistant|associate|representative|executive|strategist)s?)\b"
+)
+_DURATION = (
+    r"(?:[A-Za-z]{3,9}\.?\s+)?\d{4}\s*(?:-|–|—|to)\s*"
+    r"(?:(?:[A-Za-z]{3,9}\.?\s+)?\d{4}|present|current|now|date)"
+)
+_ROLE = re.compile(
+    r"^(?P<title>[^()|]+?)\s+(?:at|@|[|,–—-])\s+(?P<company>[^()|]+?)\s*[(,|–—-]?\s*"
+    r"(?P<duration>" + _DURATION + r")\s*\)?$",
+    re.IGNORECASE
+)
+_DEGREE = re.compile(
+    r"\b(?:bachelor|master|ph\.?\s?d|doctorate|doctor of|diploma|associate degree|mba|"
+    r"b\.?\s?sc|m\.?\s?sc|b\.?\s?tech|m\.?\s?tech|b\.e\.|m\.e\.|b\.a\.|m\.a\.|b\.s\.|m\.s\.)",
+    re.IGNORECASE
+)
+_INSTITUTION = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic)\b", re.IGNORECASE)
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_YEARS_OF_EXPERIENCE = re.compile(r"\b\d+\s*\+?\s*(?:(?:-|–|to)\s*\d+\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9(\"'])")
+_PREFERRED = re.compile(
+    r"\b(?:preferred|nice to have|a plus|bonus|desirable|ideally|good to have|advantageous)\b",
+    re.IGNORECASE
+)
+_LIST_SEPARATOR = re.compile(r"\s*[,;|/]\s*|\s+&\s+|\s+and\s+")
+
+
+def _strip_bullet(line: str) -> str:
+    return _BULLET.sub("", line).strip()
+
+
+def _sentences(lines: Sequence[str]) -> List[str]:
+    """Split lines into sentences, without bullets."""
+    return [
+        sentence
+        for line in lines
+        for sentence in _SENTENCE_END.split(_strip_bullet(line.strip()))
+        if sentence
+    ]
+
+
+def _join_wrapped(lines: Sequence[str]) -> List[str]:
+    """
+    Rejoin lines that PDF extraction wrapped mid-sentence.
+
+    A line continues the previous one if that line does not end a sentence or
+    an item and this one starts in lower case, with a digit, a bracket or a percent sign.
+
+    Args:
+        lines (Sequence[str]): Stripped, non-empty lines
+
+    Returns:
+        List[str]: Logical lines
+    """
+    joined: List[str] = []
+    for line in lines:
+        continues = line[:1].islower() or line[:1].isdigit() or line[:1] in "(%"
+        if joined and continues and not joined[-1].endswith((".", ":", "!", "?", ")")):
+            joined[-1] = f"{joined[-1]} {line}"
+        else:
+            joined.append(line)
+    return joined
+
+
+def split_sections(text: str, headings: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Split a document into sections at known headings.
+
+    A heading is a short line that, without a trailing colon, is one of
+    `headings`; "Heading: content" on one line also starts the section with
+    that content. Lines before the first heading are under "header".
+
+    Args:
+        text (str): Document text
+        headings (Dict[str, str]): Lowercased heading -> section name
+
+    Returns:
+        Dict[str, List[str]]: Section name -> logical lines with bullets removed
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for raw in text.splitlines():
+        line = _strip_bullet(raw.strip())
+        if not line:
+            continue
+        heading, colon, rest = line.partition(":")
+        key = " ".join(heading.lower().split())
+        if len(key) <= 40 and key in headings and (not rest.strip() or colon):
+            current = headings[key]
+            sections.setdefault(current, [])
+            if rest.strip():
+                sections[current].append(rest.strip())
+            continue
+        sections[current].append(line)
+    return {name: _join_wrapped(lines) for name, lines in sections.items()}
+
+
+class RuleBasedExtractor:
+    def __init__(self):
+        """
+        Initialize the deterministic extractor of CV and job description fields.
+
+        Fields are read from section headings, email and phone patterns and
+        the skill dictionary, and each gets a confidence between 0 and 1: high
+        where the document labels or structures the field so that rules read
+        it reliably, low where they can only guess. Agents send only the
+        fields below their confidence threshold to the LLM.
+        """
+        self._lock = threading.Lock()
+        self._documents: Dict[str, int] = {}
+        self._rules_only: Dict[str, int] = {}
+        self._llm_fields: Dict[str, Dict[str, int]] = {}
+
+    def extract_cv(self, text: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Extract CV fields with rules.
+
+        Args:
+            text (str): CV text
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, float]]: CV data in the shape of the LLM extraction,
+                and the confidence of each field
+        """
+        sections = split_sections(text, CV_SECTIONS)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        data: Dict[str, Any] = {}
+        confidence: Dict[str, float] = {}
+        data["name"], confidence["name"] = self._cv_name(lines)
+        data["email"], confidence["email"] = self._email(text)
+        data["phone"], confidence["phone"] = self._phone(lines)
+        data["skills"], confidence["skills"] = self._cv_skills(sections, text)
+        data["experience"], confidence["experience"] = self._cv_experience(sections)
+        data["education"], confidence["education"] = self._cv_education(sections, lines)
+        return data, confidence
+
+    def extract_job(self, text: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Extract job description fields with rules.
+
+        Args:
+            text (str): Job description text
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, float]]: Job data in the shape of the LLM extraction,
+                and the confidence of each field
+        """
+        sections = split_sections(text, JOB_SECTIONS)
+        requirements = sections.get("requirements", [])
+        required_lines = [line for line in requirements if not _PREFERRED.search(line)]
+        preferred_lines = sections.get("preferred", []) + [line for line in requirements if _PREFERRED.search(line)]
+        data: Dict[str, Any] = {}
+        confidence: Dict[str, float] = {}
+        data["title"], confidence["title"] = self._job_title(sections, text)
+
+        if required_lines:
+            data["required_skills"] = skill_dictionary.find_all(required_lines)
+            confidence["required_skills"] = 0.8 if len(data["required_skills"]) >= 2 else 0.4
+        else:
+            data["required_skills"] = skill_dictionary.find(text)
+            confidence["required_skills"] = 0.4
+        if preferred_lines:
+            data["preferred_skills"] = [
+                skill for skill in skill_dictionary.find_all(preferred_lines)
+                if skill not in data["required_skills"]
+            ]
+            confidence["preferred_skills"] = 0.8 if data["preferred_skills"] else 0.4
+        elif requirements and not _PREFERRED.search(text):
+            # Structured posting with nothing marked as preferred: an empty list is what it says
+            data["preferred_skills"], confidence["preferred_skills"] = [], 0.85
+        else:
+            # Preferred skills in prose are only a guess
+            data["preferred_skills"] = skill_dictionary.find_all(
+                [sentence for sentence in _sentences(text.splitlines()) if _PREFERRED.search(sentence)]
+            )
+            confidence["preferred_skills"] = 0.4
+            if not required_lines:
+                data["required_skills"] = [
+                    skill for skill in data["required_skills"] if skill not in data["preferred_skills"]
+                ]
+
+        responsibilities = sections.get("responsibilities", [])
+        data["responsibilities"] = responsibilities
+        confidence["responsibilities"] = 0.9 if len(responsibilities) >= 2 else 0.3
+
+        data["experience"], confidence["experience"] = self._job_experience(requirements, text)
+        data["education"], confidence["education"] = self._job_education(requirements, text)
+        return data, confidence
+
+    def record(self, kind: str, llm_fields: Sequence[str]):
+        """
+        Count an extraction and the fields it sent to the LLM.
+
+        Args:
+            kind (str): "cv" or "job"
+            llm_fields (Sequence[str]): Fields below the confidence threshold, empty if rules sufficed
+        """
+        with self._lock:
+            self._documents[kind] = self._documents.get(kind, 0) + 1
+            if not llm_fields:
+                self._rules_only[kind] = self._rules_only.get(kind, 0) + 1
+            counts = self._llm_fields.setdefault(kind, {})
+            for field in llm_fields:
+                counts[field] = counts.get(field, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get extraction counts.
+
+        Returns:
+            Dict[str, Any]: Per document kind, documents extracted, documents needing no LLM call,
+                the fraction of LLM calls avoided and how often each field was sent to the LLM
+        """
+        with self._lock:
+            return {
+                kind: {
+                    "documents": documents,
+                    "rules_only": self._rules_only.get(kind, 0),
+                    "llm_calls_avoided": self._rules_only.get(kind, 0) / documents,
+                    "llm_fields": dict(self._llm_fields.get(kind, {}))
+                }
+                for kind, documents in self._documents.items()
+            }
+
+    @staticmethod
+    def _cv_name(lines: List[str]) -> Tuple[str, float]:
+        for line in lines[:10]:
+            labelled = _NAME_LABELLED.match(line)
+            if labelled:
+                return labelled.group(1).strip(), 0.95
+        for line in lines[:5]:
+            words = line.split()
+            if 2 <= len(words) <= 4 and all(_NAME_WORD.match(word) for word in words) \
+                    and " ".join(words).lower() not in CV_SECTIONS and "resume" not in line.lower():
+                return line, 0.75
+        return "", 0.0
+
+    @staticmethod
+    def _email(text: str) -> Tuple[str, float]:
+        emails = list(dict.fromkeys(_EMAIL.findall(text)))
+        if len(emails) == 1:
+            return emails[0], 0.98
+        if emails:
+            return emails[0], 0.7
+        # No address pattern: only trust "none" if nothing looks like one
+        return "", 0.9 if "@" not in text else 0.3
+
+    @staticmethod
+    def _phone(lines: List[str]) -> Tuple[str, float]:
+        for line in lines:
+            labelled = _PHONE_LABELLED.match(line)
+            if labelled:
+                return labelled.group(1).strip(), 0.95
+        for line in lines:
+            match = _PHONE.search(line)
+            if match and 7 <= sum(char.isdigit() for char in match.group(1)) <= 15:
+                return match.group(1).strip(), 0.75
+        labelled_elsewhere = any(re.match(r"(?:phone|mobile|tel|cell)\b", line, re.IGNORECASE) for line in lines)
+        return "", 0.3 if labelled_elsewhere else 0.85
+
+    @staticmethod
+    def _cv_skills(sections: Dict[str, List[str]], text: str) -> Tuple[List[str], float]:
+        lines = sections.get("skills", []) + sections.get("stack", [])
+        if not lines:
+            skills = skill_dictionary.find(text)
+            return skills, 0.5 if skills else 0.2
+        found: Dict[str, None] = {}
+        for line in lines:
+            # "Python & Machine Learning - Proficient in ...": the part before the dash names the skills
+            parts = re.split(r"\s+[-–—:]\s+", line, maxsplit=1)
+            head, tail = parts[0], parts[1] if len(parts) > 1 else ""
+            items = [item.strip(" .") for item in _LIST_SEPARATOR.split(head) if item.strip(" .")]
+            listed = len(items) >= 2 or len(head.split()) <= 4
+            for item in items:
+                known = skill_dictionary.canonical(item)
+                mentioned = skill_dictionary.find(item, in_list=True)
+                if known:
+                    mentioned = [known]
+                elif not mentioned and listed and len(item.split()) <= 4:
+                    # An unknown name in a skill list is still a skill
+                    mentioned = [item]
+                for skill in mentioned:
+                    found.setdefault(skill)
+            for skill in skill_dictionary.find(tail):
+                found.setdefault(skill)
+        skills = list(found)
+        return skills, 0.85 if len(skills) >= 3 else 0.6
+
+    @staticmethod
+    def _cv_experience(sections: Dict[str, List[str]]) -> Tuple[List[Dict[str, str]], float]:
+        if "experience" not in sections:
+            return [], 0.4
+        entries: List[Dict[str, str]] = []
+        unparsed = 0
+        for line in sections["experience"]:
+            role = _ROLE.match(line)
+            if role:
+                entries.append({
+                    "title": role.group("title").strip(),
+                    "company": role.group("company").strip(" ,"),
+                    "duration": role.group("duration").strip(),
+                    "description": ""
+                })
+            elif entries:
+                entries[-1]["description"] = f"{entries[-1]['description']} {line}".strip()
+            else:
+                unparsed += 1
+        if not entries:
+            return [], 0.3
+        return entries, 0.85 if not unparsed and all(entry["description"] for entry in entries) else 0.6
+
+    @staticmethod
+    def _cv_education(sections: Dict[str, List[str]], lines: List[str]) -> Tuple[List[Dict[str, str]], float]:
+        in_section = "education" in sections
+        source = sections["education"] if in_section else lines
+        entries: List[Dict[str, str]] = []
+        for line in source:
+            if _DEGREE.search(line):
+                # "Degree, Institution (2014-2018)" or "Degree from Institution - 2018"
+                parts = re.split(r"\s+(?:at|from)\s+|\s*[,|–—]\s*|\s+-\s+", re.sub(r"\([^)]*\)", "", line).strip())
+                institutions = [part for part in parts[1:] if _INSTITUTION.search(part)]
+                years = _YEAR.findall(line)
+                entries.append({
+                    "degree": parts[0].strip(),
+                    "institution": institutions[0].strip() if institutions else "",
+                    "year": years[-1] if years else ""
+                })
+            elif entries and not entries[-1]["institution"] and _INSTITUTION.search(line) and len(line.split()) <= 10:
+                entries[-1]["institution"] = line
+        if not entries:
+            return [], 0.4 if in_section else 0.5
+        return entries, 0.85 if in_section else 0.6
+
+    @staticmethod
+    def _job_title(sections: Dict[str, List[str]], text: str) -> Tuple[str, float]:
+        for line in sections.get("header", [])[:5]:
+            labelled = _TITLE_LABELLED.match(line)
+            if labelled:
+                return labelled.group(1).strip(), 0.95
+        header = sections.get("header", [])
+        if header and len(header[0].split()) <= 8 and not header[0].endswith((".", ":", "!", "?")):
+            return header[0], 0.75
+        in_prose = _TITLE_IN_PROSE.search(text)
+        if in_prose:
+            return in_prose.group("title").strip(), 0.8
+        return "", 0.0
+
+    @staticmethod
+    def _job_experience(requirements: List[str], text: str) -> Tuple[str, float]:
+        # Without a requirements section the sentence is found in prose, which is only a guess
+        in_section = bool(requirements)
+        sentences = _sentences(requirements or text.splitlines())
+        for sentence in sentences:
+            if _YEARS_OF_EXPERIENCE.search(sentence) and "experience" in sentence.lower():
+                return sentence, 0.9 if in_section else 0.5
+        for sentence in sentences:
+            if re.match(r"(?:proven\s+|prior\s+|previous\s+)?experience\b", sentence, re.IGNORECASE):
+                return sentence, 0.75 if in_section else 0.4
+        return "", 0.5
+
+    @staticmethod
+    def _job_education(requirements: List[str], text: str) -> Tuple[str, float]:
+        in_section = bool(requirements)
+        for sentence in _sentences(requirements or text.splitlines()):
+            if _DEGREE.search(sentence) or re.search(r"\bdegree\b", sentence, re.IGNORECASE):
+                return sentence, 0.9 if in_section else 0.5
+        return "", 0.6
+
+
+# Process-wide extractor shared by the analyzer agents
+rule_extractor = RuleBasedExtractor()
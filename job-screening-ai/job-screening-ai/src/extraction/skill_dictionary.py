@@ -0,0 +1,247 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Canonical skill name -> alternative spellings found in CVs and job descriptions
+SKILL_TERMS: Dict[str, List[str]] = {
+    # Programming languages
+    "Python": [],
+    "Java": [],
+    "JavaScript": ["js"],
+    "TypeScript": ["ts"],
+    "C": [],
+    "C++": ["cpp"],
+    "C#": ["c sharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Ruby": [],
+    "PHP": [],
+    "Swift": [],
+    "Kotlin": [],
+    "Scala": [],
+    "R": [],
+    "MATLAB": [],
+    "Perl": [],
+    "Dart": [],
+    "Bash": ["shell scripting"],
+    "SQL": [],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Solidity": [],
+    # Web and mobile frameworks
+    "React": ["react.js", "reactjs"],
+    "React Native": [],
+    "Angular": ["angularjs"],
+    "Vue.js": ["vue", "vuejs"],
+    "Node.js": ["node", "nodejs"],
+    "Express.js": ["express", "expressjs"],
+    "Next.js": ["nextjs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["spring"],
+    ".NET": ["dotnet", "asp.net"],
+    "Ruby on Rails": ["rails"],
+    "Laravel": [],
+    "Flutter": [],
+    "Android": [],
+    "iOS": [],
+    "GraphQL": [],
+    "REST APIs": ["rest", "restful apis", "rest api", "restful"],
+    "Microservices": ["microservice architecture"],
+    "Web Development": [],
+    "Full-Stack Development": ["full-stack web development", "full stack development", "full-stack"],
+    "Mobile App Development": ["mobile app creation", "mobile development"],
+    # Data and machine learning
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "Data Science": [],
+    "Data Analysis": ["data analytics"],
+    "Data Visualization": [],
+    "Data Engineering": [],
+    "Data Mining": [],
+    "Statistics": ["statistical analysis"],
+    "Predictive Modeling": ["predictive models", "predictive analytics"],
+    "Big Data": [],
+    "TensorFlow": [],
+    "PyTorch": [],
+    "Keras": [],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": [],
+    "Kafka": ["apache kafka"],
+    "Airflow": ["apache airflow"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel", "ms excel"],
+    "ETL": [],
+    "LLMs": ["large language models", "llm"],
+    # Databases
+    "MySQL": [],
+    "PostgreSQL": ["postgres"],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Oracle": [],
+    "SQL Server": ["mssql", "microsoft sql server"],
+    "SQLite": [],
+    "Cassandra": [],
+    "Elasticsearch": ["elastic search"],
+    "Snowflake": [],
+    "Databases": ["database management", "database design"],
+    "NoSQL": [],
+    # Cloud and DevOps
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "Azure DevOps": [],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["continuous integration", "continuous delivery", "continuous deployment"],
+    "DevOps": [],
+    "Git": ["github", "gitlab"],
+    "Linux": ["unix"],
+    "Cloud Computing": ["cloud infrastructure", "cloud platforms"],
+    "Networking": ["network administration"],
+    "System Design": ["system architecture"],
+    # Security
+    "Cybersecurity": ["cyber security", "information security"],
+    "Penetration Testing": ["pen testing"],
+    "Risk Assessment": ["risk management"],
+    "Network Security": [],
+    "Cryptography": [],
+    "Blockchain": [],
+    # Practices
+    "Agile": ["agile methodologies", "agile development"],
+    "Scrum": [],
+    "Software Testing": ["unit testing", "test automation", "automated testing"],
+    "Debugging": ["troubleshooting"],
+    "Object-Oriented Programming": ["oop"],
+    "Software Development": ["software engineering"],
+    "Project Management": [],
+    "Product Management": [],
+    "UI/UX Design": ["ui/ux", "ux design", "ui design", "user experience design"],
+    "Figma": [],
+    "Adobe XD": [],
+    "Jira": [],
+    # Business and people skills
+    "Digital Marketing": [],
+    "SEO": ["search engine optimization"],
+    "Content Marketing": [],
+    "Social Media Marketing": ["social media"],
+    "Financial Analysis": ["financial modeling", "financial modelling"],
+    "Accounting": [],
+    "Business Analysis": [],
+    "Business Strategy": ["strategic planning"],
+    "Operations Management": [],
+    "Supply Chain Management": ["supply chain"],
+    "Sales": [],
+    "Customer Service": ["customer support"],
+    "Recruitment": ["talent acquisition", "recruiting"],
+    "Human Resources": ["hr"],
+    "Communication": ["communication skills"],
+    "Leadership": ["team leadership"],
+    "Problem Solving": ["problem-solving"],
+    "Teamwork": ["collaboration"],
+    "Time Management": [],
+    "Critical Thinking": [],
+    "Analytical Skills": ["analytical"],
+    "Attention to Detail": [],
+}
+
+# Spellings that are also everyday words; in prose they only count with the casing of a name
+_COMMON_WORDS = {"go", "rest", "spring", "node", "express", "rails", "swift", "rust", "ruby", "dart", "oracle", "excel"}
+
+
+class SkillDictionary:
+    def __init__(self, terms: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize a dictionary lookup of known skill names in free text.
+
+        All names and aliases are compiled into one case-insensitive pattern,
+        longest first, so a text is scanned once and "React Native" is found
+        as itself rather than as "React". Boundaries allow the symbols of names
+        such as C++, C# and .NET.
+
+        Args:
+            terms (Optional[Dict[str, List[str]]]): Canonical names and their aliases, SKILL_TERMS by default
+        """
+        terms = SKILL_TERMS if terms is None else terms
+        self._canonical: Dict[str, str] = {}
+        for name, aliases in terms.items():
+            for spelling in [name, *aliases]:
+                self._canonical[spelling.lower()] = name
+        spellings = sorted(self._canonical, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"(?<![\w+#.])(" + "|".join(re.escape(spelling) for spelling in spellings) + r")(?![\w+#]|\.\w)",
+            re.IGNORECASE
+        )
+        # Outside skill lists, short names (Go, AI) and everyday words must be capitalized
+        # and single letters (C, R) are ignored
+        self._strict = {
+            spelling for spelling in self._canonical
+            if len(spelling) <= 3 or spelling in _COMMON_WORDS
+        }
+
+    def __len__(self) -> int:
+        return len(set(self._canonical.values()))
+
+    def canonical(self, name: str) -> Optional[str]:
+        """
+        Get the canonical name of a skill spelling.
+
+        Args:
+            name (str): Skill name or alias
+
+        Returns:
+            Optional[str]: Canonical name, or None if the skill is not in the dictionary
+        """
+        return self._canonical.get(" ".join(name.lower().split()))
+
+    def find(self, text: str, in_list: bool = False) -> List[str]:
+        """
+        Find the known skills mentioned in a text.
+
+        Args:
+            text (str): Free text
+            in_list (bool): Whether the text is a skill list, where single letters (C, R),
+                short names and everyday words (Go, Rest) count in any casing
+
+        Returns:
+            List[str]: Canonical names in order of first mention
+        """
+        found: Dict[str, None] = {}
+        for match in self._pattern.finditer(text):
+            written = match.group(1)
+            spelling = written.lower()
+            if not in_list and spelling in self._strict and (len(written) == 1 or not written[0].isupper()):
+                continue
+            found.setdefault(self._canonical[spelling])
+        return list(found)
+
+    def find_all(self, texts: Iterable[str], in_list: bool = False) -> List[str]:
+        """
+        Find the known skills mentioned in several texts.
+
+        Args:
+            texts (Iterable[str]): Free texts
+            in_list (bool): Whether the texts are skill lists
+
+        Returns:
+            List[str]: Canonical names in order of first mention
+        """
+        found: Dict[str, None] = {}
+        for text in texts:
+            for name in self.find(text, in_list):
+                found.setdefault(name)
+        return list(found)
+
+
+# Process-wide skill dictionary shared by the rule-based extractors
+skill_dictionary = SkillDictionary()
@@ -0,0 +1,135 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.config import INFERENCE_CPU_WORKERS, INFERENCE_IO_WORKERS
+
+
+class _Pool:
+    def __init__(self, name: str, workers: int):
+        """
+        Initialize a lazily started thread pool with usage counters.
+
+        Args:
+            name (str): Pool name, used as the thread name prefix
+            workers (int): Maximum number of threads
+        """
+        self.name = name
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.active = 0
+
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the underlying executor, starting it on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix=f"inference-{self.name}"
+                    )
+        return self._executor
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a function on a pool thread, keeping the counters up to date."""
+        with self._lock:
+            self.active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Get the pool counters."""
+        return {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "active": self.active,
+            "queued": self.submitted - self.completed - self.active
+        }
+
+    def shutdown(self):
+        """Stop the pool; it is restarted on the next submission."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+class InferenceExecutor:
+    def __init__(self, cpu_workers: int = INFERENCE_CPU_WORKERS, io_workers: int = INFERENCE_IO_WORKERS):
+        """
+        Initialize the inference executor.
+
+        Blocking work is kept off the asyncio event loop: model inference and
+        document parsing go to a small CPU pool, calls that mostly wait on
+        other processes go to a larger I/O pool.
+
+        Args:
+            cpu_workers (int): Threads for CPU-bound model work
+            io_workers (int): Threads for blocking waits
+        """
+        self.cpu = _Pool("cpu", cpu_workers)
+        self.io = _Pool("io", io_workers)
+
+    async def run_cpu(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run CPU-bound work (model inference, parsing, scoring) off the event loop.
+
+        Args:
+            func (Callable): Blocking function
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: The function's return value
+        """
+        return await self._submit(self.cpu, func, *args, **kwargs)
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run blocking I/O-bound work (waits on worker processes, cache file access) off the event loop.
+
+        Args:
+            func (Callable): Blocking function
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: The function's return value
+        """
+        return await self._submit(self.io, func, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get usage counters of both pools.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Counters per pool
+        """
+        return {"cpu": self.cpu.stats(), "io": self.io.stats()}
+
+    def shutdown(self):
+        """Stop both pools."""
+        self.cpu.shutdown()
+        self.io.shutdown()
+
+    async def _submit(self, pool: _Pool, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        pool.submitted += 1
+        return await loop.run_in_executor(
+            pool.executor(),
+            functools.partial(pool.call, func, *args, **kwargs)
+        )
+
+
+# Process-wide executor shared by all agents
+inference_executor = InferenceExecutor()
@@ -0,0 +1,314 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.config import OLLAMA_HOST, OLLAMA_MODEL, LLM_MAX_CONCURRENCY, LLM_TIMEOUT
+from src.llm.json_stream import JSONObjectScanner, repair_json
+
+
+def _base_url(host: str) -> str:
+    """Accept OLLAMA_HOST with or without a scheme, as the Ollama CLI does."""
+    host = host.strip().rstrip("/")
+    return host if "://" in host else f"http://{host}"
+
+
+class OllamaClient:
+    def __init__(
+        self,
+        host: str = OLLAMA_HOST,
+        model: str = OLLAMA_MODEL,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT
+    ):
+        """
+        Initialize the shared asynchronous client of the Ollama server.
+
+        Generations are awaited instead of blocking a thread, and share one
+        pool of keep-alive connections. At most `max_concurrency` generations
+        are in flight at once; further calls wait for a free slot, so bursts
+        queue here rather than in the Ollama server.
+
+        Args:
+            host (str): Ollama server address
+            model (str): Default model
+            max_concurrency (int): Maximum number of generations in flight
+            timeout (float): Default time limit of a generation in seconds
+        """
+        self.base_url = _base_url(host)
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self._requests = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._in_flight = 0
+        self._waiting = 0
+        self._peak_in_flight = 0
+        self._total_wait = 0.0
+        self._total_latency = 0.0
+        self._prompt_tokens = 0
+        self._generated_tokens = 0
+
+        self._json_requests = 0
+        self._stopped_early = 0
+        self._repaired = 0
+        self._parse_failures = 0
+        self._discarded_tokens = 0
+        self._total_time_to_result = 0.0
+
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion for a prompt.
+
+        Args:
+            prompt (str): Prompt text
+            model (Optional[str]): Model to use, the client default when None
+            timeout (Optional[float]): Time limit in seconds, the client default when None;
+                waiting for a free slot does not count
+            options (Optional[Dict[str, Any]]): Ollama model options (temperature, num_predict, ...)
+
+        Returns:
+            Dict[str, Any]: Ollama response object; the generated text is under 'response'
+        """
+        payload = {"model": model or self.model, "prompt": prompt, "stream": False}
+        if options:
+            payload["options"] = options
+        client, _ = self._ensure_client()
+
+        async with self._slot():
+            response = await asyncio.wait_for(
+                client.post("/api/generate", json=payload),
+                timeout if timeout is not None else self.timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+
+        self._prompt_tokens += result.get("prompt_eval_count", 0)
+        self._generated_tokens += result.get("eval_count", 0)
+        return result
+
+    async def generate_json(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a JSON object, streaming the completion and stopping once the object is complete.
+
+        Streamed text is fed to an incremental scanner; when the top-level
+        object closes and parses, the stream is closed, which makes Ollama stop
+        generating, so prose the model writes after the object is never paid
+        for. If the stream ends without a valid object (code fences, trailing
+        commas, output cut off by num_predict), the text is repaired instead.
+
+        Args:
+            prompt (str): Prompt text
+            model (Optional[str]): Model to use, the client default when None
+            timeout (Optional[float]): Time limit in seconds, the client default when None;
+                waiting for a free slot does not count
+            options (Optional[Dict[str, Any]]): Ollama model options (temperature, num_predict, ...)
+
+        Returns:
+            Dict[str, Any]: 'result' (the parsed object, or None if none could be recovered),
+                'text' (streamed text), 'tokens' (tokens received), 'discarded_tokens'
+                (received tokens outside the object), 'time_to_result_ms', 'first_token_ms'
+                (mostly prompt processing; None if nothing was generated), 'stopped_early' and 'repaired'
+        """
+        payload = {"model": model or self.model, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+        client, _ = self._ensure_client()
+        scanner = JSONObjectScanner()
+        offsets: List[int] = []
+        timing: Dict[str, float] = {}
+
+        async with self._slot() as started:
+            final = await asyncio.wait_for(
+                self._stream(client, payload, scanner, offsets, timing),
+                timeout if timeout is not None else self.timeout
+            )
+            time_to_result = time.perf_counter() - started
+
+        text = scanner.text
+        result, repaired = scanner.result, False
+        if result is None:
+            result = repair_json(text)
+            if isinstance(result, dict):
+                repaired = True
+            else:
+                result = None
+        if scanner.complete:
+            span = (scanner.start, scanner.end)
+        elif repaired:
+            span = (text.find("{"), len(text))
+        else:
+            span = (len(text), len(text))
+        # Token i covers text[offsets[i]:offsets[i + 1]]; it is discarded if it lies wholly outside the object
+        bounds = offsets + [len(text)]
+        discarded = sum(
+            1 for i in range(len(offsets))
+            if bounds[i + 1] <= span[0] or bounds[i] >= span[1]
+        )
+        stopped_early = final is None and scanner.complete
+
+        self._json_requests += 1
+        self._stopped_early += stopped_early
+        self._repaired += repaired
+        self._parse_failures += result is None
+        self._discarded_tokens += discarded
+        self._total_time_to_result += time_to_result
+        if final is not None:
+            self._prompt_tokens += final.get("prompt_eval_count", 0)
+            self._generated_tokens += final.get("eval_count", len(offsets))
+        else:
+            self._generated_tokens += len(offsets)
+        return {
+            "result": result,
+            "text": text,
+            "tokens": len(offsets),
+            "discarded_tokens": discarded,
+            "time_to_result_ms": time_to_result * 1000,
+            "first_token_ms": (timing["first_token"] - started) * 1000 if "first_token" in timing else None,
+            "stopped_early": stopped_early,
+            "repaired": repaired
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get client metrics.
+
+        Returns:
+            Dict[str, Any]: Request and failure counts, slot usage, wait and latency, token counts
+        """
+        requests = self._requests or 1
+        return {
+            "host": self.base_url,
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "requests": self._requests,
+            "errors": self._errors,
+            "timeouts": self._timeouts,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "peak_in_flight": self._peak_in_flight,
+            "avg_wait_ms": self._total_wait / requests * 1000,
+            "avg_latency_ms": self._total_latency / requests * 1000,
+            "prompt_tokens": self._prompt_tokens,
+            "generated_tokens": self._generated_tokens,
+            "json": {
+                "requests": self._json_requests,
+                "stopped_early": self._stopped_early,
+                "repaired": self._repaired,
+                "parse_failures": self._parse_failures,
+                "discarded_tokens": self._discarded_tokens,
+                "avg_time_to_result_ms": self._total_time_to_result / (self._json_requests or 1) * 1000
+            }
+        }
+
+    async def close(self):
+        """Close the pooled connections; the next call opens new ones."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._slots = None
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Hold one of the generation slots, counting waits, latency and failures; yields the start time."""
+        _, slots = self._ensure_client()
+        queued = time.perf_counter()
+        self._waiting += 1
+        async with slots:
+            self._waiting -= 1
+            started = time.perf_counter()
+            self._total_wait += started - queued
+            self._requests += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            try:
+                yield started
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise
+            except Exception:
+                self._errors += 1
+                raise
+            finally:
+                self._in_flight -= 1
+                self._total_latency += time.perf_counter() - started
+
+    @staticmethod
+    async def _stream(
+        client: httpx.AsyncClient,
+        payload: Dict[str, Any],
+        scanner: JSONObjectScanner,
+        offsets: List[int],
+        timing: Dict[str, float]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Feed a streamed generation to the scanner until the object completes or the stream ends.
+
+        Args:
+            client (httpx.AsyncClient): HTTP client
+            payload (Dict[str, Any]): /api/generate request body
+            scanner (JSONObjectScanner): Scanner receiving the generated text
+            offsets (List[int]): Receives the text offset of each streamed token
+            timing (Dict[str, float]): Receives the perf_counter time of the first token under 'first_token'
+
+        Returns:
+            Optional[Dict[str, Any]]: The final stream message, or None if the stream was cut off early
+        """
+        async with client.stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if "error" in message:
+                    raise RuntimeError(f"Ollama error: {message['error']}")
+                piece = message.get("response", "")
+                if piece:
+                    timing.setdefault("first_token", time.perf_counter())
+                    offsets.append(len(scanner.text))
+                if message.get("done"):
+                    scanner.feed(piece)
+                    return message
+                if scanner.feed(piece):
+                    # Leaving the block closes the connection, which cancels the generation
+                    return None
+        return None
+
+    def _ensure_client(self):
+        """Create the HTTP client and the slot semaphore on first use, on the running loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                # Generation time is bounded per call; connecting to the server should be quick
+                timeout=httpx.Timeout(None, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._client, self._slots
+
+
+# Process-wide client shared by all agents
+ollama_client = OllamaClient()
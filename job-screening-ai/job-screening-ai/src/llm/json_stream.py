@@ -0,0 +1,151 @@
+import json
+import re
+from typing import Any, List, Optional
+
+_FENCE = re.compile(r"```[a-zA-Z]*")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+# Incomplete last member of a truncated object: a key, optionally with its colon
+_DANGLING_KEY = re.compile(r'[{,]\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+
+class JSONObjectScanner:
+    def __init__(self):
+        """
+        Initialize an incremental scanner for the first complete JSON object in streamed text.
+
+        Text is fed as it arrives; every character is looked at once, tracking
+        string and nesting state, so the end of the top-level object is known
+        the moment its closing brace arrives. Prose or code fences around the
+        object are skipped. A balanced span that does not parse is dropped and
+        scanning resumes after it.
+        """
+        self._buffer = ""
+        self._scanned = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.start = -1
+        self.end = -1
+        self.result: Optional[Any] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.end >= 0
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scan the next piece of streamed text.
+
+        Args:
+            chunk (str): Newly received text
+
+        Returns:
+            bool: True once a complete, valid top-level object has been seen
+        """
+        if self.complete:
+            self._buffer += chunk
+            return True
+        self._buffer += chunk
+        text = self._buffer
+        for position in range(self._scanned, len(text)):
+            char = text[position]
+            if self.start < 0:
+                if char == "{":
+                    self.start, self._depth = position, 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._accept(text[self.start:position + 1]):
+                        self.end = position + 1
+                        self._scanned = position + 1
+                        return True
+                    self.start = -1
+        self._scanned = len(text)
+        return False
+
+    def _accept(self, candidate: str) -> bool:
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError:
+            value = repair_json(candidate)
+        if not isinstance(value, dict):
+            return False
+        self.result = value
+        return True
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    Parse the first JSON object in LLM output, repairing common damage.
+
+    Handles Markdown code fences and prose around the object, trailing commas
+    and output cut off mid-object (an unterminated string, a dangling key or
+    comma, unclosed brackets).
+
+    Args:
+        text (str): Raw model output
+
+    Returns:
+        Optional[Any]: The parsed object, or None if no object can be recovered
+    """
+    text = _FENCE.sub("", text)
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    stack: List[str] = []
+    in_string = escape = False
+    end = len(text)
+    for position in range(start, len(text)):
+        char = text[position]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                end = position + 1
+                break
+
+    candidate = text[start:end]
+    if stack:
+        # Truncated: finish the open string, drop an incomplete last member, close the brackets
+        if in_string:
+            candidate += '"'
+        candidate = candidate.rstrip()
+        if stack[-1] == "}":
+            dangling = _DANGLING_KEY.search(candidate)
+            if dangling is not None:
+                candidate = candidate[:dangling.start() + 1]
+        candidate = candidate.rstrip().rstrip(",")
+        candidate += "".join(reversed(stack))
+    candidate = _TRAILING_COMMA.sub(r"\1", candidate)
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        return None
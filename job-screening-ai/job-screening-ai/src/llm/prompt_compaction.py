@@ -0,0 +1,321 @@
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from src.config import PROMPT_TOKEN_BUDGET, PROMPT_TOKENIZER
+from src.extraction.rule_extractor import CV_SECTIONS, JOB_SECTIONS
+
+# Sections each extracted field is read from; "header" is the text before the first heading
+CV_FIELD_SECTIONS = {
+    "name": {"header", "contact"},
+    "email": {"header", "contact"},
+    "phone": {"header", "contact"},
+    "skills": {"skills", "stack", "experience"},
+    "experience": {"experience"},
+    "education": {"education"}
+}
+JOB_FIELD_SECTIONS = {
+    "title": {"header", "description"},
+    "required_skills": {"requirements", "description"},
+    "preferred_skills": {"preferred", "requirements"},
+    "experience": {"requirements"},
+    "education": {"requirements"},
+    "responsibilities": {"responsibilities"}
+}
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b\u3000]+")
+_CONTROL = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$|^[-–—]\s*\d{1,3}\s*[-–—]$", re.IGNORECASE)
+_BOILERPLATE = re.compile(
+    r"^(?:references available (?:up)?on request|confidential|private (?:and|&) confidential|"
+    r"curriculum vitae|resume|r[ée]sum[ée]|cv)\.?$",
+    re.IGNORECASE
+)
+_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+class CompactedText(NamedTuple):
+    text: str
+    tokens_before: int
+    tokens_after: int
+    lines_dropped: int
+    truncated: bool
+
+
+class PromptCompactor:
+    def __init__(self, token_budget: int = PROMPT_TOKEN_BUDGET, tokenizer_name: str = PROMPT_TOKENIZER):
+        """
+        Initialize the compaction of documents inserted into extraction prompts.
+
+        Prompt processing time grows with the prompt, so before a CV or job
+        description is sent to the LLM its whitespace is normalized, page
+        furniture (page numbers, boilerplate, lines repeated on every page) is
+        dropped, only the sections the requested fields are read from are kept,
+        and what remains is cut to `token_budget` tokens, taking lines from
+        every section in turn so no section is dropped wholesale.
+
+        Tokens are counted with the Hugging Face tokenizer `tokenizer_name`,
+        loaded by load_tokenizer at startup or else on first use; if it cannot
+        be loaded a word-piece estimate is used.
+
+        Args:
+            token_budget (int): Maximum tokens of the document text (0 for no limit)
+            tokenizer_name (str): Tokenizer repository or directory matching OLLAMA_MODEL, or "" to always estimate
+        """
+        self.token_budget = max(0, token_budget)
+        self.tokenizer_name = tokenizer_name
+        self._tokenizer: Optional[Any] = None
+        self._tokenizer_loaded = False
+        self._lock = threading.Lock()
+
+        self.documents = 0
+        self.truncated = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self._saved_ms = 0.0
+        # Measured prompt processing rate: time to first token over prompt tokens
+        self._first_token_ms = 0.0
+        self._prompt_tokens = 0
+
+    def compact(self, text: str, kind: str, fields: Sequence[str]) -> CompactedText:
+        """
+        Compact a document for an extraction prompt.
+
+        Args:
+            text (str): CV or job description text
+            kind (str): "cv" or "job"
+            fields (Sequence[str]): Fields the prompt asks for
+
+        Returns:
+            CompactedText: Compacted text, token counts before and after,
+                number of lines dropped and whether the budget cut the text
+        """
+        headings = CV_SECTIONS if kind == "cv" else JOB_SECTIONS
+        field_sections = CV_FIELD_SECTIONS if kind == "cv" else JOB_FIELD_SECTIONS
+        lines = self._normalize(text)
+        kept = self._drop_furniture(lines, headings)
+        blocks = self._sections(kept, headings)
+
+        present = {section for section, _ in blocks}
+        wanted: Set[str] = set()
+        for field in fields:
+            wanted |= field_sections.get(field, set())
+        # Without recognizable sections for every field, keep the whole document
+        if all(field_sections.get(field, set()) & present for field in fields):
+            blocks = [(section, block) for section, block in blocks if section in wanted]
+
+        block_lines = [block for _, block in blocks]
+        truncated = False
+        if self.token_budget:
+            block_lines, truncated = self._fit(block_lines)
+        compacted = "\n".join(line for block in block_lines for line in block)
+
+        result = CompactedText(
+            text=compacted,
+            tokens_before=self.count_tokens(text),
+            tokens_after=self.count_tokens(compacted),
+            lines_dropped=len([line for line in lines if line]) - sum(len(block) for block in block_lines),
+            truncated=truncated
+        )
+        with self._lock:
+            self.documents += 1
+            self.truncated += truncated
+            self.tokens_before += result.tokens_before
+            self.tokens_after += result.tokens_after
+        return result
+
+    def record(self, label: str, compacted: CompactedText, first_token_ms: Optional[float]):
+        """
+        Log the token counts of a compacted prompt and the prompt processing time saved.
+
+        The time saved is estimated from the prompt processing rate measured
+        so far: time to first token per token of compacted text.
+
+        Args:
+            label (str): Document description for the log line
+            compacted (CompactedText): Result of compact
+            first_token_ms (Optional[float]): Time to the first generated token, None if unknown
+        """
+        with self._lock:
+            if first_token_ms is not None and compacted.tokens_after:
+                self._first_token_ms += first_token_ms
+                self._prompt_tokens += compacted.tokens_after
+            ms_per_token = self._first_token_ms / self._prompt_tokens if self._prompt_tokens else None
+            saved = None
+            if ms_per_token is not None:
+                saved = (compacted.tokens_before - compacted.tokens_after) * ms_per_token
+                self._saved_ms += saved
+        saved_text = f", ~{saved:.0f} ms of prompt processing saved" if saved is not None else ""
+        print(f"Compacted {label} prompt: {compacted.tokens_before} -> {compacted.tokens_after} tokens"
+              f"{' (truncated to budget)' if compacted.truncated else ''}{saved_text}")
+
+    def load_tokenizer(self) -> bool:
+        """
+        Load the tokenizer now, so the first request does not wait for it.
+
+        Returns:
+            bool: True if the tokenizer is available, False if token counts are estimated
+        """
+        return self._get_tokenizer() is not None
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text (str): Text
+
+        Returns:
+            int: Tokenizer count, or the estimate if no tokenizer is available
+        """
+        tokenizer = self._get_tokenizer()
+        if tokenizer is None:
+            return self._estimate(text)
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get compaction counters.
+
+        Returns:
+            Dict[str, Any]: Tokenizer, budget, documents compacted and truncated,
+                token totals before and after, and estimated prompt processing time saved
+        """
+        with self._lock:
+            return {
+                "tokenizer": self.tokenizer_name if self._tokenizer is not None else "estimate",
+                "token_budget": self.token_budget,
+                "documents": self.documents,
+                "truncated": self.truncated,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "token_reduction": 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0,
+                "prompt_ms_per_token": self._first_token_ms / self._prompt_tokens if self._prompt_tokens else None,
+                "estimated_saved_ms": self._saved_ms
+            }
+
+    @staticmethod
+    def _normalize(text: str) -> List[str]:
+        """Unify Unicode forms, collapse whitespace runs and blank-line runs; returns stripped lines."""
+        text = _CONTROL.sub("", unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n"))
+        lines: List[str] = []
+        for line in text.split("\n"):
+            line = _SPACES.sub(" ", line).strip()
+            if line or (lines and lines[-1]):
+                lines.append(line)
+        while lines and not lines[-1]:
+            lines.pop()
+        return lines
+
+    @staticmethod
+    def _drop_furniture(lines: List[str], headings: Dict[str, str]) -> List[str]:
+        """Drop page numbers, boilerplate and repeats of short lines that recur across pages."""
+        counts = Counter(line.lower() for line in lines if line)
+        seen: Set[str] = set()
+        kept: List[str] = []
+        for line in lines:
+            key = line.lower()
+            if not line:
+                kept.append(line)
+                continue
+            if _PAGE_NUMBER.match(line) or _BOILERPLATE.match(line):
+                continue
+            if counts[key] > 1 and len(line) <= 100 and key.rstrip(":").strip() not in headings:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        return kept
+
+    @staticmethod
+    def _sections(lines: List[str], headings: Dict[str, str]) -> List[Tuple[str, List[str]]]:
+        """Group lines into (section name, lines) blocks at known headings, dropping blank lines."""
+        blocks: List[Tuple[str, List[str]]] = [("header", [])]
+        for line in lines:
+            if not line:
+                continue
+            heading, colon, rest = line.partition(":")
+            key = " ".join(heading.lower().split())
+            if len(key) <= 40 and key in headings and (colon or not rest):
+                blocks.append((headings[key], []))
+            blocks[-1][1].append(line)
+        return [(section, block) for section, block in blocks if block]
+
+    def _fit(self, blocks: List[List[str]]) -> Tuple[List[List[str]], bool]:
+        """
+        Cut blocks of lines to the token budget, taking the next line of every block in turn.
+
+        A line too long for the tokens left closes its block; once no whole
+        line fits, the first of those lines are cut to the tokens still left,
+        so a document of one long line is shortened rather than dropped.
+
+        Returns:
+            Tuple[List[List[str]], bool]: Kept lines per block, and whether any line was cut
+        """
+        costs = [[self._line_tokens(line) for line in block] for block in blocks]
+        if sum(map(sum, costs)) <= self.token_budget:
+            return blocks, False
+        taken = [0] * len(blocks)
+        open_blocks = set(range(len(blocks)))
+        used = 0
+        while open_blocks:
+            for index in sorted(open_blocks):
+                if taken[index] == len(blocks[index]) or used + costs[index][taken[index]] > self.token_budget:
+                    open_blocks.discard(index)
+                    continue
+                used += costs[index][taken[index]]
+                taken[index] += 1
+
+        kept = [block[:count] for block, count in zip(blocks, taken)]
+        for index, block in enumerate(blocks):
+            if taken[index] < len(block) and used < self.token_budget:
+                cut = self._truncate(block[taken[index]], self.token_budget - used)
+                if cut:
+                    kept[index].append(cut)
+                    used += self._line_tokens(cut)
+        return kept, True
+
+    def _truncate(self, line: str, budget: int) -> str:
+        """Cut a line to at most `budget` tokens at a word, or at a sentence end in the second half."""
+        words = line.split(" ")
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._line_tokens(" ".join(words[:middle])) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        cut = " ".join(words[:low])
+        sentence_end = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+        if sentence_end >= len(cut) // 2:
+            cut = cut[:sentence_end + 1]
+        return cut
+
+    def _line_tokens(self, line: str) -> int:
+        # One more for the newline joining it to the next line
+        return self.count_tokens(line) + 1
+
+    def _get_tokenizer(self) -> Optional[Any]:
+        """Load the tokenizer on first use; a failed load falls back to the estimate for good."""
+        if not self._tokenizer_loaded:
+            with self._lock:
+                if not self._tokenizer_loaded:
+                    if self.tokenizer_name:
+                        try:
+                            from transformers import AutoTokenizer
+                            self._tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_name)
+                        except Exception as e:
+                            print(f"Error loading tokenizer {self.tokenizer_name}, estimating token counts: {str(e)}")
+                    self._tokenizer_loaded = True
+        return self._tokenizer
+
+    @staticmethod
+    def _estimate(text: str) -> int:
+        """Approximate a subword tokenizer: a token per punctuation mark and per up to 6 characters of a word."""
+        return sum(1 + (len(piece) - 1) // 6 for piece in _PIECE.findall(text))
+
+
+# Process-wide compactor shared by the analyzer agents
+prompt_compactor = PromptCompactor()
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config import LLM_CACHE_PATH, LLM_CACHE_SIZE, LLM_CACHE_TTL
+from src.embeddings.embedding_cache import normalize_text
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        path: Optional[str] = LLM_CACHE_PATH,
+        max_items: int = LLM_CACHE_SIZE,
+        ttl: float = LLM_CACHE_TTL
+    ):
+        """
+        Initialize the cache of parsed LLM results.
+
+        Entries are keyed by a hash of (model, prompt template name, template
+        version, normalized input, variant), so a changed prompt or model never
+        serves results of the old one. Entries older than `ttl` seconds are treated as
+        misses and removed; beyond `max_items` entries the least recently used
+        are evicted. The cache is a SQLite file that survives restarts.
+
+        Args:
+            path (Optional[str]): SQLite file, or None/"" to keep the cache in memory only
+            max_items (int): Maximum number of cached results (0 disables the cache)
+            ttl (float): Lifetime of an entry in seconds, 0 for no expiry
+        """
+        self.max_items = max(0, max_items)
+        self.ttl = max(0.0, ttl)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._items = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._templates: Dict[str, Dict[str, int]] = {}
+
+        if self.max_items:
+            self._open(path or ":memory:")
+
+    @staticmethod
+    def key(model: str, template: str, version: int, text: str, variant: str = "") -> str:
+        """
+        Get the cache key of a prompt input.
+
+        Args:
+            model (str): LLM model name
+            template (str): Prompt template name
+            version (int): Prompt template version
+            text (str): Input inserted into the template
+            variant (str): Other prompt parameters, e.g. the sorted fields asked for
+
+        Returns:
+            str: Hex digest of the model, template, version, normalized input and variant
+        """
+        digest = hashlib.sha256()
+        for part in (model, template, str(version), normalize_text(text), variant):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, model: str, template: str, version: int, text: str, variant: str = "") -> Optional[Any]:
+        """
+        Look up the parsed result of a prompt input.
+
+        Args:
+            model (str): LLM model name
+            template (str): Prompt template name
+            version (int): Prompt template version
+            text (str): Input inserted into the template
+            variant (str): Other prompt parameters, e.g. the sorted fields asked for
+
+        Returns:
+            Optional[Any]: Cached result, or None on a miss
+        """
+        if self._db is None:
+            return None
+        key = self.key(model, template, version, text, variant)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self._items -= 1
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                self._count(template, "misses")
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            self._count(template, "hits")
+        return json.loads(row[0])
+
+    def put(self, model: str, template: str, version: int, text: str, result: Any, variant: str = ""):
+        """
+        Store the parsed result of a prompt input, evicting the least recently used entries if full.
+
+        Args:
+            model (str): LLM model name
+            template (str): Prompt template name
+            version (int): Prompt template version
+            text (str): Input inserted into the template
+            result (Any): JSON-serializable parsed result
+            variant (str): Other prompt parameters, e.g. the sorted fields asked for
+        """
+        if self._db is None:
+            return
+        key = self.key(model, template, version, text, variant)
+        now = time.time()
+        with self._lock:
+            try:
+                exists = self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, template, result, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, template, json.dumps(result), now, now)
+                )
+                if exists is None:
+                    self._items += 1
+                if self._items > self.max_items:
+                    evicted = self._db.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                        (self._items - self.max_items,)
+                    ).rowcount
+                    self._items -= evicted
+                    self.evictions += evicted
+                self._db.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Error writing LLM response cache: {str(e)}")
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+                self._items = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, Any]: Hit, miss, expiry and eviction counts, hit rate, size and per-template counts
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self._db is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "items": self._items,
+            "max_items": self.max_items,
+            "ttl": self.ttl,
+            "templates": {name: dict(counts) for name, counts in self._templates.items()}
+        }
+
+    def close(self):
+        """Close the cache file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _count(self, template: str, outcome: str):
+        counts = self._templates.setdefault(template, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    def _open(self, path: str):
+        """
+        Open the SQLite file and drop entries that expired while the service was down.
+
+        Args:
+            path (str): SQLite file path or ":memory:"
+        """
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, template TEXT NOT NULL, result TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)")
+            if self.ttl:
+                self._db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+            self._db.commit()
+            self._items = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error opening LLM response cache at {path}: {str(e)}")
+            self._db = None
+
+
+# Process-wide cache shared by all agents
+llm_cache = LLMResponseCache()
@@ -1,7 +1,8 @@
 from fastapi import FastAPI, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
+import numpy as np
 from contextlib import asynccontextmanager
 import sys
 import os
@@ -9,25 +10,69 @@ import os
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.database.db_manager import DatabaseManager, init_db
+from src.database.db_manager import DatabaseManager, init_db, async_session
+from src.database.skill_vocabulary import skill_vocabulary, normalize_skill
 from src.agents.jd_analyzer import JDAnalyzerAgent
 from src.agents.cv_analyzer import CVAnalyzerAgent
 from src.agents.matcher import MatcherAgent
 from src.agents.scheduler import SchedulerAgent
+from src.embeddings.model_registry import model_registry
+from src.embeddings.embedding_service import embedding_service
+from src.matching.ann_index import candidate_index
+from src.matching.skill_synonyms import skill_synonyms
+from src.matching.candidate_pool import candidate_pool
+from src.matching.incremental import incremental_matcher
+from src.matching.rerank import preview_weights, apply_weights
+from src.matching.pipeline import match_pipeline
+from src.inference import inference_executor
+from src.llm.client import ollama_client
+from src.llm.response_cache import llm_cache
+from src.llm.prompt_compaction import prompt_compactor
+from src.extraction.rule_extractor import rule_extractor
+from src.config import MATCHES_PAGE_SIZE
 
-# Initialize agents
+# Initialize agents (embedding models are loaded lazily and shared through the model registry)
 jd_analyzer = JDAnalyzerAgent()
 cv_analyzer = CVAnalyzerAgent()
 matcher = MatcherAgent()
 scheduler = SchedulerAgent()
 
+# Keep the in-memory candidate structures up to date as CVs are analyzed
+DatabaseManager.add_candidate_listener(candidate_pool.add)
+DatabaseManager.add_candidate_listener(candidate_index.add_candidate)
+
+# Match new jobs and candidates in the background
+DatabaseManager.add_job_listener(incremental_matcher.job_created)
+DatabaseManager.add_candidate_listener(incremental_matcher.candidate_created)
+
+def _to_response(data: Any) -> Any:
+    """Convert numpy embeddings in agent output to lists for the JSON response."""
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    if isinstance(data, dict):
+        return {key: _to_response(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_to_response(value) for value in data]
+    return data
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    await inference_executor.run_io(prompt_compactor.load_tokenizer)
+    candidate_index.load()
+    async with async_session() as session:
+        await candidate_index.catch_up(session)
+    await skill_synonyms.sync(embedding_service.encode_many, embedding_service.model_name)
+    incremental_matcher.start()
     yield
     # Shutdown
-    pass
+    await incremental_matcher.stop()
+    await embedding_service.close()
+    await ollama_client.close()
+    llm_cache.close()
+    candidate_index.save()
+    inference_executor.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -59,7 +104,20 @@ async def root():
             "match_candidate": "/match-candidate",
             "schedule_interview": "/schedule-interview/{match_id}",
             "job_matches": "/job-matches/{job_id}",
-            "candidate_matches": "/candidate-matches/{candidate_id}"
+            "candidate_matches": "/candidate-matches/{candidate_id}",
+            "rank_candidates": "/jobs/{job_id}/rank",
+            "nearest_candidates": "/jobs/{job_id}/nearest",
+            "shortlist_candidates": "/jobs/{job_id}/shortlist",
+            "rerank_matches": "/matches/rerank",
+            "models": "/models",
+            "embedding_metrics": "/metrics/embeddings",
+            "inference_metrics": "/metrics/inference",
+            "index_metrics": "/metrics/index",
+            "matching_metrics": "/metrics/matching",
+            "llm_metrics": "/metrics/llm",
+            "extraction_metrics": "/metrics/extraction",
+            "skill_synonyms": "/skills/synonyms",
+            "skill_metrics": "/metrics/skills"
         }
     }
 
@@ -75,8 +133,9 @@ async def analyze_job(job_description: str, session: AsyncSession = Depends(Data
         
         # Create job in database
         job = await DatabaseManager.create_job(session, job_data)
+        await skill_synonyms.sync(embedding_service.encode_many, embedding_service.model_name)
         
-        return {"job_id": job.id, "job_data": job_data}
+        return {"job_id": job.id, "job_data": _to_response(job_data)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,8 +147,9 @@ async def analyze_cv(cv_path: str, session: AsyncSession = Depends(DatabaseManag
         
         # Create candidate in database
         candidate = await DatabaseManager.create_candidate(session, cv_data)
+        await skill_synonyms.sync(embedding_service.encode_many, embedding_service.model_name)
         
-        return {"candidate_id": candidate.id, "cv_data": cv_data}
+        return {"candidate_id": candidate.id, "cv_data": _to_response(cv_data)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -107,27 +167,19 @@ async def match_candidate(
         if not job or not candidate:
             raise HTTPException(status_code=404, detail="Job or candidate not found")
         
-        # Calculate match score
-        match_score, match_details = matcher.calculate_match_score(
-            job.__dict__,
-            candidate.__dict__
-        )
-        
-        # Create match in database
-        match_data = {
-            "job_id": job_id,
-            "candidate_id": candidate_id,
-            "match_score": match_score,
-            "match_details": match_details,
-            "status": "pending"
-        }
-        match = await DatabaseManager.create_match(session, match_data)
+        # Reuse the stored score while the job, candidate and weights are unchanged
+        match = await DatabaseManager.get_match_for_pair(session, job_id, candidate_id)
+        if match is None or not matcher.is_current(match, job, candidate):
+            match_data = await inference_executor.run_cpu(matcher.build_match, job, candidate)
+            match = await DatabaseManager.upsert_match(session, match_data)
         
         return {
             "match_id": match.id,
-            "match_score": match_score,
-            "match_details": match_details
+            "match_score": match.match_score,
+            "match_details": match.match_details
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -168,25 +220,208 @@ async def schedule_interview(
 @app.get("/job-matches/{job_id}")
 async def get_job_matches(
     job_id: int,
+    limit: int = MATCHES_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_details: bool = True,
     session: AsyncSession = Depends(DatabaseManager.get_session)
 ):
+    """Get a job's matches by descending score, one page at a time."""
     try:
-        matches = await DatabaseManager.get_job_matches(session, job_id)
-        return {"matches": matches}
+        matches, next_cursor = await DatabaseManager.get_job_matches(
+            session, job_id, limit, cursor, include_details
+        )
+        return {"matches": matches, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/candidate-matches/{candidate_id}")
 async def get_candidate_matches(
     candidate_id: int,
+    limit: int = MATCHES_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_details: bool = True,
+    session: AsyncSession = Depends(DatabaseManager.get_session)
+):
+    """Get a candidate's matches by descending score, one page at a time."""
+    try:
+        matches, next_cursor = await DatabaseManager.get_candidate_matches(
+            session, candidate_id, limit, cursor, include_details
+        )
+        return {"matches": matches, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{job_id}/rank")
+async def rank_candidates(
+    job_id: int,
+    top_k: int = 10,
+    min_skills: int = 0,
+    session: AsyncSession = Depends(DatabaseManager.get_session)
+):
+    """Rank the candidates having at least min_skills of the job skills and return the top_k with their component scores."""
+    try:
+        job = await DatabaseManager.get_job(session, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        await candidate_pool.ensure_loaded(session)
+        ranking = await inference_executor.run_cpu(
+            matcher.rank_candidates,
+            job.__dict__,
+            candidate_pool,
+            top_k,
+            min_skills
+        )
+        
+        return {
+            "job_id": job_id,
+            "candidates_ranked": len(candidate_pool),
+            "ranking": ranking
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{job_id}/shortlist")
+async def shortlist_candidates(
+    job_id: int,
+    top_k: int = 10,
+    retrieve_n: Optional[int] = None,
+    min_skills: int = 0,
+    session: AsyncSession = Depends(DatabaseManager.get_session)
+):
+    """Retrieve retrieve_n candidates cheaply, fully score them and return the top_k with match details."""
+    try:
+        job = await DatabaseManager.get_job(session, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        await candidate_pool.ensure_loaded(session)
+        result = await match_pipeline.run(session, job, candidate_pool, top_k, retrieve_n, min_skills)
+        
+        return _to_response({"job_id": job_id, **result})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{job_id}/nearest")
+async def nearest_candidates(
+    job_id: int,
+    top_k: int = 10,
+    nprobe: Optional[int] = None,
+    session: AsyncSession = Depends(DatabaseManager.get_session)
+):
+    """Find the top_k candidates with the most similar embeddings using the ANN index."""
+    try:
+        job = await DatabaseManager.get_job(session, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        candidates = await inference_executor.run_cpu(
+            matcher.nearest_candidates,
+            job.__dict__,
+            candidate_index,
+            top_k,
+            nprobe
+        )
+        
+        return {"job_id": job_id, "candidates": candidates}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/matches/rerank")
+async def preview_rerank(
+    embedding: float,
+    skills: float,
+    experience: float,
+    job_id: Optional[int] = None,
+    top_k: int = 10,
     session: AsyncSession = Depends(DatabaseManager.get_session)
 ):
+    """Show how stored matches would score and rank under other weights, without changing them."""
     try:
-        matches = await DatabaseManager.get_candidate_matches(session, candidate_id)
-        return {"matches": matches}
+        weights = {"embedding": embedding, "skills": skills, "experience": experience}
+        return await preview_weights(session, weights, job_id, top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/matches/rerank")
+async def apply_rerank(
+    embedding: float,
+    skills: float,
+    experience: float,
+    session: AsyncSession = Depends(DatabaseManager.get_session)
+):
+    """Re-score all stored matches under new weights and use the weights for new matches."""
+    try:
+        weights = {"embedding": embedding, "skills": skills, "experience": experience}
+        return await apply_weights(session, weights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/models")
+async def get_models():
+    """Report load time and memory usage of the loaded embedding models."""
+    return model_registry.stats()
+
+@app.get("/metrics/embeddings")
+async def get_embedding_metrics():
+    """Report batch occupancy and queue wait of the embedding service."""
+    return embedding_service.metrics()
+
+@app.get("/metrics/inference")
+async def get_inference_metrics():
+    """Report usage of the CPU and I/O inference pools."""
+    return inference_executor.stats()
+
+@app.get("/metrics/llm")
+async def get_llm_metrics():
+    """Report slot usage, latency and token counts of the Ollama client, hit rates of the response cache and prompt compaction."""
+    return {**ollama_client.metrics(), "cache": llm_cache.stats(), "compaction": prompt_compactor.stats()}
+
+@app.get("/metrics/extraction")
+async def get_extraction_metrics():
+    """Report how many CVs and job descriptions were extracted by rules alone and which fields needed the LLM."""
+    return rule_extractor.stats()
+
+@app.get("/metrics/index")
+async def get_index_metrics():
+    """Report size and list balance of the candidate ANN index."""
+    return candidate_index.stats()
+
+@app.get("/metrics/matching")
+async def get_matching_metrics():
+    """Report queue sizes and throughput of the background matcher."""
+    return incremental_matcher.stats()
+
+@app.get("/metrics/skills")
+async def get_skill_metrics():
+    """Report size of the skill synonym table."""
+    return skill_synonyms.stats()
+
+@app.get("/skills/synonyms")
+async def get_skill_synonyms(skill: str):
+    """List the vocabulary skills that count as the given skill."""
+    skill_ids = skill_vocabulary.lookup([skill])
+    if len(skill_ids) == 0:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    return {
+        "skill": normalize_skill(skill),
+        "synonyms": skill_vocabulary.names(skill_synonyms.synonyms(skill_ids[0]))
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="localhost", port=8000, reload=True) 
\ No newline at end of file
@@ -0,0 +1,424 @@
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import ANN_INDEX_PATH, ANN_NPROBE, ANN_MIN_TRAIN_SIZE, EMBEDDING_QUANTIZATION
+from src.database.models import Candidate
+from src.database.types import normalize_rows
+from src.embeddings.backends import EmbeddingBackend
+from src.embeddings.embedding_service import embedding_service
+from src.embeddings.quantization import QuantizedMatrix
+from src.matching.candidate_pool import GrowableArray
+
+# Lists are re-clustered once the index has grown this many times past its last training
+_REBUILD_GROWTH = 4
+# k-means settings: sample size per list and number of iterations
+_TRAIN_POINTS_PER_LIST = 64
+_TRAIN_ITERATIONS = 10
+# Rows assigned to centroids at a time, to keep the score matrix small
+_ASSIGN_BLOCK_ROWS = 4096
+# Rows read from the database at a time when catching up
+_CATCH_UP_BATCH = 10000
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Get the nearest (highest cosine) centroid of each vector.
+
+    Args:
+        vectors (np.ndarray): Normalized vectors, one per row
+        centroids (np.ndarray): Normalized centroids, one per row
+
+    Returns:
+        np.ndarray: Centroid index per vector
+    """
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_BLOCK_ROWS):
+        block = vectors[start:start + _ASSIGN_BLOCK_ROWS]
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """
+    Cluster vectors with spherical k-means.
+
+    Args:
+        vectors (np.ndarray): Normalized vectors, one per row
+        nlist (int): Number of clusters
+        seed (int): Random seed for sampling and initialization
+
+    Returns:
+        np.ndarray: Normalized centroids, one per row
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * _TRAIN_POINTS_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(_TRAIN_ITERATIONS):
+        assignments = _assign(sample, centroids)
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=nlist)
+        used = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts[used])[:-1]))
+        centroids[used] = np.add.reduceat(sample[order], starts)
+        # Re-seed empty clusters with random points
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        centroids = normalize_rows(centroids)
+    return centroids.astype(np.float32)
+
+
+class _InvertedList:
+    def __init__(self, mode: str):
+        """
+        Initialize one inverted list: candidate ids and their (quantized) embeddings.
+
+        Args:
+            mode (str): Quantization mode of the stored embeddings
+        """
+        self.mode = mode
+        self.ids = GrowableArray(np.int64)
+        self.codes: Optional[GrowableArray] = None
+        self.scales = GrowableArray(np.float32)
+
+    def __len__(self) -> int:
+        return self.ids.size
+
+    def append(self, ids: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray]):
+        if self.codes is None:
+            self.codes = GrowableArray(codes.dtype, codes.shape[1])
+        self.codes.append(codes)
+        if scales is not None:
+            self.scales.append(scales)
+        self.ids.append(ids)
+
+    def view(self, start: int = 0) -> Tuple[np.ndarray, QuantizedMatrix]:
+        """Get the ids and embeddings from row `start` on."""
+        codes = self.codes.view()[start:] if self.codes is not None else np.empty((0, 0), dtype=np.float32)
+        scales = self.scales.view()[start:] if self.mode == "int8" else None
+        return self.ids.view()[start:], QuantizedMatrix(codes, self.mode, scales)
+
+
+class IVFIndex:
+    def __init__(
+        self,
+        path: Optional[str] = ANN_INDEX_PATH,
+        nprobe: int = ANN_NPROBE,
+        min_train_size: int = ANN_MIN_TRAIN_SIZE,
+        mode: str = EMBEDDING_QUANTIZATION,
+        backend: Optional[EmbeddingBackend] = None
+    ):
+        """
+        Initialize an inverted-file (IVF) index over candidate embeddings.
+
+        Embeddings are clustered with spherical k-means into about 4*sqrt(n)
+        lists; a query scores the centroids and scans only the `nprobe` closest
+        lists. Until `min_train_size` embeddings have been added the index is a
+        single list, i.e. exact search. New embeddings are appended to their
+        nearest list, and the lists are re-clustered in the background once the
+        index has grown enough for them to become unbalanced.
+
+        Args:
+            path (Optional[str]): File the index is saved to and loaded from, None to keep it in memory
+            nprobe (int): Default number of lists scanned per query
+            min_train_size (int): Number of embeddings needed before clustering
+            mode (str): Quantization mode of the stored embeddings
+            backend (Optional[EmbeddingBackend]): Backend producing the embeddings; a saved
+                index of another backend, model or dimension is not loaded
+        """
+        self.path = path
+        self.backend = backend
+        self.nprobe = max(1, nprobe)
+        self.min_train_size = max(1, min_train_size)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[_InvertedList] = [_InvertedList(mode)]
+        self.size = 0
+        self.max_id = 0
+        self.trained_size = 0
+        self.rebuilds = 0
+        self._rebuilding = False
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray):
+        """
+        Add embeddings to their nearest lists.
+
+        Args:
+            ids (Sequence[int]): Candidate id per embedding
+            vectors (np.ndarray): Embeddings, one per row
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        quantized = QuantizedMatrix.from_vectors(normalize_rows(np.asarray(vectors, dtype=np.float32)), self.mode)
+        with self._lock:
+            self._insert(self._lists, self.centroids, ids, quantized.codes, quantized.scales)
+            self.size += len(ids)
+            self.max_id = max(self.max_id, int(ids.max()))
+            start_rebuild = self.needs_rebuild() and not self._rebuilding
+            if start_rebuild:
+                self._rebuilding = True
+        if start_rebuild:
+            threading.Thread(target=self._rebuild_in_background, name="ivf-rebuild", daemon=True).start()
+
+    def add_candidate(self, candidate: Candidate):
+        """
+        Add a newly created candidate.
+
+        Args:
+            candidate (Candidate): Committed candidate
+        """
+        if candidate.embedding is not None and len(candidate.embedding):
+            self.add([candidate.id], np.asarray(candidate.embedding, dtype=np.float32)[None, :])
+
+    def search(self, query: Sequence[float], top_k: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the candidates whose embeddings are most similar to a query.
+
+        Args:
+            query (Sequence[float]): Query embedding
+            top_k (int): Number of candidates to return
+            nprobe (Optional[int]): Number of lists to scan, the index default when None
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Candidate ids and cosine similarities, best first
+        """
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = query / norm
+
+        with self._lock:
+            centroids, lists = self.centroids, self._lists
+            if centroids is None:
+                probed = [0]
+            else:
+                nprobe = min(len(lists), nprobe or self.nprobe)
+                centroid_scores = centroids @ query
+                probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            views = [lists[i].view() for i in probed if len(lists[i])]
+        if not views:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        ids = np.concatenate([list_ids for list_ids, _ in views])
+        scores = np.concatenate([matrix.scores(query) for _, matrix in views])
+        top_k = min(top_k, len(ids))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return ids[best], scores[best]
+
+    def needs_rebuild(self) -> bool:
+        """Whether the lists should be (re-)clustered."""
+        if self.size < self.min_train_size:
+            return False
+        return self.centroids is None or self.size >= _REBUILD_GROWTH * self.trained_size
+
+    def rebuild(self):
+        """
+        Cluster all stored embeddings and redistribute them over new lists.
+
+        Embeddings added while clustering runs are moved to the new lists too.
+        """
+        with self._lock:
+            old_lists = self._lists
+            snapshot_sizes = [len(inverted_list) for inverted_list in old_lists]
+            ids, codes, scales = self._concatenate([inverted_list.view() for inverted_list in old_lists])
+
+        if len(ids) == 0:
+            return
+        vectors = normalize_rows(QuantizedMatrix(codes, self.mode, scales).dequantize())
+        nlist = max(1, min(len(ids), int(4 * math.sqrt(len(ids)))))
+        centroids = train_centroids(vectors, nlist)
+        lists = [_InvertedList(self.mode) for _ in range(nlist)]
+        self._insert(lists, centroids, ids, codes, scales, assignments=_assign(vectors, centroids))
+
+        with self._lock:
+            late = self._concatenate([
+                inverted_list.view(start) for inverted_list, start in zip(old_lists, snapshot_sizes)
+            ])
+            self._insert(lists, centroids, *late)
+            self.centroids = centroids
+            self._lists = lists
+            self.trained_size = self.size
+            self.rebuilds += 1
+        print(f"Rebuilt candidate index: {self.size} embeddings in {nlist} lists")
+
+    def save(self):
+        """Write the index to its file, replacing any previous version atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            lists = self._lists
+            ids, codes, scales = self._concatenate([inverted_list.view() for inverted_list in lists])
+            offsets = np.cumsum([0] + [len(inverted_list) for inverted_list in lists])
+            state = {
+                "mode": np.array(self.mode),
+                "backend": np.array(self.backend.name if self.backend is not None else ""),
+                "model": np.array(self.backend.model_name if self.backend is not None else ""),
+                "dimension": np.array(codes.shape[1] if codes.ndim == 2 else 0),
+                "centroids": self.centroids if self.centroids is not None else np.empty((0, 0), dtype=np.float32),
+                "ids": ids,
+                "codes": codes,
+                "scales": scales if scales is not None else np.empty(0, dtype=np.float32),
+                "offsets": offsets,
+                "max_id": np.array(self.max_id),
+                "trained_size": np.array(self.trained_size)
+            }
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez(f, **state)
+        os.replace(temporary, self.path)
+
+    def load(self) -> bool:
+        """
+        Load the index from its file.
+
+        Returns:
+            bool: True if a compatible index was loaded
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with np.load(self.path) as state:
+                if str(state["mode"]) != self.mode:
+                    print(f"Ignoring candidate index {self.path}: stored as {state['mode']}, configured {self.mode}")
+                    return False
+                if self.backend is not None and not self._same_embeddings(state):
+                    return False
+                centroids = state["centroids"]
+                ids, codes, scales, offsets = state["ids"], state["codes"], state["scales"], state["offsets"]
+                lists = [_InvertedList(self.mode) for _ in range(max(1, len(offsets) - 1))]
+                for inverted_list, start, end in zip(lists, offsets[:-1], offsets[1:]):
+                    if end > start:
+                        inverted_list.append(
+                            ids[start:end], codes[start:end], scales[start:end] if self.mode == "int8" else None
+                        )
+                with self._lock:
+                    self.centroids = centroids if centroids.size else None
+                    self._lists = lists
+                    self.size = len(ids)
+                    self.max_id = int(state["max_id"])
+                    self.trained_size = int(state["trained_size"])
+            return True
+        except Exception as e:
+            print(f"Error loading candidate index: {str(e)}")
+            return False
+
+    def _same_embeddings(self, state: Any) -> bool:
+        """Check that a saved index holds embeddings of the configured backend, model and dimension."""
+        if "backend" not in state.files:
+            print(f"Ignoring candidate index {self.path}: saved without its embedding model")
+            return False
+        stored = (str(state["backend"]), str(state["model"]))
+        if stored != (self.backend.name, self.backend.model_name):
+            print(f"Ignoring candidate index {self.path}: built with {stored[0]}/{stored[1]}, "
+                  f"configured {self.backend.name}/{self.backend.model_name}")
+            return False
+        dimension = int(state["dimension"])
+        # An index saved empty has no dimension to compare
+        if dimension and dimension != self.backend.dimension:
+            print(f"Ignoring candidate index {self.path}: {dimension}-dimensional embeddings, "
+                  f"configured {self.backend.dimension}")
+            return False
+        return True
+
+    async def catch_up(self, session: AsyncSession):
+        """
+        Add candidates stored in the database after the index was last saved.
+
+        Args:
+            session (AsyncSession): Database session
+        """
+        result = await session.stream(
+            select(Candidate.id, Candidate.embedding)
+            .where(Candidate.id > self.max_id)
+            .order_by(Candidate.id)
+            .execution_options(yield_per=_CATCH_UP_BATCH)
+        )
+        async for rows in result.partitions():
+            rows = [(candidate_id, embedding) for candidate_id, embedding in rows if embedding is not None and len(embedding)]
+            if rows:
+                self.add([row[0] for row in rows], np.stack([np.asarray(row[1], dtype=np.float32) for row in rows]))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index counters.
+
+        Returns:
+            Dict[str, Any]: Size, list count and balance, rebuilds
+        """
+        with self._lock:
+            sizes = [len(inverted_list) for inverted_list in self._lists]
+        return {
+            "size": self.size,
+            "trained": self.centroids is not None,
+            "lists": len(sizes),
+            "largest_list": max(sizes),
+            "nprobe": self.nprobe,
+            "mode": self.mode,
+            "rebuilds": self.rebuilds
+        }
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+            self.save()
+        except Exception as e:
+            print(f"Error rebuilding candidate index: {str(e)}")
+        finally:
+            self._rebuilding = False
+
+    def _insert(
+        self,
+        lists: List[_InvertedList],
+        centroids: Optional[np.ndarray],
+        ids: np.ndarray,
+        codes: np.ndarray,
+        scales: Optional[np.ndarray],
+        assignments: Optional[np.ndarray] = None
+    ):
+        """Append embeddings to the lists of their nearest centroids."""
+        if len(ids) == 0:
+            return
+        if centroids is None:
+            lists[0].append(ids, codes, scales)
+            return
+        if assignments is None:
+            vectors = normalize_rows(QuantizedMatrix(codes, self.mode, scales).dequantize())
+            assignments = _assign(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(lists) + 1))
+        for list_number in np.flatnonzero(np.diff(bounds)):
+            rows = order[bounds[list_number]:bounds[list_number + 1]]
+            lists[list_number].append(ids[rows], codes[rows], scales[rows] if scales is not None else None)
+
+    def _concatenate(self, views: List[Tuple[np.ndarray, QuantizedMatrix]]):
+        """Join list views into (ids, codes, scales) arrays."""
+        views = [(ids, matrix) for ids, matrix in views if len(ids)]
+        if not views:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32), None
+        ids = np.concatenate([ids for ids, _ in views])
+        codes = np.concatenate([matrix.codes for _, matrix in views])
+        scales = np.concatenate([matrix.scales for _, matrix in views]) if self.mode == "int8" else None
+        return ids, codes, scales
+
+
+# Process-wide candidate index, loaded on startup
+candidate_index = IVFIndex(backend=embedding_service.backend)
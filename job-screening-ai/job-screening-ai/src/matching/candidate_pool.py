@@ -0,0 +1,289 @@
+import asyncio
+import threading
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import EMBEDDING_QUANTIZATION
+from src.database.models import Candidate
+from src.database.types import normalize_rows
+from src.embeddings.quantization import QuantizedMatrix
+from src.matching.skill_index import SkillIndex
+
+# (candidate id, embedding, skill ids, experience embeddings)
+CandidateRow = Tuple[int, Sequence[float], Optional[np.ndarray], Optional[Any]]
+
+
+class GrowableArray:
+    def __init__(self, dtype, width: Optional[int] = None):
+        """
+        Initialize an append-only array that grows by doubling its capacity.
+
+        Views returned by `view` stay valid after later appends, so readers can
+        work on a snapshot while new rows are added.
+
+        Args:
+            dtype: Element type
+            width (Optional[int]): Number of columns for a 2-D array, None for 1-D
+        """
+        self.dtype = dtype
+        self.width = width
+        self.size = 0
+        self._data: Optional[np.ndarray] = None
+
+    def append(self, values: np.ndarray):
+        values = np.asarray(values, dtype=self.dtype)
+        if self._data is None:
+            shape = (max(16, len(values)),) + values.shape[1:]
+            self._data = np.empty(shape, dtype=self.dtype)
+        end = self.size + len(values)
+        if end > len(self._data):
+            grown = np.empty((max(end, 2 * len(self._data)),) + self._data.shape[1:], dtype=self.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+        self._data[self.size:end] = values
+        self.size = end
+
+    def view(self) -> np.ndarray:
+        if self._data is None:
+            shape = (0,) if self.width is None else (0, self.width)
+            return np.empty(shape, dtype=self.dtype)
+        return self._data[:self.size]
+
+
+class PoolSnapshot(NamedTuple):
+    """Consistent read-only view of the pool at one point in time."""
+    ids: np.ndarray
+    embeddings: QuantizedMatrix
+    skill_ids: np.ndarray
+    skill_rows: np.ndarray
+    experience: QuantizedMatrix
+    experience_rows: np.ndarray
+
+
+class CandidatePool:
+    def __init__(self, mode: str = EMBEDDING_QUANTIZATION):
+        """
+        Initialize the in-memory candidate pool used for ranking.
+
+        The pool keeps every candidate's embedding as one matrix, their skills
+        as (vocabulary id, row) pairs and their experience
+        embeddings as a second matrix with the owning row of each entry. It is
+        loaded from the database once and then kept up to date as candidates
+        are created, together with an inverted skill index used to prefilter
+        candidates before scoring.
+
+        Args:
+            mode (str): Quantization mode of the embedding matrices
+        """
+        self.mode = mode
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._pending: Optional[List[CandidateRow]] = None
+
+        self._ids = GrowableArray(np.int64)
+        self._codes: Optional[GrowableArray] = None
+        self._scales = GrowableArray(np.float32)
+        self._skill_ids = GrowableArray(np.uint32)
+        self._skill_rows = GrowableArray(np.int32)
+        self._experience_codes: Optional[GrowableArray] = None
+        self._experience_scales = GrowableArray(np.float32)
+        self._experience_rows = GrowableArray(np.int32)
+        self._ids_sorted = True
+        self.skill_index = SkillIndex()
+
+    def __len__(self) -> int:
+        return self._ids.size
+
+    async def ensure_loaded(self, session: AsyncSession):
+        """
+        Load all candidates from the database on first use.
+
+        Candidates created while the load is running are merged in afterwards.
+
+        Args:
+            session (AsyncSession): Database session
+        """
+        if self.loaded:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self.loaded:
+                return
+            with self._lock:
+                self._pending = []
+            try:
+                result = await session.execute(
+                    select(
+                        Candidate.id,
+                        Candidate.embedding,
+                        Candidate.skill_ids,
+                        Candidate.experience_embeddings
+                    ).order_by(Candidate.id)
+                )
+                rows = [tuple(row) for row in result]
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                known = {row[0] for row in rows}
+                self._extend(rows + [row for row in self._pending if row[0] not in known])
+                self._pending = None
+                self.loaded = True
+
+    def add(self, candidate: Candidate):
+        """
+        Add a newly created candidate.
+
+        Does nothing before the pool is loaded, since the load will read it.
+
+        Args:
+            candidate (Candidate): Committed candidate
+        """
+        row = (candidate.id, candidate.embedding, candidate.skill_ids, candidate.experience_embeddings)
+        with self._lock:
+            if self.loaded:
+                self._extend([row])
+            elif self._pending is not None:
+                self._pending.append(row)
+
+    def add_rows(self, rows: List[CandidateRow]):
+        """
+        Append candidates given as (id, embedding, skill ids, experience embeddings) tuples.
+
+        Args:
+            rows (List[CandidateRow]): Candidates to append
+        """
+        with self._lock:
+            self._extend(rows)
+
+    def snapshot(self) -> PoolSnapshot:
+        """
+        Get a consistent view of the pool for ranking.
+
+        Returns:
+            PoolSnapshot: Arrays of every candidate added so far
+        """
+        with self._lock:
+            scales = self._scales.view() if self.mode == "int8" else None
+            experience_scales = self._experience_scales.view() if self.mode == "int8" else None
+            return PoolSnapshot(
+                ids=self._ids.view(),
+                embeddings=QuantizedMatrix(self._view(self._codes), self.mode, scales),
+                skill_ids=self._skill_ids.view(),
+                skill_rows=self._skill_rows.view(),
+                experience=QuantizedMatrix(self._view(self._experience_codes), self.mode, experience_scales),
+                experience_rows=self._experience_rows.view()
+            )
+
+    def rows_with_skills(
+        self,
+        snapshot: PoolSnapshot,
+        skill_ids: Sequence[int],
+        min_skills: int,
+        skill_groups: Optional[Sequence[Sequence[int]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the snapshot rows of the candidates that have at least `min_skills` of the skills.
+
+        Only the posting lists of the skills are read; no embedding is touched.
+
+        Args:
+            snapshot (PoolSnapshot): View the rows refer to
+            skill_ids (Sequence[int]): Skill vocabulary ids
+            min_skills (int): Minimum number of the skills (1 for any, len(skill_ids) for all)
+            skill_groups (Optional[Sequence[Sequence[int]]]): Ids accepted for each skill (the
+                skill and its synonyms); only the skill itself when None
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Ascending rows and how many of the skills each candidate has
+        """
+        if skill_groups is None:
+            candidate_ids, counts = self.skill_index.at_least(skill_ids, min_skills)
+        else:
+            candidate_ids, counts = self.skill_index.at_least_groups(skill_groups, min_skills)
+        ids = snapshot.ids
+        order = None if self._ids_sorted else np.argsort(ids, kind='stable')
+        sorted_ids = ids if order is None else ids[order]
+        positions = np.searchsorted(sorted_ids, candidate_ids)
+        # Candidates added after the snapshot was taken are not in it
+        found = positions < len(sorted_ids)
+        found[found] = sorted_ids[positions[found]] == candidate_ids[found]
+        rows = positions[found] if order is None else order[positions[found]]
+        counts = counts[found]
+        if order is not None:
+            by_row = np.argsort(rows, kind='stable')
+            rows, counts = rows[by_row], counts[by_row]
+        return rows, counts
+
+    def _view(self, codes: Optional[GrowableArray]) -> np.ndarray:
+        return codes.view() if codes is not None else np.empty((0, 0), dtype=np.float32)
+
+    def _extend(self, rows: List[CandidateRow]):
+        """Append candidates to the arrays; the caller holds the lock."""
+        rows = [row for row in rows if row[1] is not None and len(row[1])]
+        if not rows:
+            return
+        first = len(self)
+
+        embeddings = QuantizedMatrix.from_vectors(
+            normalize_rows(np.stack([np.asarray(row[1], dtype=np.float32) for row in rows])),
+            self.mode
+        )
+        if self._codes is None:
+            self._codes = GrowableArray(embeddings.codes.dtype, embeddings.codes.shape[1])
+
+        ids = np.asarray([row[0] for row in rows], dtype=np.int64)
+        skill_ids = [np.asarray(row[2] if row[2] is not None else [], dtype=np.uint32) for row in rows]
+        skill_counts = [len(candidate_skill_ids) for candidate_skill_ids in skill_ids]
+        all_skill_ids = np.concatenate(skill_ids)
+        self._skill_ids.append(all_skill_ids)
+        self._skill_rows.append(np.repeat(np.arange(first, first + len(rows), dtype=np.int32), skill_counts))
+        self.skill_index.add(np.repeat(ids, skill_counts), all_skill_ids)
+
+        experience, experience_rows = [], []
+        for offset, (_, _, _, experience_embeddings) in enumerate(rows):
+            row = first + offset
+            entries = self._present(experience_embeddings)
+            if len(entries):
+                experience.append(entries)
+                experience_rows.append(np.full(len(entries), row, dtype=np.int32))
+
+        if experience:
+            entries = QuantizedMatrix.from_vectors(normalize_rows(np.concatenate(experience)), self.mode)
+            if self._experience_codes is None:
+                self._experience_codes = GrowableArray(entries.codes.dtype, entries.codes.shape[1])
+            self._experience_codes.append(entries.codes)
+            if entries.scales is not None:
+                self._experience_scales.append(entries.scales)
+            self._experience_rows.append(np.concatenate(experience_rows))
+
+        self._codes.append(embeddings.codes)
+        if embeddings.scales is not None:
+            self._scales.append(embeddings.scales)
+        if (first and ids[0] <= self._ids.view()[-1]) or np.any(np.diff(ids) <= 0):
+            self._ids_sorted = False
+        self._ids.append(ids)
+
+    @staticmethod
+    def _present(experience_embeddings: Optional[Any]) -> np.ndarray:
+        """Get the experience embeddings that exist (not None or NaN rows) as a matrix."""
+        if experience_embeddings is None or len(experience_embeddings) == 0:
+            return np.empty((0, 0), dtype=np.float32)
+        if isinstance(experience_embeddings, np.ndarray) and experience_embeddings.ndim == 2:
+            matrix = experience_embeddings.astype(np.float32, copy=False)
+        else:
+            vectors = [vector for vector in experience_embeddings if vector is not None and len(vector)]
+            if not vectors:
+                return np.empty((0, 0), dtype=np.float32)
+            matrix = np.asarray(vectors, dtype=np.float32)
+        return matrix[~np.isnan(matrix).any(axis=1)]
+
+
+# Process-wide candidate pool shared by the ranking endpoints
+candidate_pool = CandidatePool()
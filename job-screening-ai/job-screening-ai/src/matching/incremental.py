@@ -0,0 +1,285 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.matcher import MatcherAgent
+from src.batch_match import JobBlock, load_by_ids, stream_candidates
+from src.config import MATCH_THRESHOLD, MATCH_COALESCE_MS, BATCH_JOB_BLOCK, BATCH_CANDIDATE_BLOCK
+from src.database.db_manager import DatabaseManager, async_session
+from src.database.models import Job, Candidate
+from src.inference import inference_executor
+
+
+class IncrementalMatcher:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        threshold: float = MATCH_THRESHOLD,
+        coalesce_ms: float = MATCH_COALESCE_MS,
+        job_block: int = BATCH_JOB_BLOCK,
+        candidate_block: int = BATCH_CANDIDATE_BLOCK,
+        matcher: Optional[MatcherAgent] = None,
+        max_retries: int = 3
+    ):
+        """
+        Initialize the background matcher of newly created jobs and candidates.
+
+        New jobs are scored against every candidate and new candidates against
+        every job, and pairs scoring at least `threshold` are stored as pending
+        matches. Creations are only recorded as ids: after the first one the
+        matcher waits `coalesce_ms` for more, then scores everything that
+        arrived in one pass, so a burst of uploads costs one scan of the jobs
+        rather than one per upload, and an id recorded twice is scored once.
+        If a pass fails (a locked database, say), its ids are queued again and
+        retried with the next pass, up to `max_retries` times in a row.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Factory of database sessions
+            threshold (float): Minimum match score (0-100) of a stored match
+            coalesce_ms (float): Time to collect creations before scoring them
+            job_block (int): Jobs scored together
+            candidate_block (int): Candidates read and scored together
+            matcher (Optional[MatcherAgent]): Matcher providing weights and final scores
+            max_retries (int): Consecutive failed passes retried before their ids are dropped
+        """
+        self.session_factory = session_factory
+        self.threshold = threshold
+        self.coalesce_ms = coalesce_ms
+        self.job_block = max(1, job_block)
+        self.candidate_block = max(1, candidate_block)
+        self.matcher = matcher or MatcherAgent()
+        self.max_retries = max(0, max_retries)
+
+        self._pending_jobs: Set[int] = set()
+        self._pending_candidates: Set[int] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._failures = 0
+
+        self.batches = 0
+        self.jobs_matched = 0
+        self.candidates_matched = 0
+        self.pairs_scored = 0
+        self.matches_stored = 0
+        self.errors = 0
+        self.retries = 0
+        self.dropped = 0
+        self.last_batch_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        """Start the background task on the running event loop."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Score the work that is still pending, then stop the background task."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+    def job_created(self, job: Job):
+        """
+        Queue a newly created job. Does nothing while the matcher is stopped.
+
+        Args:
+            job (Job): Committed job
+        """
+        if self._task is not None:
+            self._pending_jobs.add(job.id)
+            self._wake.set()
+
+    def candidate_created(self, candidate: Candidate):
+        """
+        Queue a newly created candidate. Does nothing while the matcher is stopped.
+
+        Args:
+            candidate (Candidate): Committed candidate
+        """
+        if self._task is not None:
+            self._pending_candidates.add(candidate.id)
+            self._wake.set()
+
+    async def process(self, job_ids: Set[int], candidate_ids: Set[int]) -> Dict[str, int]:
+        """
+        Score new jobs and candidates and store the pairs above the threshold.
+
+        A pair of a new job and a new candidate is scored once, by the job pass.
+
+        Args:
+            job_ids (Set[int]): New jobs, scored against every candidate
+            candidate_ids (Set[int]): New candidates, scored against every other job
+
+        Returns:
+            Dict[str, int]: Number of pairs scored and matches stored
+        """
+        start = time.perf_counter()
+        async with self.session_factory() as session:
+            pairs: Set[Tuple[int, int]] = set()
+            scored = 0
+            if job_ids:
+                scored += await self._match_jobs(session, sorted(job_ids), pairs)
+            if candidate_ids:
+                scored += await self._match_candidates(session, sorted(candidate_ids), job_ids, pairs)
+            matches = await self._final_scores(session, pairs)
+            stored = await DatabaseManager.upsert_matches(session, matches)
+
+        self.batches += 1
+        self.jobs_matched += len(job_ids)
+        self.candidates_matched += len(candidate_ids)
+        self.pairs_scored += scored
+        self.matches_stored += stored
+        self.last_batch_seconds = round(time.perf_counter() - start, 3)
+        return {"pairs_scored": scored, "stored": stored}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get background matching counters.
+
+        Returns:
+            Dict[str, Any]: Queue sizes, batches and pairs scored and stored
+        """
+        return {
+            "running": self.running,
+            "threshold": self.threshold,
+            "pending_jobs": len(self._pending_jobs),
+            "pending_candidates": len(self._pending_candidates),
+            "batches": self.batches,
+            "jobs_matched": self.jobs_matched,
+            "candidates_matched": self.candidates_matched,
+            "pairs_scored": self.pairs_scored,
+            "matches_stored": self.matches_stored,
+            "errors": self.errors,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "last_batch_seconds": self.last_batch_seconds
+        }
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            if not self._closing:
+                # Let a burst of creations accumulate into one batch
+                await asyncio.sleep(self.coalesce_ms / 1000)
+            self._wake.clear()
+            job_ids, self._pending_jobs = self._pending_jobs, set()
+            candidate_ids, self._pending_candidates = self._pending_candidates, set()
+            if job_ids or candidate_ids:
+                try:
+                    await self.process(job_ids, candidate_ids)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error matching new jobs and candidates: {str(e)}")
+                    self._retry(job_ids, candidate_ids)
+                else:
+                    self._failures = 0
+            if self._closing and not (self._pending_jobs or self._pending_candidates):
+                break
+
+    def _retry(self, job_ids: Set[int], candidate_ids: Set[int]):
+        """Queue the ids of a failed pass again, or drop them after max_retries failures in a row."""
+        if self._failures >= self.max_retries:
+            self._failures = 0
+            self.dropped += len(job_ids) + len(candidate_ids)
+            print(f"Dropping {len(job_ids)} jobs and {len(candidate_ids)} candidates after "
+                  f"{self.max_retries + 1} failed matching passes")
+            return
+        self._failures += 1
+        self.retries += 1
+        self._pending_jobs |= job_ids
+        self._pending_candidates |= candidate_ids
+        self._wake.set()
+
+    async def _match_jobs(self, session: AsyncSession, job_ids: List[int], pairs: Set[Tuple[int, int]]) -> int:
+        """Score new jobs against every candidate, adding the pairs above the threshold."""
+        scored = 0
+        for chunk_start in range(0, len(job_ids), self.job_block):
+            jobs = list((await load_by_ids(session, Job, job_ids[chunk_start:chunk_start + self.job_block])).values())
+            if not jobs:
+                continue
+            block = JobBlock(jobs, self.matcher.WEIGHTS)
+            async for candidates in stream_candidates(session, self.candidate_block):
+                scores = await inference_executor.run_cpu(block.score, candidates)
+                self._collect(pairs, block.ids, [row[0] for row in candidates], scores)
+                scored += scores.size
+            session.expunge_all()
+        return scored
+
+    async def _match_candidates(
+        self,
+        session: AsyncSession,
+        candidate_ids: List[int],
+        skip_job_ids: Set[int],
+        pairs: Set[Tuple[int, int]]
+    ) -> int:
+        """Score new candidates against every job not in skip_job_ids, adding the pairs above the threshold."""
+        scored = 0
+        for chunk_start in range(0, len(candidate_ids), self.candidate_block):
+            chunk = candidate_ids[chunk_start:chunk_start + self.candidate_block]
+            candidates = [
+                (candidate.id, candidate.embedding, candidate.skill_ids, candidate.experience_embeddings)
+                for candidate in (await load_by_ids(session, Candidate, chunk)).values()
+                if candidate.embedding is not None and len(candidate.embedding)
+            ]
+            session.expunge_all()
+            if not candidates:
+                continue
+
+            last_job_id = 0
+            while True:
+                result = await session.execute(
+                    select(Job).where(Job.id > last_job_id).order_by(Job.id).limit(self.job_block)
+                )
+                jobs = result.scalars().all()
+                if not jobs:
+                    break
+                last_job_id = jobs[-1].id
+                jobs = [job for job in jobs if job.id not in skip_job_ids]
+                if jobs:
+                    block = JobBlock(jobs, self.matcher.WEIGHTS)
+                    scores = await inference_executor.run_cpu(block.score, candidates)
+                    self._collect(pairs, block.ids, [row[0] for row in candidates], scores)
+                    scored += scores.size
+                session.expunge_all()
+        return scored
+
+    def _collect(self, pairs: Set[Tuple[int, int]], job_ids: np.ndarray, candidate_ids: List[int], scores: np.ndarray):
+        """Add the (job id, candidate id) pairs of a score block that reach the threshold."""
+        rows, columns = np.nonzero(scores * 100 >= self.threshold)
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        pairs.update(zip(job_ids[rows].tolist(), candidate_ids[columns].tolist()))
+
+    async def _final_scores(self, session: AsyncSession, pairs: Set[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Score the selected pairs with the reference implementation, as /match-candidate does."""
+        if not pairs:
+            return []
+        jobs = await load_by_ids(session, Job, {job_id for job_id, _ in pairs})
+        candidates = await load_by_ids(session, Candidate, {candidate_id for _, candidate_id in pairs})
+        session.expunge_all()
+
+        def score() -> List[Dict[str, Any]]:
+            matches = [
+                self.matcher.build_match(jobs[job_id], candidates[candidate_id])
+                for job_id, candidate_id in sorted(pairs)
+                if job_id in jobs and candidate_id in candidates
+            ]
+            return [match for match in matches if match["match_score"] >= self.threshold]
+
+        return await inference_executor.run_cpu(score)
+
+
+# Process-wide background matcher fed by the job and candidate listeners
+incremental_matcher = IncrementalMatcher()
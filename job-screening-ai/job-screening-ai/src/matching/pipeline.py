@@ -0,0 +1,139 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.matcher import MatcherAgent
+from src.batch_match import load_by_ids
+from src.config import RETRIEVAL_TOP_N
+from src.database.models import Job, Candidate
+from src.inference import inference_executor
+from src.matching.candidate_pool import CandidatePool
+
+
+class MatchPipeline:
+    def __init__(self, matcher: Optional[MatcherAgent] = None, retrieve_n: int = RETRIEVAL_TOP_N):
+        """
+        Initialize the two-stage matching pipeline.
+
+        The retrieval stage scores the whole candidate pool on embedding
+        similarity and skill match only, which are one matrix-vector product
+        and one pass over skill ids, and keeps the best `retrieve_n`. The rerank
+        stage loads just those candidates and runs the full
+        calculate_match_score on each, including the per-entry experience
+        comparison and the detailed match_details.
+
+        Args:
+            matcher (Optional[MatcherAgent]): Matcher used by both stages
+            retrieve_n (int): Default number of candidates passed from retrieval to reranking
+        """
+        self.matcher = matcher or MatcherAgent()
+        self.retrieve_n = retrieve_n
+
+    def retrieve(
+        self,
+        job_data: Dict[str, Any],
+        pool: CandidatePool,
+        retrieve_n: Optional[int] = None,
+        min_skills: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the retrieval stage.
+
+        Args:
+            job_data (Dict[str, Any]): Structured job data
+            pool (CandidatePool): Candidates to retrieve from
+            retrieve_n (Optional[int]): Number of candidates to keep, the pipeline default when None
+            min_skills (int): Minimum number of job skills a candidate needs (0 to consider everyone)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Kept candidate ids and their partial scores, best first
+        """
+        return self.matcher.retrieve_candidates(
+            job_data,
+            pool,
+            self.retrieve_n if retrieve_n is None else retrieve_n,
+            min_skills
+        )
+
+    def rerank(self, job_data: Dict[str, Any], candidates: Sequence[Dict[str, Any]], top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Run the rerank stage: full scoring of the retrieved candidates.
+
+        Args:
+            job_data (Dict[str, Any]): Structured job data
+            candidates (Sequence[Dict[str, Any]]): Structured data of the retrieved candidates
+            top_k (int): Number of candidates to return
+
+        Returns:
+            List[Dict[str, Any]]: Best candidates by descending match score, with match details
+        """
+        ranking = []
+        for cv_data in candidates:
+            match_score, match_details = self.matcher.calculate_match_score(job_data, cv_data)
+            ranking.append({
+                'candidate_id': cv_data['id'],
+                'match_score': match_score,
+                'match_details': match_details
+            })
+        ranking.sort(key=lambda item: item['match_score'], reverse=True)
+        return ranking[:max(0, top_k)]
+
+    async def run(
+        self,
+        session: AsyncSession,
+        job: Job,
+        pool: CandidatePool,
+        top_k: int = 10,
+        retrieve_n: Optional[int] = None,
+        min_skills: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Match a job against the pool with both stages.
+
+        Args:
+            session (AsyncSession): Database session used to load the retrieved candidates
+            job (Job): Stored job
+            pool (CandidatePool): Loaded candidate pool
+            top_k (int): Number of candidates to return
+            retrieve_n (Optional[int]): Number of candidates passed to reranking, the pipeline default when None
+            min_skills (int): Minimum number of job skills a candidate needs (0 to consider everyone)
+
+        Returns:
+            Dict[str, Any]: Latency and candidate counts of each stage, and the final ranking
+        """
+        start = time.perf_counter()
+        candidates_in = len(pool)
+        ids, _ = await inference_executor.run_cpu(self.retrieve, job.__dict__, pool, retrieve_n, min_skills)
+        retrieved = time.perf_counter()
+
+        loaded = await load_by_ids(session, Candidate, ids.tolist())
+        candidates = [loaded[int(candidate_id)].__dict__ for candidate_id in ids if int(candidate_id) in loaded]
+        load_done = time.perf_counter()
+        ranking = await inference_executor.run_cpu(self.rerank, job.__dict__, candidates, top_k)
+        done = time.perf_counter()
+
+        return {
+            "stages": [
+                {
+                    "stage": "retrieve",
+                    "candidates_in": candidates_in,
+                    "candidates_out": len(ids),
+                    "ms": round((retrieved - start) * 1000, 2)
+                },
+                {
+                    "stage": "rerank",
+                    "candidates_in": len(candidates),
+                    "candidates_out": len(ranking),
+                    "load_ms": round((load_done - retrieved) * 1000, 2),
+                    "ms": round((done - retrieved) * 1000, 2)
+                }
+            ],
+            "total_ms": round((done - start) * 1000, 2),
+            "ranking": ranking
+        }
+
+
+# Process-wide pipeline used by the matching endpoint
+match_pipeline = MatchPipeline()
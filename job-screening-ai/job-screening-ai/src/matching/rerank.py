@@ -0,0 +1,167 @@
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sqlalchemy import Select, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.agents.matcher import MatcherAgent, COMPONENTS, normalize_weights, scoring_key, weights_key
+from src.database.models import Match
+
+# Component score column of each weight
+_COMPONENT_COLUMNS = {
+    'embedding': Match.embedding_score,
+    'skills': Match.skill_score,
+    'experience': Match.experience_score
+}
+
+
+def ranks_within_jobs(job_ids: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Rank matches by descending score within each job.
+
+    Args:
+        job_ids (np.ndarray): Job of each match
+        scores (np.ndarray): Score of each match
+
+    Returns:
+        np.ndarray: 0-based rank of each match among the matches of its job
+    """
+    order = np.lexsort((-scores, job_ids))
+    sorted_jobs = job_ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_jobs[1:] != sorted_jobs[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - group_start
+    return ranks
+
+
+async def _fetch_matrix(session: AsyncSession, query: Select) -> np.ndarray:
+    """
+    Run a query of numeric columns on the DBAPI cursor and return the rows as a float64 matrix.
+
+    Building a result Row per match costs several times more than the query
+    itself at a million matches, so rows are read as plain tuples.
+    """
+    def fetch(sync_session) -> list:
+        connection = sync_session.connection()
+        compiled = query.compile(dialect=connection.dialect)
+        params = compiled.construct_params()
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(str(compiled), [params[name] for name in compiled.positiontup or []])
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    rows = await session.run_sync(fetch)
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(query.selected_columns))
+
+
+async def preview_weights(
+    session: AsyncSession,
+    weights: Dict[str, float],
+    job_id: Optional[int] = None,
+    top_k: int = 10
+) -> Dict[str, Any]:
+    """
+    Compute what the stored matches would score and how they would rank under other weights.
+
+    Nothing is written: the component scores are read once and re-weighted in
+    one matrix-vector product.
+
+    Args:
+        session (AsyncSession): Database session
+        weights (Dict[str, float]): Weight of each component
+        job_id (Optional[int]): Restrict to the matches of one job and return its new ranking
+        top_k (int): Number of matches in the returned ranking
+
+    Returns:
+        Dict[str, Any]: Normalized weights, rank and score changes, and the job's new top matches
+    """
+    start = time.perf_counter()
+    weights = normalize_weights(weights)
+    query = select(
+        Match.id, Match.job_id, Match.candidate_id, Match.match_score,
+        *[_COMPONENT_COLUMNS[name] for name in COMPONENTS]
+    ).where(Match.embedding_score.is_not(None))
+    if job_id is not None:
+        query = query.where(Match.job_id == job_id)
+    table = await _fetch_matrix(session, query)
+    ids = table[:, 0].astype(np.int64)
+    job_ids = table[:, 1].astype(np.int64)
+    candidate_ids = table[:, 2].astype(np.int64)
+    old_scores = table[:, 3]
+    new_scores = table[:, 4:] @ np.array([weights[name] for name in COMPONENTS])
+
+    old_ranks = ranks_within_jobs(job_ids, old_scores)
+    new_ranks = ranks_within_jobs(job_ids, new_scores)
+    # Top matches are listed in job order on both sides, so they line up per job
+    old_top = candidate_ids[old_ranks == 0][np.argsort(job_ids[old_ranks == 0], kind='stable')]
+    new_top = candidate_ids[new_ranks == 0][np.argsort(job_ids[new_ranks == 0], kind='stable')]
+
+    summary = {
+        "weights": weights,
+        "weights_key": weights_key(weights),
+        "matches": len(ids),
+        "jobs": len(old_top),
+        "rank_changes": int(np.count_nonzero(old_ranks != new_ranks)),
+        "top_match_changes": int(np.count_nonzero(old_top != new_top)),
+        "mean_score_change": float(np.abs(new_scores - old_scores).mean()) if len(ids) else 0.0
+    }
+    if job_id is not None:
+        best = np.argsort(new_ranks, kind='stable')[:max(0, top_k)]
+        summary["ranking"] = [
+            {
+                "match_id": int(ids[row]),
+                "candidate_id": int(candidate_ids[row]),
+                "match_score": float(new_scores[row]),
+                "previous_score": float(old_scores[row]),
+                "previous_rank": int(old_ranks[row]) + 1
+            }
+            for row in best
+        ]
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+async def apply_weights(session: AsyncSession, weights: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Re-score every stored match under new weights with a single UPDATE and use them from now on.
+
+    Match scores, the overall score in match_details and the weights key are
+    rewritten from the stored component scores, so the matches stay valid
+    score memos for the new weights. Matches scored under another skill
+    synonym threshold or embedding model are left stale, to be re-scored.
+
+    Args:
+        session (AsyncSession): Database session
+        weights (Dict[str, float]): Weight of each component
+
+    Returns:
+        Dict[str, Any]: Normalized weights and number of updated matches
+    """
+    start = time.perf_counter()
+    weights = normalize_weights(weights)
+    score = sum(_COMPONENT_COLUMNS[name] * weights[name] for name in COMPONENTS)
+    result = await session.execute(
+        update(Match)
+        .where(
+            Match.embedding_score.is_not(None),
+            Match.weights_key.endswith(";" + scoring_key(), autoescape=True)
+        )
+        .values(
+            match_score=score,
+            match_details=func.json_set(Match.match_details, "$.overall_score", score),
+            weights_key=weights_key(weights)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    MatcherAgent.set_weights(weights)
+    return {
+        "weights": weights,
+        "weights_key": weights_key(weights),
+        "updated": result.rowcount,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
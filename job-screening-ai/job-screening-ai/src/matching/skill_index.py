@@ -0,0 +1,229 @@
+import threading
+from typing import Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+# Postings per compressed block
+_BLOCK_SIZE = 128
+_DELTA_TYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+class _PostingList:
+    __slots__ = ("bases", "blocks", "tail", "size")
+
+    def __init__(self):
+        """
+        Initialize a posting list of ascending candidate ids.
+
+        Full blocks of _BLOCK_SIZE ids are stored as their first id plus the
+        gaps to the following ids in the narrowest unsigned type that holds the
+        largest gap; the newest ids stay in an uncompressed tail until the block
+        is full.
+        """
+        self.bases: List[int] = []
+        self.blocks: List[np.ndarray] = []
+        self.tail: List[int] = []
+        self.size = 0
+
+    def last(self) -> int:
+        if self.tail:
+            return self.tail[-1]
+        if self.blocks:
+            return int(self.bases[-1] + self.blocks[-1].sum(dtype=np.int64))
+        return -1
+
+    def extend(self, ids: np.ndarray):
+        """Append ascending ids that are all greater than the last stored id."""
+        self.tail.extend(ids.tolist())
+        self.size += len(ids)
+        while len(self.tail) >= _BLOCK_SIZE:
+            block = np.asarray(self.tail[:_BLOCK_SIZE], dtype=np.int64)
+            del self.tail[:_BLOCK_SIZE]
+            gaps = np.diff(block)
+            dtype = next(t for t in _DELTA_TYPES if gaps.max(initial=0) <= np.iinfo(t).max)
+            self.bases.append(int(block[0]))
+            self.blocks.append(gaps.astype(dtype))
+
+    def decode(self) -> np.ndarray:
+        """Get all ids as an ascending int64 array."""
+        parts = [
+            np.concatenate(([base], base + np.cumsum(gaps, dtype=np.int64)))
+            for base, gaps in zip(self.bases, self.blocks)
+        ]
+        parts.append(np.asarray(self.tail, dtype=np.int64))
+        return np.concatenate(parts)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(gaps.nbytes + 8 for gaps in self.blocks) + 8 * len(self.tail)
+
+
+class SkillIndex:
+    def __init__(self):
+        """
+        Initialize an inverted index from skill vocabulary id to candidate ids.
+
+        Posting lists are delta-encoded (see _PostingList). Candidates are
+        expected to arrive in ascending id order, as they do when created;
+        out-of-order ids are merged by re-encoding the affected lists.
+        """
+        self._postings: Dict[int, _PostingList] = {}
+        self._lock = threading.Lock()
+
+    def add(self, candidate_ids: Sequence[int], skill_ids: Sequence[int]):
+        """
+        Add (candidate id, skill id) pairs.
+
+        Args:
+            candidate_ids (Sequence[int]): Candidate id of each pair
+            skill_ids (Sequence[int]): Skill vocabulary id of each pair
+        """
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        if len(candidate_ids) == 0:
+            return
+        order = np.lexsort((candidate_ids, skill_ids))
+        candidate_ids, skill_ids = candidate_ids[order], skill_ids[order]
+        bounds = np.flatnonzero(np.r_[True, skill_ids[1:] != skill_ids[:-1], True])
+
+        with self._lock:
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                skill_id = int(skill_ids[start])
+                ids = np.unique(candidate_ids[start:end])
+                postings = self._postings.setdefault(skill_id, _PostingList())
+                if ids[0] > postings.last():
+                    postings.extend(ids)
+                else:
+                    merged = _PostingList()
+                    merged.extend(np.union1d(postings.decode(), ids))
+                    self._postings[skill_id] = merged
+
+    def postings(self, skill_id: int) -> np.ndarray:
+        """
+        Get the ids of the candidates that have a skill.
+
+        Args:
+            skill_id (int): Skill vocabulary id
+
+        Returns:
+            np.ndarray: Ascending candidate ids
+        """
+        with self._lock:
+            postings = self._postings.get(int(skill_id))
+            return postings.decode() if postings is not None else np.empty(0, dtype=np.int64)
+
+    def any_of(self, skill_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the candidates that have at least one of the skills (OR).
+
+        Args:
+            skill_ids (Sequence[int]): Skill vocabulary ids
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Ascending candidate ids and how many of the skills each has
+        """
+        return self.at_least(skill_ids, 1)
+
+    def all_of(self, skill_ids: Sequence[int]) -> np.ndarray:
+        """
+        Find the candidates that have every one of the skills (AND).
+
+        Lists are intersected from the shortest up, so the work is bounded by
+        the rarest skill.
+
+        Args:
+            skill_ids (Sequence[int]): Skill vocabulary ids
+
+        Returns:
+            np.ndarray: Ascending candidate ids
+        """
+        skill_ids = np.unique(np.asarray(skill_ids, dtype=np.int64))
+        if len(skill_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            lists = [self._postings.get(int(skill_id)) for skill_id in skill_ids]
+            if any(postings is None for postings in lists):
+                return np.empty(0, dtype=np.int64)
+            lists.sort(key=lambda postings: postings.size)
+            result = lists[0].decode()
+            for postings in lists[1:]:
+                if len(result) == 0:
+                    break
+                result = np.intersect1d(result, postings.decode(), assume_unique=True)
+        return result
+
+    def at_least(self, skill_ids: Sequence[int], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the candidates that have at least k of the skills.
+
+        Args:
+            skill_ids (Sequence[int]): Skill vocabulary ids
+            k (int): Minimum number of the skills a candidate must have
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Ascending candidate ids and how many of the skills each has
+        """
+        skill_ids = np.unique(np.asarray(skill_ids, dtype=np.int64))
+        k = max(1, k)
+        if k > len(skill_ids):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        if k == len(skill_ids):
+            ids = self.all_of(skill_ids)
+            return ids, np.full(len(ids), k, dtype=np.int64)
+        with self._lock:
+            lists = [self._postings[int(skill_id)].decode() for skill_id in skill_ids if int(skill_id) in self._postings]
+        if len(lists) < k:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+        keep = counts >= k
+        return ids[keep], counts[keep]
+
+    def at_least_groups(self, skill_groups: Sequence[Sequence[int]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the candidates that have a skill of at least k of the groups.
+
+        Each group stands for one required skill and lists the ids that
+        satisfy it (the skill and its synonyms); a candidate having several
+        skills of one group counts that group once.
+
+        Args:
+            skill_groups (Sequence[Sequence[int]]): Skill vocabulary ids per group
+            k (int): Minimum number of groups a candidate must cover
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Ascending candidate ids and how many of the groups each covers
+        """
+        if all(len(group) == 1 for group in skill_groups):
+            return self.at_least([group[0] for group in skill_groups], k)
+        k = max(1, k)
+        if k > len(skill_groups):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        lists = []
+        with self._lock:
+            for group in skill_groups:
+                postings = [self._postings[int(skill_id)].decode() for skill_id in group if int(skill_id) in self._postings]
+                if postings:
+                    lists.append(np.unique(np.concatenate(postings)))
+        if len(lists) < k:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+        keep = counts >= k
+        return ids[keep], counts[keep]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index size counters.
+
+        Returns:
+            Dict[str, Any]: Skill and posting counts, compressed and raw sizes
+        """
+        with self._lock:
+            postings = sum(postings.size for postings in self._postings.values())
+            nbytes = sum(postings.nbytes for postings in self._postings.values())
+            skills = len(self._postings)
+        return {
+            "skills": skills,
+            "postings": postings,
+            "bytes": nbytes,
+            "raw_bytes": postings * 8
+        }
@@ -0,0 +1,322 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import SKILL_SIMILARITY_THRESHOLD
+from src.database.db_manager import async_session
+from src.database.models import Skill
+from src.database.types import normalize_rows
+from src.matching.candidate_pool import GrowableArray
+
+# New skills compared with the whole vocabulary at a time, to bound the similarity block
+_COMPARE_BLOCK_ROWS = 1024
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class SkillSynonyms:
+    def __init__(
+        self,
+        threshold: float = SKILL_SIMILARITY_THRESHOLD,
+        session_factory: Callable[[], AsyncSession] = async_session
+    ):
+        """
+        Initialize the synonym table of the skill vocabulary.
+
+        Every vocabulary skill name is embedded once; the embeddings are stored
+        in the `skills` table and kept here as one normalized matrix. When
+        skills are added, their rows are compared with the whole matrix in a
+        single product and every pair at or above `threshold` becomes a pair
+        of synonyms, so "postgres" and "postgresql" count as the same skill.
+        Matching then only looks up precomputed neighbour ids and never
+        encodes a skill name.
+
+        Args:
+            threshold (float): Cosine similarity at which two skills are synonyms
+            session_factory (Callable[[], AsyncSession]): Factory of database sessions
+        """
+        self.threshold = threshold
+        self.session_factory = session_factory
+        self._ids = GrowableArray(np.int64)
+        self._vectors: Optional[GrowableArray] = None
+        self._known: Dict[int, int] = {}
+        self._neighbours: Dict[int, np.ndarray] = {}
+        # Neighbour lists as sorted keys, offsets and values, rebuilt after additions
+        self._table: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._lock = threading.Lock()
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._last_skill_id = 0
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def __contains__(self, skill_id: int) -> bool:
+        return int(skill_id) in self._known
+
+    def add(self, skill_ids: Sequence[int], vectors: np.ndarray) -> int:
+        """
+        Add skill embeddings and find the synonyms of the new skills.
+
+        Args:
+            skill_ids (Sequence[int]): Skill vocabulary ids
+            vectors (np.ndarray): Embedding of each skill name, one per row
+
+        Returns:
+            int: Number of skills added (known ids are skipped)
+        """
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        new = np.array([int(skill_id) not in self._known for skill_id in skill_ids], dtype=bool)
+        _, first = np.unique(skill_ids, return_index=True)
+        new &= np.isin(np.arange(len(skill_ids)), first)
+        if not new.any():
+            return 0
+        skill_ids, vectors = skill_ids[new], normalize_rows(vectors[new])
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = GrowableArray(np.float32, vectors.shape[1])
+            start = len(self._known)
+            for offset, skill_id in enumerate(skill_ids.tolist()):
+                self._known[skill_id] = start + offset
+            self._ids.append(skill_ids)
+            self._vectors.append(vectors)
+            if self.threshold <= 1.0:
+                self._link(start)
+        return len(skill_ids)
+
+    def synonyms(self, skill_id: int) -> np.ndarray:
+        """
+        Get the synonyms of a skill.
+
+        Args:
+            skill_id (int): Skill vocabulary id
+
+        Returns:
+            np.ndarray: Ascending ids of the other skills at or above the threshold
+        """
+        return self._neighbours.get(int(skill_id), _EMPTY)
+
+    def expand(self, skill_ids: Sequence[int]) -> List[np.ndarray]:
+        """
+        Get the group of interchangeable skills of every skill.
+
+        Args:
+            skill_ids (Sequence[int]): Skill vocabulary ids
+
+        Returns:
+            List[np.ndarray]: Per skill, the ascending ids of the skill and its synonyms
+        """
+        return [
+            np.union1d(np.array([skill_id], dtype=np.int64), self.synonyms(skill_id))
+            for skill_id in np.asarray(skill_ids, dtype=np.int64).tolist()
+        ]
+
+    def with_synonyms(self, skill_ids: np.ndarray, owners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extend skill occurrences with the synonyms of each skill.
+
+        A job skill is found in a set of skills extended this way exactly when
+        the set contains the skill or one of its synonyms.
+
+        Args:
+            skill_ids (np.ndarray): Skill id of each occurrence
+            owners (np.ndarray): Owner (e.g. candidate row) of each occurrence
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Skill ids and owners with the synonym occurrences appended
+        """
+        keys, offsets, values = self._lookup_table()
+        if len(keys) == 0 or len(skill_ids) == 0:
+            return skill_ids, owners
+        positions = np.minimum(np.searchsorted(keys, skill_ids), len(keys) - 1)
+        found = np.flatnonzero(keys[positions] == skill_ids)
+        starts = offsets[positions[found]]
+        lengths = offsets[positions[found] + 1] - starts
+        entries = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return (
+            np.concatenate((skill_ids, values[entries].astype(skill_ids.dtype))),
+            np.concatenate((owners, np.repeat(owners[found], lengths)))
+        )
+
+    def matched(self, job_skill_ids: Sequence[int], skill_ids: Sequence[int]) -> np.ndarray:
+        """
+        Check which job skills a set of skills covers, directly or by a synonym.
+
+        Args:
+            job_skill_ids (Sequence[int]): Skill ids of the job
+            skill_ids (Sequence[int]): Skill ids of a candidate
+
+        Returns:
+            np.ndarray: Boolean per job skill
+        """
+        # Per-pair sets are small, where searchsorted beats np.isin by an order of magnitude
+        job_skill_ids = np.asarray(job_skill_ids, dtype=np.int64)
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        keys, offsets, values = self._lookup_table()
+        if len(keys) and len(skill_ids):
+            positions = np.minimum(np.searchsorted(keys, skill_ids), len(keys) - 1)
+            positions = positions[keys[positions] == skill_ids]
+            if len(positions):
+                skill_ids = np.concatenate([skill_ids] + [values[offsets[p]:offsets[p + 1]] for p in positions.tolist()])
+        skill_ids = np.unique(skill_ids)
+        if len(skill_ids) == 0:
+            return np.zeros(len(job_skill_ids), dtype=bool)
+        positions = np.minimum(np.searchsorted(skill_ids, job_skill_ids), len(skill_ids) - 1)
+        return skill_ids[positions] == job_skill_ids
+
+    def count_matched(
+        self,
+        job_skill_ids: Sequence[int],
+        skill_ids: np.ndarray,
+        skill_rows: np.ndarray,
+        count: int
+    ) -> np.ndarray:
+        """
+        Count the job skills each owner of some skill occurrences covers, directly or by a synonym.
+
+        Args:
+            job_skill_ids (Sequence[int]): Distinct skill ids of the job
+            skill_ids (np.ndarray): Skill id of each occurrence
+            skill_rows (np.ndarray): Owner row (0 to count - 1) of each occurrence
+            count (int): Number of owners
+
+        Returns:
+            np.ndarray: Number of covered job skills per owner
+        """
+        groups = self.expand(job_skill_ids)
+        if all(len(group) == 1 for group in groups):
+            hits = np.isin(skill_ids, np.asarray(job_skill_ids, dtype=skill_ids.dtype))
+            return np.bincount(skill_rows[hits], minlength=count)
+
+        members = np.concatenate(groups)
+        member_groups = np.repeat(np.arange(len(groups), dtype=np.int64), [len(group) for group in groups])
+        order = np.argsort(members, kind='stable')
+        members, member_groups = members[order], member_groups[order]
+
+        hits = np.isin(skill_ids, members)
+        hit_ids = skill_ids[hits].astype(np.int64)
+        starts = np.searchsorted(members, hit_ids, side='left')
+        lengths = np.searchsorted(members, hit_ids, side='right') - starts
+        entries = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        # One key per (owner, job skill) pair, so several synonyms of one job skill count once
+        keys = np.unique(np.repeat(skill_rows[hits].astype(np.int64), lengths) * len(groups) + member_groups[entries])
+        return np.bincount(keys // len(groups), minlength=count)
+
+    async def sync(self, encode: Callable[[List[str]], Awaitable[List[np.ndarray]]], model_name: str) -> int:
+        """
+        Add the vocabulary skills committed since the last sync.
+
+        Stored embeddings of `model_name` are reused; skills without one, or
+        with one produced by another model (which may not even share its
+        dimension), are encoded in one call and their embeddings written to
+        the `skills` table with the model name. A failure is logged and
+        retried by the next sync.
+
+        Args:
+            encode (Callable[[List[str]], Awaitable[List[np.ndarray]]]): Encoder of skill names
+            model_name (str): Identifier of the vectors `encode` produces
+
+        Returns:
+            int: Number of skills added
+        """
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock, self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    select(Skill.id, Skill.name, Skill.embedding, Skill.embedding_model)
+                    .where(Skill.id > self._last_skill_id)
+                    .order_by(Skill.id)
+                )
+                rows = result.all()
+                if not rows:
+                    return 0
+
+                missing = [
+                    i for i, row in enumerate(rows)
+                    if row.embedding is None or len(row.embedding) == 0 or row.embedding_model != model_name
+                ]
+                vectors: List[Any] = [row.embedding for row in rows]
+                if missing:
+                    encoded = await encode([rows[i].name for i in missing])
+                    for i, vector in zip(missing, encoded):
+                        vectors[i] = vector
+                    await session.execute(
+                        update(Skill.__table__)
+                        .where(Skill.__table__.c.id == bindparam("skill_id"))
+                        .values(embedding=bindparam("vector"), embedding_model=model_name),
+                        [{"skill_id": rows[i].id, "vector": vectors[i]} for i in missing]
+                    )
+                    await session.commit()
+
+                added = self.add(
+                    [row.id for row in rows],
+                    np.stack([np.asarray(vector, dtype=np.float32) for vector in vectors])
+                )
+                self._last_skill_id = rows[-1].id
+                return added
+            except Exception as e:
+                print(f"Error updating skill synonyms: {str(e)}")
+                return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get synonym table counters.
+
+        Returns:
+            Dict[str, Any]: Skill and synonym pair counts, threshold and matrix size
+        """
+        with self._lock:
+            pairs = sum(len(neighbours) for neighbours in self._neighbours.values()) // 2
+            return {
+                "skills": len(self._known),
+                "threshold": self.threshold,
+                "skills_with_synonyms": len(self._neighbours),
+                "synonym_pairs": pairs,
+                "matrix_bytes": self._vectors.view().nbytes if self._vectors is not None else 0
+            }
+
+    def _link(self, start: int):
+        """Record the synonym pairs of the rows from `start` on; the caller holds the lock."""
+        matrix = self._vectors.view()
+        ids = self._ids.view()
+        sources, targets = [], []
+        for block_start in range(start, len(matrix), _COMPARE_BLOCK_ROWS):
+            block = matrix[block_start:block_start + _COMPARE_BLOCK_ROWS]
+            rows, columns = np.nonzero(block @ matrix.T >= self.threshold)
+            rows += block_start
+            other = columns != rows
+            sources.append(ids[rows[other]])
+            targets.append(ids[columns[other]])
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+        if len(sources) == 0:
+            return
+
+        # Both directions, deduplicated: pairs of two new skills are found from both sides
+        pairs = np.unique(np.stack((np.r_[sources, targets], np.r_[targets, sources]), axis=1), axis=0)
+        bounds = np.flatnonzero(np.r_[True, pairs[1:, 0] != pairs[:-1, 0], True])
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            skill_id = int(pairs[begin, 0])
+            self._neighbours[skill_id] = np.union1d(self.synonyms(skill_id), pairs[begin:end, 1])
+        self._table = None
+
+    def _lookup_table(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the neighbour lists as sorted keys, offsets into values, and values."""
+        table = self._table
+        if table is None:
+            with self._lock:
+                keys = np.array(sorted(self._neighbours), dtype=np.int64)
+                lists = [self._neighbours[int(key)] for key in keys]
+                offsets = np.r_[0, np.cumsum([len(neighbours) for neighbours in lists])].astype(np.int64)
+                values = np.concatenate(lists) if lists else _EMPTY
+                table = self._table = (keys, offsets, values)
+        return table
+
+
+# Process-wide synonym table shared by all matching paths
+skill_synonyms = SkillSynonyms()
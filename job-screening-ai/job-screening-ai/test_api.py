@@ -1,5 +1,9 @@
 import requests
 import json
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8000"
 
@@ -40,12 +44,49 @@ def test_schedule_interview(match_id):
     print("\nSchedule Interview Response:")
     print(json.dumps(response.json(), indent=2))
 
+def test_get_latency_during_analysis(job_id, analyses=4, probes=20):
+    """Check that cheap GETs stay fast while slow analyses are running."""
+    url = f"{BASE_URL}/job-matches/{job_id}"
+
+    def median_latency():
+        latencies = []
+        for _ in range(probes):
+            start = time.perf_counter()
+            requests.get(url)
+            latencies.append(time.perf_counter() - start)
+        return statistics.median(latencies)
+
+    idle = median_latency()
+    with ThreadPoolExecutor(max_workers=analyses) as pool:
+        # A unique description per analysis, so none is served from the embedding or LLM caches
+        pending = [
+            pool.submit(requests.post, f"{BASE_URL}/analyze-job", params={
+                "job_description": "Senior data engineer with 5+ years of Spark, Kafka and Airflow experience. "
+                                   f"Reference {uuid.uuid4().hex}."
+            })
+            for _ in range(analyses)
+        ]
+        time.sleep(0.5)  # let the analyses reach the model and the LLM
+        busy = median_latency()
+        still_running = sum(not future.done() for future in pending)
+        for future in pending:
+            future.result()
+
+    print("\nGET Latency During Analysis:")
+    print(f"idle median: {idle * 1000:.1f} ms, busy median: {busy * 1000:.1f} ms "
+          f"({still_running}/{analyses} analyses still running while probing)")
+    assert still_running > 0, "All analyses finished before probing; nothing overlapped the GETs"
+    assert busy < max(idle * 3, idle + 0.05), "GET latency grew while analyses were running"
+
 if __name__ == "__main__":
     print("Testing Job Screening AI API...")
     
     # Test analyze job
     job_id = test_analyze_job()
     
+    # Test that reads are not blocked by running analyses
+    test_get_latency_during_analysis(job_id)
+    
     # Test analyze CV (uncomment when you have a valid CV file)
     # candidate_id = test_analyze_cv()
     
@@ -0,0 +1,9 @@
+import os
+
+# Keep the suite offline and free of side files: hashing embeddings, the built-in
+# token estimate, and no disk caches or saved index. Set before any src import.
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+os.environ.setdefault("PROMPT_TOKENIZER", "")
+os.environ.setdefault("EMBED_CACHE_PATH", "")
+os.environ.setdefault("LLM_CACHE_PATH", "")
+os.environ.setdefault("ANN_INDEX_PATH", "")
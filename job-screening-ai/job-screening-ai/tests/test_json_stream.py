@@ -0,0 +1,75 @@
+from src.llm.json_stream import JSONObjectScanner, repair_json
+
+
+def test_repair_json_parses_clean_object():
+    assert repair_json('{"a": 1, "b": [1, 2]}') == {"a": 1, "b": [1, 2]}
+
+
+def test_repair_json_strips_fences_and_prose():
+    text = 'Here is the result:\n```json\n{"title": "Engineer", "skills": ["Python"]}\n```\nHope this helps.'
+    assert repair_json(text) == {"title": "Engineer", "skills": ["Python"]}
+
+
+def test_repair_json_drops_trailing_commas():
+    assert repair_json('{"skills": ["Python", "SQL",], "years": 3,}') == {"skills": ["Python", "SQL"], "years": 3}
+
+
+def test_repair_json_closes_truncated_string_and_brackets():
+    assert repair_json('```json\n{"title": "Data Eng') == {"title": "Data Eng"}
+    assert repair_json('{"skills": ["Python", "SQ') == {"skills": ["Python", "SQ"]}
+    assert repair_json('{"a": {"b": [1, 2') == {"a": {"b": [1, 2]}}
+
+
+def test_repair_json_drops_dangling_key():
+    assert repair_json('{"title": "Engineer", "skills"') == {"title": "Engineer"}
+    assert repair_json('{"title": "Engineer", "skills":') == {"title": "Engineer"}
+    assert repair_json('{"title": "Engineer",') == {"title": "Engineer"}
+
+
+def test_repair_json_ignores_braces_inside_strings():
+    assert repair_json('{"note": "use {braces} and \\"quotes\\"", "n": 1} trailing }') == {
+        "note": 'use {braces} and "quotes"', "n": 1
+    }
+
+
+def test_repair_json_without_object():
+    assert repair_json("no json here") is None
+    assert repair_json("") is None
+
+
+def test_scanner_completes_on_closing_brace_across_chunks():
+    scanner = JSONObjectScanner()
+    chunks = ["Sure!\n```json\n{\"title\": \"Eng", "ineer\", \"skills\": [\"Py", "thon\"]", "}\n```", " more text"]
+    done = [scanner.feed(chunk) for chunk in chunks]
+    assert done == [False, False, False, True, True]
+    assert scanner.complete
+    assert scanner.result == {"title": "Engineer", "skills": ["Python"]}
+    assert scanner.text[scanner.start:scanner.end] == '{"title": "Engineer", "skills": ["Python"]}'
+
+
+def test_scanner_ignores_braces_in_strings():
+    scanner = JSONObjectScanner()
+    assert not scanner.feed('{"text": "a } b')
+    assert scanner.feed('", "n": 2}')
+    assert scanner.result == {"text": "a } b", "n": 2}
+
+
+def test_scanner_repairs_trailing_comma():
+    scanner = JSONObjectScanner()
+    assert scanner.feed('{"skills": ["Python",],}')
+    assert scanner.result == {"skills": ["Python"]}
+
+
+def test_scanner_skips_balanced_span_that_is_not_an_object():
+    scanner = JSONObjectScanner()
+    assert scanner.feed('{not json} then {"ok": true}')
+    assert scanner.result == {"ok": True}
+
+
+def test_scanner_stays_incomplete_on_truncated_stream():
+    scanner = JSONObjectScanner()
+    assert not scanner.feed('```json\n{"title": "Engineer", "skills": ["Python"')
+    assert not scanner.complete
+    assert scanner.result is None
+    # The caller falls back to repairing what arrived
+    assert repair_json(scanner.text) == {"title": "Engineer", "skills": ["Python"]}
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.db_manager import DatabaseManager
+from src.database.models import Base, Match
+
+# Scores of one job's matches, with runs of ties
+SCORES = [90.0, 75.5, 75.5, 75.5, 75.5, 60.0, 60.0, 90.0, 40.0, 75.5, 60.0]
+
+
+async def _pages(path, limit, owner="job"):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add_all(
+            Match(job_id=1, candidate_id=index + 1, match_score=score, match_details={}, status="pending")
+            for index, score in enumerate(SCORES)
+        )
+        # Another job's matches must never show up
+        session.add(Match(job_id=2, candidate_id=1, match_score=75.5, match_details={}, status="pending"))
+        await session.commit()
+
+        pages, cursor = [], None
+        while True:
+            if owner == "job":
+                rows, cursor = await DatabaseManager.get_job_matches(session, 1, limit=limit, cursor=cursor)
+            else:
+                rows, cursor = await DatabaseManager.get_candidate_matches(session, 1, limit=limit, cursor=cursor)
+            pages.append(rows)
+            if cursor is None:
+                break
+    await engine.dispose()
+    return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, len(SCORES), len(SCORES) + 5])
+def test_pages_have_no_gaps_or_duplicates_under_ties(tmp_path, limit):
+    pages = asyncio.run(_pages(tmp_path / "matches.db", limit))
+    rows = [row for page in pages for row in page]
+
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+    assert len(rows) == len(SCORES)
+    assert len({row["id"] for row in rows}) == len(SCORES)
+    assert all(row["job_id"] == 1 for row in rows)
+    keys = [(row["match_score"], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_candidate_pages_follow_the_same_order(tmp_path):
+    pages = asyncio.run(_pages(tmp_path / "matches.db", 1, owner="candidate"))
+    rows = [row for page in pages for row in page]
+    assert [row["job_id"] for row in rows] == [1, 2]
+
+
+def test_page_without_details(tmp_path):
+    async def first_page():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'matches.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add(Match(job_id=1, candidate_id=1, match_score=50.0, match_details={"a": 1}, status="pending"))
+            await session.commit()
+            result = await DatabaseManager.get_job_matches(session, 1, include_details=False)
+        await engine.dispose()
+        return result
+
+    rows, cursor = asyncio.run(first_page())
+    assert cursor is None
+    assert "match_details" not in rows[0]
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        DatabaseManager._decode_cursor("not-a-cursor")
+    cursor = DatabaseManager._encode_cursor(75.5, 42)
+    assert DatabaseManager._decode_cursor(cursor) == (75.5, 42)
@@ -0,0 +1,65 @@
+from src.llm.prompt_compaction import PromptCompactor
+
+LINE = "Python developer with FastAPI experience. Builds services, reviews code and mentors juniors daily."
+
+
+def _compactor(budget: int) -> PromptCompactor:
+    return PromptCompactor(token_budget=budget, tokenizer_name="")
+
+
+def test_fit_keeps_everything_within_budget():
+    compactor = _compactor(1000)
+    blocks = [["a b c", "d e f"], ["g h"]]
+    assert compactor._fit(blocks) == (blocks, False)
+
+
+def test_fit_takes_lines_from_every_block_in_turn():
+    blocks = [["one two", "three four", "five six"], ["seven eight", "nine ten", "eleven twelve"]]
+    # Every line is 2 words + 1 newline = 3 tokens; 12 tokens fit two lines of each block
+    kept, truncated = _compactor(12)._fit(blocks)
+    assert truncated
+    assert kept == [["one two", "three four"], ["seven eight", "nine ten"]]
+
+
+def test_fit_never_exceeds_budget():
+    compactor = _compactor(15)
+    blocks = [[LINE, "short line"], ["another short line", LINE]]
+    kept, truncated = compactor._fit(blocks)
+    assert truncated
+    assert sum(compactor._line_tokens(line) for block in kept for line in block) <= 15
+    assert kept[1] == ["another short line"]
+    assert kept[0][0] != LINE and LINE.startswith(kept[0][0])
+
+
+def test_fit_cuts_a_single_long_line_instead_of_dropping_it():
+    compactor = _compactor(12)
+    kept, truncated = compactor._fit([[LINE]])
+    assert truncated
+    assert len(kept[0]) == 1
+    assert LINE.startswith(kept[0][0])
+    assert compactor._line_tokens(kept[0][0]) <= 12
+
+
+def test_truncate_cuts_at_a_word():
+    compactor = _compactor(100)
+    cut = compactor._truncate("alpha beta gamma delta epsilon", 4)
+    assert cut == "alpha beta gamma"
+    assert compactor._line_tokens(cut) <= 4
+
+
+def test_truncate_prefers_a_sentence_end_in_the_second_half():
+    compactor = _compactor(100)
+    cut = compactor._truncate(LINE, 12)
+    assert cut == "Python developer with FastAPI experience."
+
+
+def test_truncate_ignores_a_sentence_end_in_the_first_half():
+    compactor = _compactor(100)
+    line = "Hi. " + " ".join(["word"] * 20)
+    cut = compactor._truncate(line, 10)
+    assert cut.startswith("Hi. word")
+    assert compactor._line_tokens(cut) <= 10
+
+
+def test_truncate_to_nothing():
+    assert _compactor(100)._truncate(LINE, 1) == ""
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src.embeddings.quantization import (
+    QUANTIZATION_MODES, QuantizedMatrix, _FLOAT16_MAGIC, _INT8_MAGIC, decode_vector, encode_vector, quantize_int8
+)
+
+
+def _unit_vectors(rows: int, dimension: int = 64) -> np.ndarray:
+    matrix = np.random.default_rng(0).standard_normal((rows, dimension)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_float32_blob_is_raw_bytes():
+    vector = _unit_vectors(1)[0]
+    blob = encode_vector(vector, "float32")
+    assert blob == vector.astype("<f4").tobytes()
+    np.testing.assert_array_equal(decode_vector(blob), vector)
+
+
+def test_float16_round_trip_carries_magic():
+    vector = _unit_vectors(1)[0]
+    blob = encode_vector(vector, "float16")
+    assert blob[:4] == _FLOAT16_MAGIC
+    assert len(blob) == 4 + 2 * len(vector)
+    decoded = decode_vector(blob)
+    assert decoded.dtype == np.float16
+    np.testing.assert_allclose(decoded.astype(np.float32), vector, atol=1e-3)
+
+
+def test_int8_round_trip_carries_magic_and_scale():
+    vector = _unit_vectors(1)[0]
+    blob = encode_vector(vector, "int8")
+    assert blob[:4] == _INT8_MAGIC
+    assert len(blob) == 8 + len(vector)
+    decoded = decode_vector(blob)
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, vector, atol=np.abs(vector).max() / 127)
+
+
+def test_magic_prefixes_are_nan_as_float32():
+    # A normalized float32 vector never starts with NaN, so raw blobs cannot be mistaken for quantized ones
+    for magic in (_FLOAT16_MAGIC, _INT8_MAGIC):
+        assert np.isnan(np.frombuffer(magic, dtype="<f4")[0])
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        encode_vector(np.zeros(4, dtype=np.float32), "int4")
+    with pytest.raises(ValueError):
+        QuantizedMatrix(np.zeros((1, 4), dtype=np.float32), "int4")
+    with pytest.raises(ValueError):
+        QuantizedMatrix(np.zeros((1, 4), dtype=np.int8), "int8")
+
+
+def test_quantize_int8_keeps_zero_rows():
+    codes, scales = quantize_int8(np.zeros((2, 8), dtype=np.float32))
+    assert not codes.any()
+    assert np.all(scales == 1.0)
+
+
+@pytest.mark.parametrize("mode", QUANTIZATION_MODES)
+def test_matrix_scores_and_take(mode):
+    matrix = _unit_vectors(700)
+    quantized = QuantizedMatrix.from_vectors(matrix, mode)
+    assert len(quantized) == len(matrix)
+    query = matrix[3]
+    np.testing.assert_allclose(quantized.scores(query), matrix @ query, atol=0.02)
+    assert int(np.argmax(quantized.scores(query))) == 3
+    rows = np.array([5, 1, 650])
+    np.testing.assert_allclose(quantized.take(rows).dequantize(), matrix[rows], atol=0.02)
+
+
+def test_quantized_matrices_are_smaller():
+    matrix = _unit_vectors(100)
+    sizes = {mode: QuantizedMatrix.from_vectors(matrix, mode).nbytes for mode in QUANTIZATION_MODES}
+    assert sizes["float16"] < sizes["float32"]
+    assert sizes["int8"] < sizes["float16"]
@@ -0,0 +1,83 @@
+from src.config import EXTRACTION_CONFIDENCE_THRESHOLD
+from src.extraction.rule_extractor import CV_FIELDS, JOB_FIELDS, RuleBasedExtractor
+
+STRUCTURED_JOB = """Job Title: Backend Engineer
+
+Requirements:
+- 3+ years of experience with Python
+- Bachelor's degree in Computer Science
+- SQL and Docker
+
+Responsibilities:
+- Build and maintain APIs
+- Review code
+"""
+
+PROSE_JOB = (
+    "We are hiring a backend engineer. You need Python and SQL. "
+    "Experience with Kubernetes is a plus, and AWS is nice to have."
+)
+
+CV = """John Smith
+john.smith@example.com
++1 555 123 4567
+
+Skills
+Python, SQL, Docker
+
+Experience
+Software Engineer at Acme Corp, 2019 - 2023
+
+Education
+B.Sc. Computer Science, State University, 2018
+"""
+
+extractor = RuleBasedExtractor()
+
+
+def test_structured_job_is_confident():
+    data, confidence = extractor.extract_job(STRUCTURED_JOB)
+    assert set(confidence) == set(JOB_FIELDS)
+    assert data["title"] == "Backend Engineer"
+    assert data["required_skills"] == ["Python", "SQL", "Docker"]
+    assert data["responsibilities"] == ["Build and maintain APIs", "Review code"]
+    for field in JOB_FIELDS:
+        assert confidence[field] >= EXTRACTION_CONFIDENCE_THRESHOLD, field
+
+
+def test_structured_job_without_preferred_section_is_confidently_empty():
+    data, confidence = extractor.extract_job(STRUCTURED_JOB)
+    assert data["preferred_skills"] == []
+    assert confidence["preferred_skills"] >= EXTRACTION_CONFIDENCE_THRESHOLD
+
+
+def test_prose_job_leaves_guesses_below_threshold():
+    data, confidence = extractor.extract_job(PROSE_JOB)
+    assert data["title"] == "backend engineer"
+    assert data["required_skills"] == ["Python", "SQL"]
+    assert data["preferred_skills"] == ["Kubernetes", "AWS"]
+    for field in ("required_skills", "preferred_skills", "experience", "education", "responsibilities"):
+        assert confidence[field] < EXTRACTION_CONFIDENCE_THRESHOLD, field
+
+
+def test_cv_fields_and_confidences():
+    data, confidence = extractor.extract_cv(CV)
+    assert set(confidence) == set(CV_FIELDS)
+    assert data["name"] == "John Smith"
+    assert data["email"] == "john.smith@example.com"
+    assert data["skills"] == ["Python", "SQL", "Docker"]
+    assert data["education"][0]["year"] == "2018"
+    assert confidence["email"] > confidence["name"]
+    for field in ("email", "skills", "education"):
+        assert confidence[field] >= EXTRACTION_CONFIDENCE_THRESHOLD, field
+    assert 0.0 <= min(confidence.values()) and max(confidence.values()) <= 1.0
+
+
+def test_empty_text():
+    data, confidence = extractor.extract_job("")
+    assert all(value < EXTRACTION_CONFIDENCE_THRESHOLD for value in confidence.values()), confidence
+    data, confidence = extractor.extract_cv("")
+    # A missed email or phone pattern means there is none; everything else is left to the LLM
+    assert data["email"] == "" and confidence["email"] >= EXTRACTION_CONFIDENCE_THRESHOLD
+    for field in ("name", "skills", "experience", "education"):
+        assert confidence[field] < EXTRACTION_CONFIDENCE_THRESHOLD, field
@@ -0,0 +1,88 @@
+import numpy as np
+
+from src.matching.skill_index import SkillIndex, _BLOCK_SIZE, _PostingList
+
+
+def _postings(ids) -> _PostingList:
+    postings = _PostingList()
+    postings.extend(np.asarray(ids, dtype=np.int64))
+    return postings
+
+
+def test_posting_list_round_trip_across_blocks():
+    ids = np.arange(0, 3 * _BLOCK_SIZE + 17, dtype=np.int64) * 3 + 5
+    postings = _postings(ids)
+    assert len(postings.blocks) == 3
+    assert len(postings.tail) == 17
+    assert postings.size == len(ids)
+    assert postings.last() == ids[-1]
+    np.testing.assert_array_equal(postings.decode(), ids)
+
+
+def test_posting_list_picks_narrowest_gap_type():
+    small = _postings(np.arange(_BLOCK_SIZE) * 200)
+    assert small.blocks[0].dtype == np.uint8
+    medium = _postings(np.arange(_BLOCK_SIZE) * 300)
+    assert medium.blocks[0].dtype == np.uint16
+    large = _postings(np.arange(_BLOCK_SIZE, dtype=np.int64) * 100_000)
+    assert large.blocks[0].dtype == np.uint32
+    huge = _postings(np.arange(_BLOCK_SIZE, dtype=np.int64) * (1 << 33))
+    assert huge.blocks[0].dtype == np.uint64
+    for postings, step in ((small, 200), (medium, 300), (large, 100_000), (huge, 1 << 33)):
+        np.testing.assert_array_equal(postings.decode(), np.arange(_BLOCK_SIZE, dtype=np.int64) * step)
+
+
+def test_posting_list_compresses_dense_ids():
+    postings = _postings(np.arange(10 * _BLOCK_SIZE))
+    assert postings.nbytes < 8 * postings.size / 4
+
+
+def test_posting_list_extends_in_pieces():
+    ids = np.arange(1000, dtype=np.int64) * 7
+    postings = _PostingList()
+    for start in range(0, len(ids), 99):
+        postings.extend(ids[start:start + 99])
+    np.testing.assert_array_equal(postings.decode(), ids)
+    assert postings.last() == ids[-1]
+
+
+def test_empty_posting_list():
+    postings = _PostingList()
+    assert postings.last() == -1
+    assert len(postings.decode()) == 0
+
+
+def test_index_merges_out_of_order_ids():
+    index = SkillIndex()
+    index.add(np.arange(300, 600), [1] * 300)
+    index.add([5, 450, 700, 5], [1, 1, 1, 1])
+    expected = np.union1d(np.arange(300, 600), [5, 700])
+    np.testing.assert_array_equal(index.postings(1), expected)
+    assert index.stats()["postings"] == len(expected)
+
+
+def test_index_queries():
+    index = SkillIndex()
+    # candidate: skills
+    pairs = {1: [10, 20], 2: [10], 3: [20, 30], 4: [10, 20, 30]}
+    candidate_ids = [candidate for candidate, skills in pairs.items() for _ in skills]
+    skill_ids = [skill for skills in pairs.values() for skill in skills]
+    index.add(candidate_ids, skill_ids)
+
+    np.testing.assert_array_equal(index.postings(10), [1, 2, 4])
+    np.testing.assert_array_equal(index.postings(99), [])
+    np.testing.assert_array_equal(index.all_of([10, 20]), [1, 4])
+    np.testing.assert_array_equal(index.all_of([10, 99]), [])
+
+    ids, counts = index.any_of([10, 30])
+    np.testing.assert_array_equal(ids, [1, 2, 3, 4])
+    np.testing.assert_array_equal(counts, [1, 1, 1, 2])
+
+    ids, counts = index.at_least([10, 20, 30], 2)
+    np.testing.assert_array_equal(ids, [1, 3, 4])
+    np.testing.assert_array_equal(counts, [2, 2, 3])
+
+    # 10 and 30 are synonyms: candidate 4 covers that group once
+    ids, counts = index.at_least_groups([[10, 30], [20]], 2)
+    np.testing.assert_array_equal(ids, [1, 3, 4])
+    np.testing.assert_array_equal(counts, [2, 2, 2])